@@ -1,76 +1,110 @@
-from vizml.adaboost_classifier.dashboard import DashBoard as DashBoard_AdaBoostClassifier
-from vizml.bagging_classifier.dashboard import DashBoard as DashBoard_BaggingClassifier
-from vizml.dbscan.dashboard import DashBoard as DashBoard_DBScan
-from vizml.decision_tree.dashboard import DashBoard as DashBoard_DecisionTree
-from vizml.k_means_clustering.dashboard import DashBoard as DashBoard_KMeansClustering
-from vizml.k_nearest_neighbours.dashboard import DashBoard as DashBoard_KNN
-from vizml.logistic_regression.dashboard import DashBoard as DashBoard_LogisticRegression
-from vizml.multi_linear_regression.dashboard import DashBoard as DashBoard_MultiLinearRegression
-from vizml.naive_bayes.dashboard import DashBoard as DashBoard_NaiveBayes
-from vizml.polynomial_regression.dashboard import DashBoard as DashBoard_PolynomialRegression
-from vizml.simple_linear_regression.dashboard import DashBoard as DashBoard_SimpleLinearRegression
-from vizml.support_vector_machine.dashboard import DashBoard as DashBoard_SupportVectorMachines
+"""Vizml visualizes popular machine learning algorithms, the dashboards being imported only once used."""
+
+from importlib import import_module
+from typing import Any, List
+
+_DASHBOARDS = {
+    'DashBoard_AdaBoostClassifier': 'vizml.adaboost_classifier.dashboard',
+    'DashBoard_BaggingClassifier': 'vizml.bagging_classifier.dashboard',
+    'DashBoard_DBScan': 'vizml.dbscan.dashboard',
+    'DashBoard_DecisionTree': 'vizml.decision_tree.dashboard',
+    'DashBoard_KMeansClustering': 'vizml.k_means_clustering.dashboard',
+    'DashBoard_KNN': 'vizml.k_nearest_neighbours.dashboard',
+    'DashBoard_LogisticRegression': 'vizml.logistic_regression.dashboard',
+    'DashBoard_MultiLinearRegression': 'vizml.multi_linear_regression.dashboard',
+    'DashBoard_NaiveBayes': 'vizml.naive_bayes.dashboard',
+    'DashBoard_PolynomialRegression': 'vizml.polynomial_regression.dashboard',
+    'DashBoard_SimpleLinearRegression': 'vizml.simple_linear_regression.dashboard',
+    'DashBoard_SupportVectorMachines': 'vizml.support_vector_machine.dashboard',
+}
+
+__all__ = ['Visualize', *_DASHBOARDS]
+
+
+def _load_dashboard(name: str) -> Any:
+    """Imports the dashboard class exported under the name."""
+
+    dashboard = import_module(_DASHBOARDS[name]).DashBoard
+    globals()[name] = dashboard
+
+    return dashboard
+
+
+def __getattr__(name: str) -> Any:
+    if name in _DASHBOARDS:
+        return _load_dashboard(name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_DASHBOARDS))
 
 
 class Visualize:
     """Aggregator class to run visualizations."""
 
+    @staticmethod
+    def all_algorithms():
+        """Runs a single dashboard on localhost to visualize all the algorithms, each on its own page."""
+        import_module('vizml.server').run()
+
     @staticmethod
     def simple_linear_regression():
         """Runs a dashboard on localhost to visualize Simple linear regression."""
-        DashBoard_SimpleLinearRegression().run()
+        _load_dashboard('DashBoard_SimpleLinearRegression')().run()
 
     @staticmethod
     def multi_linear_regression():
         """Runs a dashboard on localhost to visualize Multi linear regression."""
-        DashBoard_MultiLinearRegression().run()
+        _load_dashboard('DashBoard_MultiLinearRegression')().run()
 
     @staticmethod
     def k_means_clustering():
         """Runs a dashboard on localhost to visualize K Means Clustering."""
-        DashBoard_KMeansClustering().run()
+        _load_dashboard('DashBoard_KMeansClustering')().run()
 
     @staticmethod
     def polynomial_regression():
         """Runs a dashboard on localhost to visualize Polynomial Regression."""
-        DashBoard_PolynomialRegression().run()
+        _load_dashboard('DashBoard_PolynomialRegression')().run()
 
     @staticmethod
     def dbscan():
         """Runs a dashboard on localhost to visualize DBScan."""
-        DashBoard_DBScan().run()
+        _load_dashboard('DashBoard_DBScan')().run()
 
     @staticmethod
     def logistic_regression():
         """Runs a dashboard on localhost to visualize Logistic Regression."""
-        DashBoard_LogisticRegression().run()
+        _load_dashboard('DashBoard_LogisticRegression')().run()
 
     @staticmethod
     def support_vector_machines():
         """Runs a dashboard on localhost to visualize Support Vector Machines."""
-        DashBoard_SupportVectorMachines().run()
+        _load_dashboard('DashBoard_SupportVectorMachines')().run()
 
     @staticmethod
     def k_nearest_neighbors():
         """Runs a dashboard on localhost to visualize K Nearest Neighbors Classifier."""
-        DashBoard_KNN().run()
+        _load_dashboard('DashBoard_KNN')().run()
 
     @staticmethod
     def naive_bayes():
         """Runs a dashboard on localhost to visualize Naive Bayes Classifier."""
-        DashBoard_NaiveBayes().run()
+        _load_dashboard('DashBoard_NaiveBayes')().run()
 
     @staticmethod
     def decision_tree():
         """Runs a dashboard on localhost to visualize Decision Tree Classifier."""
-        DashBoard_DecisionTree().run()
+        _load_dashboard('DashBoard_DecisionTree')().run()
 
     @staticmethod
     def bagging_classifier():
         """Runs a dashboard on localhost to visualize Bagging Classifier."""
-        DashBoard_BaggingClassifier().run()
+        _load_dashboard('DashBoard_BaggingClassifier')().run()
 
     @staticmethod
     def adaboost_classifier():
         """Runs a dashboard on localhost to visualize AdaBoost Classifier."""
-        DashBoard_AdaBoostClassifier().run()
+        _load_dashboard('DashBoard_AdaBoostClassifier')().run()
@@ -0,0 +1,99 @@
+"""Contains the Dash apps of the dashboards, built only when they are run."""
+
+from copy import deepcopy
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple
+
+import dash
+from flask import Flask
+
+
+class LazyDash:
+    """
+    Dash app whose construction is deferred until it is served.
+
+    Dashboards declare their layout and callbacks on it at class definition, like on a dash.Dash app, but the app
+    is only built and the callbacks only registered the first time the app or its server is needed, so importing
+    a dashboard does not construct a Dash app. The callback decorators return the functions unchanged.
+
+    :param name: name of the Dash app
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.layout: Any = None
+        self.callbacks: List[Tuple[Tuple[Any, ...], Callable[..., Any]]] = []
+        self.clientside_callbacks: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._app: Optional[dash.Dash] = None
+        self._lock = Lock()
+
+    def callback(self, *dependencies: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Declares a callback with the outputs and inputs of dash.Dash.callback."""
+
+        def declare(function: Callable[..., Any]) -> Callable[..., Any]:
+            self.callbacks.append((dependencies, function))
+            return function
+
+        return declare
+
+    def clientside_callback(self, function: str, *dependencies: Any) -> None:
+        """Declares a clientside callback with the outputs and inputs of dash.Dash.clientside_callback."""
+
+        self.clientside_callbacks.append((function, dependencies))
+
+    def namespaced(self, prefix: str) -> 'LazyDash':
+        """
+        Copy of the app with the ids of its components prefixed, so that it can be hosted along other apps.
+
+        :param prefix: prefix of the component ids, followed by a dash
+        """
+
+        def prefixed(dependencies: Tuple[Any, ...]) -> Tuple[Any, ...]:
+            return tuple(type(dependency)(f'{prefix}-{dependency.component_id}', dependency.component_property)
+                         for dependency in dependencies)
+
+        app = LazyDash(name=f'{self.name}-{prefix}')
+        app.layout = deepcopy(self.layout)
+        for component in [app.layout, *app.layout._traverse()]:
+            if getattr(component, 'id', None) is not None:
+                component.id = f'{prefix}-{component.id}'
+        app.callbacks = [(prefixed(dependencies), callback) for dependencies, callback in self.callbacks]
+        app.clientside_callbacks = [(function, prefixed(dependencies))
+                                    for function, dependencies in self.clientside_callbacks]
+
+        return app
+
+    def register_callbacks(self, app: dash.Dash) -> None:
+        """Registers the declared callbacks on a Dash app."""
+
+        for function, dependencies in self.clientside_callbacks:
+            app.clientside_callback(function, *dependencies)
+        for dependencies, callback in self.callbacks:
+            app.callback(*dependencies)(callback)
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the Dash app has been built."""
+        return self._app is not None
+
+    @property
+    def app(self) -> dash.Dash:
+        """Dash app with the layout and callbacks declared, built on first use."""
+        with self._lock:
+            if self._app is None:
+                app = dash.Dash(name=self.name)
+                app.layout = self.layout
+                self.register_callbacks(app)
+                self._app = app
+            return self._app
+
+    @property
+    def server(self) -> Flask:
+        """Flask server of the Dash app, to be served by a WSGI server."""
+        server: Flask = self.app.server
+        return server
+
+    def run_server(self, **kwargs: Any) -> None:
+        """Builds the Dash app and runs it on localhost, with the arguments of dash.Dash.run_server."""
+
+        self.app.run_server(**kwargs)
@@ -0,0 +1,380 @@
+"""Contains the server-side store of the figures shown by the dashboards."""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import warnings
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+from plotly.graph_objects import Figure
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_KEYS = 4096
+DIGEST_LENGTH = 32
+MAX_KEY_LENGTH = 1024
+SECRET_ENV_VAR = 'VIZML_FIGURE_STORE_SECRET'
+
+_PROCESS_SECRET = secrets.token_bytes(32)
+
+INTEGER_DTYPES = (('u1', np.uint8), ('i1', np.int8), ('u2', np.uint16), ('i2', np.int16),
+                  ('u4', np.uint32), ('i4', np.int32))
+
+# Decodes the typed arrays of a figure payload in the browser, splitting 2D arrays into rows
+DECODE_FIGURE = """
+function(payload) {
+    if (!payload) {
+        return window.dash_clientside.no_update;
+    }
+    var types = {i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+                 i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array};
+    function decode(value) {
+        if (Array.isArray(value)) {
+            return value.map(decode);
+        }
+        if (value === null || typeof value !== 'object') {
+            return value;
+        }
+        if (typeof value.bdata === 'string' && types[value.dtype]) {
+            var bytes = Uint8Array.from(atob(value.bdata), function(c) { return c.charCodeAt(0); });
+            var array = new types[value.dtype](bytes.buffer);
+            if (value.shape === undefined) {
+                return array;
+            }
+            var columns = parseInt(String(value.shape).split(',')[1]);
+            var rows = [];
+            for (var start = 0; start < array.length; start += columns) {
+                rows.push(array.subarray(start, start + columns));
+            }
+            return rows;
+        }
+        var decoded = {};
+        for (var key in value) {
+            decoded[key] = decode(value[key]);
+        }
+        return decoded;
+    }
+    return decode(payload);
+}
+"""
+
+
+def shared_secret() -> Optional[bytes]:
+    """Secret of the figure keys set in the VIZML_FIGURE_STORE_SECRET environment variable, if any."""
+
+    secret = os.environ.get(SECRET_ENV_VAR)
+    return secret.encode() if secret else None
+
+
+def _nbytes(value: Any) -> int:
+    """Rough serialized size of a value of a figure."""
+
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+def figure_nbytes(fig: Figure) -> int:
+    """Rough size of the data held by the traces of the figure, the bulk of its serialized size."""
+
+    return sum(_nbytes(trace.to_plotly_json()) for trace in fig.data)
+
+
+def typed_array(array: NDArray[Any]) -> Any:
+    """
+    Encodes a numeric array as a base64 typed array, in the format of plotly.js.
+
+    Integers, like class labels, and floats holding only integers are encoded in the smallest integer type
+    holding them, uint8 for most labels, and other floats in float32. Other arrays are returned unchanged.
+
+    :param array: array to encode
+    :return: dict with the dtype, the base64 encoded bytes and, for 2D arrays, the shape of the array
+    """
+
+    if array.dtype.kind not in 'biuf' or array.size == 0 or array.ndim > 2:
+        return array
+
+    encoded = array.astype(np.float32)
+    dtype = 'f4'
+    if array.dtype.kind != 'f' or (np.isfinite(array).all() and (array == np.round(array)).all()):
+        low, high = array.min(), array.max()
+        for code, integer_type in INTEGER_DTYPES:
+            if np.iinfo(integer_type).min <= low and high <= np.iinfo(integer_type).max:
+                encoded, dtype = array.astype(integer_type), code
+                break
+
+    payload = {'dtype': dtype, 'bdata': base64.b64encode(encoded.astype(encoded.dtype.newbyteorder('<')).tobytes()).decode()}
+    if array.ndim == 2:
+        payload['shape'] = f"{array.shape[0]}, {array.shape[1]}"
+
+    return payload
+
+
+def encode_figure(fig: Figure) -> Dict[str, Any]:
+    """
+    Serializable payload of the figure sent to the dashboards, encoding its numpy arrays as typed arrays.
+
+    Typed arrays are several times smaller than lists of decimal numbers and much faster to serialize. They are
+    decoded in the browser by the DECODE_FIGURE clientside callback.
+    """
+
+    def encode(value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            return typed_array(value)
+        if isinstance(value, dict):
+            return {key: encode(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [encode(item) for item in value]
+        return value
+
+    payload: Dict[str, Any] = encode(fig.to_dict())
+
+    return payload
+
+
+class LazyFigures:
+    """
+    Figures of a trained model, each computed the first time its tab is shown and reused afterwards.
+
+    :param build_model: callable returning the trained model
+    :param tab_figures: name of the method of the model returning the figure of each tab
+    """
+
+    def __init__(self, build_model: Callable[[], Any], tab_figures: Dict[str, str]) -> None:
+        self._build_model = build_model
+        self.tab_figures = tab_figures
+        self._model: Any = None
+        self._figures: Dict[str, Figure] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+        self.nbytes = 0
+
+    @property
+    def model(self) -> Any:
+        """Trained model, built on first use."""
+        with self._lock:
+            if self._model is None:
+                self._model = self._build_model()
+            return self._model
+
+    @property
+    def computed_tabs(self) -> Tuple[str, ...]:
+        """Tabs whose figures have been computed."""
+        return tuple(self._figures)
+
+    def figure(self, tab: str) -> Figure:
+        """Figure shown in the tab, computed on first request."""
+        if tab not in self._figures:
+            model = self.model
+            with self._lock:
+                if tab not in self._figures:
+                    fig = getattr(model, self.tab_figures[tab])(return_fig=True)
+                    self.nbytes += figure_nbytes(fig)
+                    self._figures[tab] = fig
+        return self._figures[tab]
+
+    def payload(self, tab: str) -> Dict[str, Any]:
+        """Encoded figure shown in the tab, encoded on first request."""
+        if tab not in self._payloads:
+            fig = self.figure(tab)
+            with self._lock:
+                if tab not in self._payloads:
+                    payload = encode_figure(fig)
+                    self.nbytes += _nbytes(payload)
+                    self._payloads[tab] = payload
+        return self._payloads[tab]
+
+
+class FigureStore:
+    """
+    Server-side store of the dashboard figures, keyed by the dashboard inputs.
+
+    Dashboards register their inputs to get a short key, which is all the browser holds in a dcc.Store. Figures
+    are then looked up by key and tab, training a model only once for each set of inputs and computing only the
+    figures of the tabs that are shown. The least recently used models and figures are dropped once the figures
+    exceed max_bytes, and are computed again from the registered inputs if they are requested later.
+
+    Keys start with an HMAC of the model builder and the inputs, so they cannot be forged or enumerated without
+    the secret of the store, and hold the inputs they were registered with. A store that does not know a key,
+    like the store of another worker process serving the dashboards, registers it again when given the model
+    builder, provided both stores share the secret. The secret is read from the VIZML_FIGURE_STORE_SECRET
+    environment variable, which must be set to the same value for all the processes serving the dashboards.
+    When it is unset, the secret is drawn at random for the process: keys registered by another process are
+    then rejected, with a warning, unless it was forked after this module was imported.
+
+    Entries whose figures exceed max_entry_bytes are served but not kept.
+
+    :param max_bytes: total size of the stored figures above which the least recently used are dropped
+    :param max_keys: number of registered inputs above which the least recently registered are dropped
+    :param max_entry_bytes: size of the figures of a single set of inputs above which they are not kept
+    :param secret: secret of the key digests, defaults to VIZML_FIGURE_STORE_SECRET, else the secret of the process
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_keys: int = DEFAULT_MAX_KEYS,
+                 max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES, secret: Optional[bytes] = None) -> None:
+        self.max_bytes = max_bytes
+        self.max_keys = max_keys
+        self.max_entry_bytes = max_entry_bytes
+        if secret is None:
+            secret = shared_secret()
+        self._secret = _PROCESS_SECRET if secret is None else secret
+        self._process_secret = secret is None
+        self._sources: 'OrderedDict[str, Tuple[Callable[..., Any], Dict[str, str], Tuple[Hashable, ...]]]' = OrderedDict()
+        self._entries: 'OrderedDict[str, LazyFigures]' = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the stored figures."""
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def _key(self, build_model: Callable[..., Any], inputs: Tuple[Hashable, ...]) -> str:
+        """HMAC of the model builder and the inputs, followed by the inputs in JSON."""
+
+        source = repr((build_model.__module__, build_model.__qualname__, inputs))
+        digest = hmac.new(self._secret, source.encode(), hashlib.sha256).hexdigest()[:DIGEST_LENGTH]
+
+        return digest + json.dumps(inputs)
+
+    def register(self, build_model: Callable[..., Any], tab_figures: Dict[str, str], *inputs: Hashable) -> str:
+        """
+        Registers the inputs of a dashboard without computing anything.
+
+        :param build_model: callable returning the trained model when called as build_model(*inputs)
+        :param tab_figures: name of the method of the model returning the figure of each tab
+        :param inputs: values of the dashboard inputs
+        :return: key of the figures for the inputs
+        """
+
+        key = self._key(build_model, inputs)
+        with self._lock:
+            self._sources[key] = (build_model, tab_figures, inputs)
+            self._sources.move_to_end(key)
+            while len(self._sources) > self.max_keys:
+                self._sources.popitem(last=False)
+
+        return key
+
+    def _restore(self, key: str, build_model: Callable[..., Any], tab_figures: Dict[str, str]) -> None:
+        """Registers the inputs held by a key of the model builder that the store does not know."""
+
+        if len(key) > MAX_KEY_LENGTH:
+            raise KeyError(key)
+        try:
+            inputs = json.loads(key[DIGEST_LENGTH:])
+        except ValueError:
+            raise KeyError(key) from None
+        if not isinstance(inputs, list) or not all(isinstance(value, (str, int, float, bool, type(None)))
+                                                   for value in inputs):
+            raise KeyError(key)
+        if not hmac.compare_digest(self._key(build_model, tuple(inputs)), key):
+            if self._process_secret:
+                warnings.warn(f"Figure key rejected, it may have been registered by another process: set "
+                              f"{SECRET_ENV_VAR} to the same secret for all the processes serving the dashboards.",
+                              RuntimeWarning)
+            raise KeyError(key)
+
+        self.register(build_model, tab_figures, *inputs)
+
+    def _drop_if_oversized(self, key: str) -> None:
+        """Drops the figures of the key when they exceed max_entry_bytes on their own."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.nbytes > self.max_entry_bytes:
+                del self._entries[key]
+
+    def get(self, key: str, build_model: Optional[Callable[..., Any]] = None,
+            tab_figures: Optional[Dict[str, str]] = None) -> LazyFigures:
+        """
+        Lazy figures of the registered key, raises KeyError for unknown keys.
+
+        :param key: key returned by register
+        :param build_model: model builder the key was registered with, to register unknown keys again
+        :param tab_figures: figures of the tabs the key was registered with, to register unknown keys again
+        """
+
+        if not isinstance(key, str):
+            raise KeyError(key)
+        if key not in self._sources and build_model is not None and tab_figures is not None:
+            self._restore(key, build_model, tab_figures)
+
+        with self._lock:
+            if key not in self._entries:
+                source_model, source_figures, inputs = self._sources[key]
+                self._entries[key] = LazyFigures(lambda: source_model(*inputs), source_figures)
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def figure(self, key: str, tab: str) -> Figure:
+        """Figure shown in the tab for the registered key."""
+
+        fig = self.get(key).figure(tab)
+        self._drop_if_oversized(key)
+        self._evict(keep=key)
+        return fig
+
+    def payload(self, key: str, tab: str, build_model: Optional[Callable[..., Any]] = None,
+                tab_figures: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Encoded figure shown in the tab for the registered key, as sent to the dashboards.
+
+        :param key: key returned by register
+        :param tab: tab showing the figure
+        :param build_model: model builder the key was registered with, to register unknown keys again
+        :param tab_figures: figures of the tabs the key was registered with, to register unknown keys again
+        """
+
+        payload = self.get(key, build_model, tab_figures).payload(tab)
+        self._drop_if_oversized(key)
+        self._evict(keep=key)
+        return payload
+
+    def _evict(self, keep: str) -> None:
+        """Drops the least recently used figures until the store fits in max_bytes."""
+
+        with self._lock:
+            total = self.total_bytes
+            for key in list(self._entries):
+                if total <= self.max_bytes:
+                    break
+                if key != keep:
+                    total -= self._entries.pop(key).nbytes
+
+    def clear(self) -> None:
+        """Drops all stored figures."""
+
+        with self._lock:
+            self._entries.clear()
+
+
+_figure_store = FigureStore()
+
+
+def set_figure_store(store: FigureStore) -> None:
+    """Sets the store serving the figures of all the dashboards."""
+
+    global _figure_store
+    _figure_store = store
+
+
+def get_figure_store() -> FigureStore:
+    """Returns the store serving the figures of all the dashboards."""
+
+    return _figure_store
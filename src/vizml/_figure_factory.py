@@ -0,0 +1,88 @@
+"""Contains the factory styling the figures of the models with cached, pre-validated layouts."""
+
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import plotly.graph_objects as go
+from plotly.graph_objects import Figure
+from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+
+GRID_AXIS = dict(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+
+
+@lru_cache(maxsize=None)
+def _base_layout(grid: bool, category_axes: str = '', hide_grid: bool = False) -> go.Layout:
+    """Layout shared by the figures, built and validated once and never modified."""
+
+    layout = go.Layout(title_x=0.5, plot_bgcolor=DASH_STYLE["backgroundColor"],
+                       paper_bgcolor=DASH_STYLE["backgroundColor"], font_color=DASH_STYLE["color"],
+                       template=PLOT_TEMPLATE)
+    if grid:
+        layout.update(xaxis=GRID_AXIS, yaxis=GRID_AXIS)
+    for axis in category_axes:
+        layout.update({f'{axis}axis': dict(type='category')})
+    if hide_grid:
+        layout.update(xaxis_showgrid=False, yaxis_showgrid=False)
+
+    return layout
+
+
+def _titles(title: Optional[str], xaxis_title: Optional[str], yaxis_title: Optional[str]) -> Dict[str, Any]:
+    """Layout properties setting the titles that are given."""
+
+    titles = {'title_text': title, 'xaxis_title_text': xaxis_title, 'yaxis_title_text': yaxis_title}
+
+    return {name: text for name, text in titles.items() if text is not None}
+
+
+def figure_layout(title: Optional[str] = None, xaxis_title: Optional[str] = None, yaxis_title: Optional[str] = None,
+                  grid: bool = False, category_axes: str = '', hide_grid: bool = False) -> Dict[str, Any]:
+    """
+    Layout of the figures in the style of the dashboards, as a dict in the form plotly validates layouts to.
+
+    :param title: title of the figure
+    :param xaxis_title: title of the x axis
+    :param yaxis_title: title of the y axis
+    :param grid: whether to draw the grid and zero lines of the x and y axes
+    :param category_axes: axes drawn as categories, among 'x' and 'y'
+    :param hide_grid: whether to hide the grid lines of the x and y axes
+    """
+
+    layout: Dict[str, Any] = deepcopy(_base_layout(grid, category_axes, hide_grid).to_plotly_json())
+    if title is not None:
+        layout['title']['text'] = title
+    for axis, axis_title in (('xaxis', xaxis_title), ('yaxis', yaxis_title)):
+        if axis_title is not None:
+            layout.setdefault(axis, {})['title'] = {'text': axis_title}
+
+    return layout
+
+
+def style_figure(fig: Figure, title: Optional[str] = None, xaxis_title: Optional[str] = None,
+                 yaxis_title: Optional[str] = None, grid: bool = False, category_axes: str = '',
+                 hide_grid: bool = False) -> Figure:
+    """
+    Styles a figure like the dashboards, setting its title, axes, colors and template.
+
+    The figure gets a copy of a cached layout instead of validating the style properties one by one, which
+    would take longer than building the rest of the figure. Layout properties already set on the figure, like
+    shapes and annotations, are kept.
+
+    :param fig: figure to style
+    :param title: title of the figure
+    :param xaxis_title: title of the x axis
+    :param yaxis_title: title of the y axis
+    :param grid: whether to draw the grid and zero lines of the x and y axes
+    :param category_axes: axes drawn as categories, among 'x' and 'y'
+    :param hide_grid: whether to hide the grid lines of the x and y axes
+    :return: the styled figure
+    """
+
+    existing = fig.layout.to_plotly_json()
+    existing.pop('template', None)
+
+    fig.layout = _base_layout(grid, category_axes, hide_grid)
+    fig.update_layout(existing, **_titles(title, xaxis_title, yaxis_title))
+
+    return fig
@@ -1,21 +1,54 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Dict, Iterator, List
 
 import numpy as np
+from numpy.typing import DTypeLike, NDArray
 from sklearn.datasets import make_classification, make_moons, make_circles
 
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    """Validates the number of data points per block for the generate_iter methods."""
+
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}.")
+
 
 class BaseDataGenerator(ABC):
-    """Base class to generate data points."""
+    """
+    Base class to generate data points.
+
+    Every generator owns its own PCG64 backed numpy Generator, so generating data never touches the global
+    numpy random state and independent instances can be used safely from different threads or workers.
+    """
 
     def __init__(self, random: bool = False, random_state: int = -1) -> None:
 
         if random:
-            np.random.seed(seed=None)
+            self._reseed(np.random.SeedSequence())
             return
 
         self._seed: int = 0 if random_state == -1 else random_state
-        np.random.seed(seed=self._seed)
+        self._reseed(np.random.SeedSequence(self._seed))
+
+    @classmethod
+    def _from_seed_sequence(cls, seed_sequence: np.random.SeedSequence) -> "BaseDataGenerator":
+        """Creates an unseeded generator drawing from the given seed sequence."""
+
+        generator = cls.__new__(cls)
+        generator._reseed(seed_sequence)
+
+        return generator
+
+    def _reseed(self, seed_sequence: np.random.SeedSequence) -> None:
+        """Resets the random number generator to draw from the given seed sequence."""
+
+        self._seed_sequence = seed_sequence
+        self._bit_generator = np.random.PCG64(seed_sequence)
+        self._rng = np.random.Generator(self._bit_generator)
+        # Independent stream for the normal samples of the linear generators, jumped once so it never overlaps
+        self._normal_rng = np.random.Generator(self._bit_generator.jumped())
 
     @property
     def seed_value(self) -> int:
@@ -23,6 +56,33 @@ class BaseDataGenerator(ABC):
 
         return self._seed
 
+    @property
+    def rng(self) -> np.random.Generator:
+        """The numpy random Generator used by this instance."""
+
+        return self._rng
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """State of the random streams of this instance, which are moved back to it when it is set."""
+
+        return {'rng': self._bit_generator.state, 'normal_rng': self._normal_rng.bit_generator.state}
+
+    @state.setter
+    def state(self, state: Dict[str, Any]) -> None:
+
+        self._bit_generator.state = state['rng']
+        self._normal_rng.bit_generator.state = state['normal_rng']
+
+    @property
+    def _sklearn_random_state(self) -> int:
+        """Random state to pass on to the sklearn dataset functions."""
+
+        try:
+            return self.seed_value
+        except AttributeError:
+            return int(self._rng.integers(np.iinfo(np.int32).max))
+
     def set_seed(self, new_seed: int) -> None:
         """
         Sets a new value for the seed.
@@ -31,7 +91,19 @@ class BaseDataGenerator(ABC):
         """
 
         self._seed = new_seed
-        np.random.seed(seed=self._seed)
+        self._reseed(np.random.SeedSequence(self._seed))
+
+    def spawn(self, no_of_children: int) -> List["BaseDataGenerator"]:
+        """
+        Creates generators of the same type with independent random streams derived from this one.
+
+        Children are derived deterministically from the seed, so generating chunks of data from the children
+        gives the same output regardless of whether they run one after another or in parallel workers.
+
+        :param no_of_children: Number of child generators to create.
+        """
+
+        return [self._from_seed_sequence(child) for child in self._seed_sequence.spawn(no_of_children)]
 
     @abstractmethod
     def generate(self, no_of_points: int = 1):
@@ -45,14 +117,60 @@ class NormalDataGenerator(BaseDataGenerator):
     def generate(self, no_of_points: int = 1):
         """Generates the respective normal data points."""
 
+    def _generate_normal_iter(self, no_of_points: int, no_of_dims: int,
+                              chunk_size: int) -> Iterator[NDArray[Any]]:
+        """Generates blocks of standard normal points, drawn sequentially from the same stream as generate."""
+
+        _check_chunk_size(chunk_size)
+
+        for start in range(0, no_of_points, chunk_size):
+            yield self._rng.standard_normal(size=(min(chunk_size, no_of_points - start), no_of_dims))
+
 
 class LinearDataGenerator(BaseDataGenerator):
     """Base class to generate linear data points."""
 
     @abstractmethod
-    def generate(self, no_of_points: int = 10, is_increasing: bool = False):
+    def generate(self, no_of_points: int = 10, is_increasing: bool = False, dtype: DTypeLike = np.float64):
         """Generates the respective linear data points."""
 
+    def _generate_linear(self, no_of_points: int, no_of_dims: int, is_increasing: bool,
+                         dtype: DTypeLike = np.float64) -> NDArray[Any]:
+        """Generates noisy points along a line with all the noise drawn in bulk."""
+
+        chunks = list(self._generate_linear_iter(no_of_points=no_of_points, no_of_dims=no_of_dims,
+                                                 is_increasing=is_increasing, dtype=dtype,
+                                                 chunk_size=max(no_of_points, 1)))
+
+        return chunks[0] if chunks else np.empty((0, no_of_dims), dtype=dtype)
+
+    def _generate_linear_iter(self, no_of_points: int, no_of_dims: int, is_increasing: bool,
+                              dtype: DTypeLike = np.float64,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[NDArray[Any]]:
+        """
+        Generates blocks of noisy points along a line.
+
+        Every column follows the row index; when decreasing, the last column follows it in reverse.
+        The noise scales and the normal samples are drawn from separate streams, so the values do not depend on
+        how the points are split into blocks.
+        """
+
+        _check_chunk_size(chunk_size)
+
+        for start in range(0, no_of_points, chunk_size):
+            index = np.arange(start, min(start + chunk_size, no_of_points))
+            data_points = np.empty((len(index), no_of_dims), dtype=dtype)
+            data_points[:] = index[:, np.newaxis]
+
+            if not is_increasing:
+                data_points[:, -1] = no_of_points - 1 - index
+
+            noise = self._rng.uniform(1.75, 7, size=data_points.shape)
+            noise *= self._normal_rng.standard_normal(size=data_points.shape)
+            data_points += noise
+
+            yield data_points
+
 
 class ClassificationDataGenerator(BaseDataGenerator):
     """Base class to generate data for classification."""
@@ -61,13 +179,43 @@ class ClassificationDataGenerator(BaseDataGenerator):
     def generate(self, no_of_points: int = 10):
         """Generates the respective data points for classification."""
 
+    def _with_labels(self, x: NDArray[Any], y: NDArray[Any], no_of_random_dims: int = 0) -> NDArray[Any]:
+        """
+        Writes the features and the labels into a single preallocated array.
+
+        :param x: Features generated for each data point.
+        :param y: Labels of the data points, written to the last column.
+        :param no_of_random_dims: Number of extra feature columns drawn uniformly from [0, 1.5).
+        """
+
+        no_of_points, no_of_dims = x.shape
+        data_points = np.empty((no_of_points, no_of_dims + no_of_random_dims + 1))
+
+        data_points[:, :no_of_dims] = x
+        if no_of_random_dims:
+            random_dims = data_points[:, no_of_dims:-1]
+            # Values are drawn in row order, matching the previous point by point construction
+            random_dims[:] = self._rng.random(size=(no_of_points, no_of_random_dims))
+            random_dims *= 1.5
+        data_points[:, -1] = y
+
+        return data_points
+
 
 class FloatingPointGenerator(NormalDataGenerator):
 
     def generate(self, no_of_points: int = 1) -> float:
         """Generates a single random float value."""
 
-        return np.random.uniform()
+        return self._rng.uniform()
+
+    def generate_iter(self, no_of_points: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[NDArray[Any]]:
+        """Generates the values of no_of_points calls of generate in 1D blocks of chunk_size values."""
+
+        _check_chunk_size(chunk_size)
+
+        for start in range(0, no_of_points, chunk_size):
+            yield self._rng.uniform(size=min(chunk_size, no_of_points - start))
 
 
 class Normal1DGenerator(NormalDataGenerator):
@@ -75,7 +223,12 @@ class Normal1DGenerator(NormalDataGenerator):
     def generate(self, no_of_points: int = 1):
         """Generates an array of random float values."""
 
-        return np.random.standard_normal(size=(no_of_points, 1))
+        return self._rng.standard_normal(size=(no_of_points, 1))
+
+    def generate_iter(self, no_of_points: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[NDArray[Any]]:
+        """Generates an array of random float values in blocks of chunk_size rows."""
+
+        return self._generate_normal_iter(no_of_points=no_of_points, no_of_dims=1, chunk_size=chunk_size)
 
 
 class Normal2DGenerator(NormalDataGenerator):
@@ -83,7 +236,12 @@ class Normal2DGenerator(NormalDataGenerator):
     def generate(self, no_of_points: int = 1):
         """Generates a 2D array of random float values."""
 
-        return np.random.standard_normal(size=(no_of_points, 2))
+        return self._rng.standard_normal(size=(no_of_points, 2))
+
+    def generate_iter(self, no_of_points: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[NDArray[Any]]:
+        """Generates an array of random float values in blocks of chunk_size rows."""
+
+        return self._generate_normal_iter(no_of_points=no_of_points, no_of_dims=2, chunk_size=chunk_size)
 
 
 class Normal3DGenerator(NormalDataGenerator):
@@ -91,61 +249,60 @@ class Normal3DGenerator(NormalDataGenerator):
     def generate(self, no_of_points: int = 1):
         """Generates a 3D array of random float values."""
 
-        return np.random.standard_normal(size=(no_of_points, 3))
+        return self._rng.standard_normal(size=(no_of_points, 3))
+
+    def generate_iter(self, no_of_points: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[NDArray[Any]]:
+        """Generates an array of random float values in blocks of chunk_size rows."""
+
+        return self._generate_normal_iter(no_of_points=no_of_points, no_of_dims=3, chunk_size=chunk_size)
 
 
 class Linear1DGenerator(LinearDataGenerator):
 
-    def generate(self, no_of_points: int = 10, is_increasing: bool = True):
+    def generate(self, no_of_points: int = 10, is_increasing: bool = True, dtype: DTypeLike = np.float64):
         """Generates a 1D array of random float values in a linearly ascending or descending order."""
 
-        if no_of_points == 0:
-            return np.array([np.array([])]).transpose()
+        return self._generate_linear(no_of_points=no_of_points, no_of_dims=1, is_increasing=is_increasing,
+                                     dtype=dtype)
 
-        if not is_increasing:
-            return np.array([np.array([i + (np.random.uniform(1.75, 7) * np.random.standard_normal())])
-                             for i in reversed(range(no_of_points))])
+    def generate_iter(self, no_of_points: int = 10, chunk_size: int = DEFAULT_CHUNK_SIZE, is_increasing: bool = True,
+                      dtype: DTypeLike = np.float64) -> Iterator[NDArray[Any]]:
+        """Generates a 1D array of linearly ordered random float values in blocks of chunk_size rows."""
 
-        return np.array([np.array([i + (np.random.uniform(1.75, 7) * np.random.standard_normal())])
-                         for i in range(no_of_points)])
+        return self._generate_linear_iter(no_of_points=no_of_points, no_of_dims=1, is_increasing=is_increasing,
+                                          dtype=dtype, chunk_size=chunk_size)
 
 
 class Linear2DGenerator(LinearDataGenerator):
 
-    def generate(self, no_of_points: int = 10, is_increasing: bool = True):
+    def generate(self, no_of_points: int = 10, is_increasing: bool = True, dtype: DTypeLike = np.float64):
         """Generates a 2D array of random float values in a linearly ascending or descending order."""
 
-        if no_of_points == 0:
-            return np.array([[], []]).transpose()
+        return self._generate_linear(no_of_points=no_of_points, no_of_dims=2, is_increasing=is_increasing,
+                                     dtype=dtype)
 
-        if not is_increasing:
-            return np.array([np.array([i + (np.random.uniform(1.75, 7) * np.random.standard_normal()),
-                                       j + (np.random.uniform(1.75, 7) * np.random.standard_normal())])
-                             for i, j in list(zip(range(no_of_points), reversed(range(no_of_points))))])
+    def generate_iter(self, no_of_points: int = 10, chunk_size: int = DEFAULT_CHUNK_SIZE, is_increasing: bool = True,
+                      dtype: DTypeLike = np.float64) -> Iterator[NDArray[Any]]:
+        """Generates a 2D array of linearly ordered random float values in blocks of chunk_size rows."""
 
-        return np.array([np.array([i + (np.random.uniform(1.75, 7) * np.random.standard_normal()),
-                                   i + (np.random.uniform(1.75, 7) * np.random.standard_normal())])
-                         for i in range(no_of_points)])
+        return self._generate_linear_iter(no_of_points=no_of_points, no_of_dims=2, is_increasing=is_increasing,
+                                          dtype=dtype, chunk_size=chunk_size)
 
 
 class Linear3DGenerator(LinearDataGenerator):
 
-    def generate(self, no_of_points: int = 10, is_increasing: bool = True):
+    def generate(self, no_of_points: int = 10, is_increasing: bool = True, dtype: DTypeLike = np.float64):
         """Generates a 3D array of random float values in a linearly ascending or descending order."""
 
-        if no_of_points == 0:
-            return np.array([[], [], []]).transpose()
+        return self._generate_linear(no_of_points=no_of_points, no_of_dims=3, is_increasing=is_increasing,
+                                     dtype=dtype)
 
-        if not is_increasing:
-            return np.array([np.array([i + (np.random.uniform(1.75, 7) * np.random.standard_normal()),
-                                       i + (np.random.uniform(1.75, 7) * np.random.standard_normal()),
-                                       j + (np.random.uniform(1.75, 7) * np.random.standard_normal())])
-                             for i, j in list(zip(range(no_of_points), reversed(range(no_of_points))))])
+    def generate_iter(self, no_of_points: int = 10, chunk_size: int = DEFAULT_CHUNK_SIZE, is_increasing: bool = True,
+                      dtype: DTypeLike = np.float64) -> Iterator[NDArray[Any]]:
+        """Generates a 3D array of linearly ordered random float values in blocks of chunk_size rows."""
 
-        return np.array([np.array([i + (np.random.uniform(1.75, 7) * np.random.standard_normal()),
-                                   i + (np.random.uniform(1.75, 7) * np.random.standard_normal()),
-                                   i + (np.random.uniform(1.75, 7) * np.random.standard_normal())])
-                         for i in range(no_of_points)])
+        return self._generate_linear_iter(no_of_points=no_of_points, no_of_dims=3, is_increasing=is_increasing,
+                                          dtype=dtype, chunk_size=chunk_size)
 
 
 class LinearlySeparable2DGenerator(ClassificationDataGenerator):
@@ -156,18 +313,14 @@ class LinearlySeparable2DGenerator(ClassificationDataGenerator):
         if no_of_points == 0:
             return np.array([[], [], []]).transpose()
 
-        random_state: Optional[int]
-        try:
-            random_state = self.seed_value
-        except AttributeError:
-            random_state = None
+        random_state = self._sklearn_random_state
 
         x, y = make_classification(n_samples=no_of_points, n_features=2, n_redundant=0, n_informative=2,
                                    random_state=random_state, n_clusters_per_class=1)
 
-        x += 1.5 * np.random.uniform(size=x.shape)
+        x += 1.5 * self._rng.uniform(size=x.shape)
 
-        return np.concatenate((x, np.expand_dims(y, axis=1)), axis=1)
+        return self._with_labels(x, y)
 
 
 class LinearlySeparable3DGenerator(ClassificationDataGenerator):
@@ -178,18 +331,14 @@ class LinearlySeparable3DGenerator(ClassificationDataGenerator):
         if no_of_points == 0:
             return np.array([[], [], [], []]).transpose()
 
-        random_state: Optional[int]
-        try:
-            random_state = self.seed_value
-        except AttributeError:
-            random_state = None
+        random_state = self._sklearn_random_state
 
         x, y = make_classification(n_samples=no_of_points, n_features=3, n_redundant=0, n_informative=3,
                                    random_state=random_state, n_clusters_per_class=1)
 
-        x += 1.5 * np.random.uniform(size=x.shape)
+        x += 1.5 * self._rng.uniform(size=x.shape)
 
-        return np.concatenate((x, np.expand_dims(y, axis=1)), axis=1)
+        return self._with_labels(x, y)
 
 
 class MoonData2DGenerator(ClassificationDataGenerator):
@@ -200,15 +349,11 @@ class MoonData2DGenerator(ClassificationDataGenerator):
         if no_of_points == 0:
             return np.array([[], [], []]).transpose()
 
-        random_state: Optional[int]
-        try:
-            random_state = self.seed_value
-        except AttributeError:
-            random_state = None
+        random_state = self._sklearn_random_state
 
         x, y = make_moons(n_samples=no_of_points, noise=0.2, random_state=random_state)
 
-        return np.concatenate((x, np.expand_dims(y, axis=1)), axis=1)
+        return self._with_labels(x, y)
 
 
 class MoonData3DGenerator(ClassificationDataGenerator):
@@ -219,17 +364,11 @@ class MoonData3DGenerator(ClassificationDataGenerator):
         if no_of_points == 0:
             return np.array([[], [], [], []]).transpose()
 
-        random_state: Optional[int]
-        try:
-            random_state = self.seed_value
-        except AttributeError:
-            random_state = None
+        random_state = self._sklearn_random_state
 
         x, y = make_moons(n_samples=no_of_points, noise=0.2, random_state=random_state)
 
-        x = np.array([np.concatenate([item, np.array([1.5 * np.random.random()])]) for item in x])
-
-        return np.concatenate((x, np.expand_dims(y, axis=1)), axis=1)
+        return self._with_labels(x, y, no_of_random_dims=1)
 
 
 class CircleDataGenerator(ClassificationDataGenerator):
@@ -240,15 +379,11 @@ class CircleDataGenerator(ClassificationDataGenerator):
         if no_of_points == 0:
             return np.array([[], [], []]).transpose()
 
-        random_state: Optional[int]
-        try:
-            random_state = self.seed_value
-        except AttributeError:
-            random_state = None
+        random_state = self._sklearn_random_state
 
         x, y = make_circles(n_samples=no_of_points, noise=0.2, factor=0.5, random_state=random_state)
 
-        return np.concatenate((x, np.expand_dims(y, axis=1)), axis=1)
+        return self._with_labels(x, y)
 
 
 class SphericalDataGenerator(ClassificationDataGenerator):
@@ -259,14 +394,8 @@ class SphericalDataGenerator(ClassificationDataGenerator):
         if no_of_points == 0:
             return np.array([[], [], [], []]).transpose()
 
-        random_state: Optional[int]
-        try:
-            random_state = self.seed_value
-        except AttributeError:
-            random_state = None
+        random_state = self._sklearn_random_state
 
         x, y = make_circles(n_samples=no_of_points, noise=0.2, factor=0.5, random_state=random_state)
 
-        x = np.array([np.concatenate([item, np.array([1.5 * np.random.random()])]) for item in x])
-
-        return np.concatenate((x, np.expand_dims(y, axis=1)), axis=1)
+        return self._with_labels(x, y, no_of_random_dims=1)
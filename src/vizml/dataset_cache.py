@@ -0,0 +1,169 @@
+"""Contains an on-disk cache for the data sets produced by the seeded data generators."""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Mapping, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from vizml.data_generator import BaseDataGenerator
+
+CACHE_DIR_ENV_VAR = 'VIZML_DATASET_CACHE_DIR'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class DatasetCache:
+    """
+    Cache of generated data sets stored as .npy files and mapped back into memory with np.memmap.
+
+    Entries are keyed by the generator class, its seed, the number of points, the shape parameters and the state
+    of its random streams, so a hit returns exactly what the generator would have produced. The least recently used
+    entries are evicted once the cached files exceed max_bytes.
+    """
+
+    def __init__(self, cache_dir: Union[str, 'os.PathLike[str]'], max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+
+        self.cache_dir = os.fspath(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(generator: BaseDataGenerator, no_of_points: int, **kwargs) -> str:
+        """Computes the key of a data set."""
+
+        shape_params = {name: np.dtype(value).str if name == 'dtype' else value
+                        for name, value in sorted(kwargs.items())}
+
+        key = json.dumps({'generator': f"{type(generator).__module__}.{type(generator).__qualname__}",
+                          'seed': generator.seed_value, 'no_of_points': no_of_points,
+                          'shape_params': shape_params, 'state': generator.state},
+                         sort_keys=True)
+
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        """Paths of the data file and the metadata file of an entry."""
+
+        return os.path.join(self.cache_dir, f"{key}.npy"), os.path.join(self.cache_dir, f"{key}.json")
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached data sets."""
+
+        return sum(os.path.getsize(os.path.join(self.cache_dir, name))
+                   for name in os.listdir(self.cache_dir) if name.endswith('.npy'))
+
+    def generate(self, generator: BaseDataGenerator, no_of_points: int, **kwargs) -> Any:
+        """
+        Returns the generated data set, reading it from the cache when available.
+
+        Cached data sets are returned as read-only memory maps and the random streams of the generator are moved to
+        where generating the data would have left it. Unseeded generators are not cached.
+
+        :param generator: Data generator to generate the data with.
+        :param no_of_points: Number of data points to generate.
+        :param kwargs: Shape parameters passed on to the generate method.
+        """
+
+        try:
+            key = self._key(generator, no_of_points, **kwargs)
+        except AttributeError:
+            # Randomized generators have no seed and are never generated twice
+            return generator.generate(no_of_points=no_of_points, **kwargs)
+
+        data_path, meta_path = self._paths(key)
+
+        try:
+            with open(meta_path) as meta_file:
+                final_state = json.load(meta_file)['state']
+            data_points = np.load(data_path, mmap_mode='r')
+        except (OSError, ValueError, KeyError):
+            pass
+        else:
+            generator.state = final_state
+            os.utime(data_path)
+            return data_points
+
+        data_points = generator.generate(no_of_points=no_of_points, **kwargs)
+
+        if isinstance(data_points, np.ndarray) and 0 < data_points.nbytes <= self.max_bytes:
+            self._store(data_path, meta_path, data_points, generator.state)
+            self._evict(keep=data_path)
+
+        return data_points
+
+    def _store(self, data_path: str, meta_path: str, data_points: NDArray[Any], final_state: Mapping[str, Any]) -> None:
+        """Writes an entry, the data file goes first so the metadata file is only visible for complete entries."""
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp_file:
+            np.save(tmp_file, data_points)
+        os.replace(tmp_path, data_path)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as tmp_file:
+            json.dump({'state': final_state}, tmp_file)
+        os.replace(tmp_path, meta_path)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Removes the least recently used entries until the cache fits in max_bytes."""
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npy'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            entries.append((os.path.getmtime(path), os.path.getsize(path), path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                os.remove(path[:-len('.npy')] + '.json')
+            except OSError:
+                # Files still mapped by another process cannot be removed on some platforms
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Removes all cached data sets."""
+
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.npy', '.json')):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_dataset_cache: Optional[DatasetCache] = (DatasetCache(os.environ[CACHE_DIR_ENV_VAR])
+                                          if os.environ.get(CACHE_DIR_ENV_VAR) else None)
+
+
+def set_dataset_cache(cache: Optional[DatasetCache]) -> None:
+    """
+    Sets the cache used when generating data for the models, pass None to disable caching.
+
+    Caching is disabled by default unless the VIZML_DATASET_CACHE_DIR environment variable is set.
+    """
+
+    global _dataset_cache
+    _dataset_cache = cache
+
+
+def get_dataset_cache() -> Optional[DatasetCache]:
+    """Returns the cache used when generating data for the models."""
+
+    return _dataset_cache
+
+
+def cached_generate(generator: BaseDataGenerator, no_of_points: int, **kwargs) -> Any:
+    """Generates data with the given generator, going through the dataset cache when one is set."""
+
+    if _dataset_cache is None:
+        return generator.generate(no_of_points=no_of_points, **kwargs)
+
+    return _dataset_cache.generate(generator, no_of_points, **kwargs)
@@ -1,35 +1,54 @@
 from collections import Counter
+from typing import Any, Optional
 
+import numpy as np
 import plotly.graph_objects as go
+from numpy.typing import NDArray
 from plotly.graph_objects import Figure
 from sklearn.cluster import DBSCAN
-from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from sklearn.neighbors import NearestNeighbors
+from vizml._figure_factory import style_figure
 from vizml.data_generator import Normal2DGenerator, Normal3DGenerator, NormalDataGenerator
+from vizml.dataset_cache import cached_generate
+from vizml.dbscan.neighbor_graph import NeighborGraph
+from vizml.fit_cache import cached_fit
 from vizml.metrics.clustering_metrics import AllSilhouetteScores, AvgSilhouetteScore
+from vizml.scatter_renderer import scatter3d_trace, scatter_trace
 
 
 class DBScan:
-    """Class to perform and visualize Density Based Spatial Clustering of Applications with Noise."""
+    """
+    Class to perform and visualize Density Based Spatial Clustering of Applications with Noise.
+
+    Pass max_eps to cluster from a neighbor graph searched once per data set up to that distance, so other values of
+    max_dist up to max_eps and of min_no_points are clustered without searching the neighbors again.
+    """
 
     def __init__(self, no_points: int = 100, min_no_points: int = 10, max_dist: float = 0.5,
-                 randomize: bool = False, random_state: int = -1, is_3d: bool = False):
+                 randomize: bool = False, random_state: int = -1, is_3d: bool = False, silhouette_mode: str = 'auto',
+                 max_eps: Optional[float] = None):
 
         self.min_no_points = min_no_points
         self.max_dist = max_dist
+        self.max_eps = max_eps
+        self._graph_labels: Optional[NDArray[Any]] = None
         self.clustering = DBSCAN(eps=self.max_dist, min_samples=self.min_no_points, n_jobs=-1)
         self.randomize = randomize
         self.is_3d = is_3d
+        self.silhouette_mode = silhouette_mode
+        self._noise_mask: Optional[NDArray[Any]] = None
+        self._noise_mask_labels: Optional[NDArray[Any]] = None
         self.no_points = no_points
         dpgen: NormalDataGenerator
         if self.is_3d:
             dpgen = Normal3DGenerator(random=randomize, random_state=random_state)
-            self.data_points = dpgen.generate(no_of_points=self.no_points)
+            self.data_points = cached_generate(dpgen, no_of_points=self.no_points)
             self.x1_values = self.data_points[:, 0]
             self.x2_values = self.data_points[:, 1]
             self.y_values = self.data_points[:, 2]
         else:
             dpgen = Normal2DGenerator(random=randomize, random_state=random_state)
-            self.data_points = dpgen.generate(no_of_points=self.no_points)
+            self.data_points = cached_generate(dpgen, no_of_points=self.no_points)
             self.x_values = self.data_points[:, 0]
             self.y_values = self.data_points[:, 1]
 
@@ -43,35 +62,16 @@ class DBScan:
         """
 
         if self.is_3d:
-            fig = go.Figure(data=[go.Scatter3d(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
-                                               z=self.y_values.squeeze(), mode='markers',
-                                               marker=dict(size=8, color='#FF4C29', opacity=0.7))])
-            fig.update_layout(
-                title="DBSCAN Data",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
+                                                  z=self.y_values.squeeze(), mode='markers',
+                                                  marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+            style_figure(fig, title="DBSCAN Data")
 
         else:
-            fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                             marker=dict(size=8, color='#FF4C29', opacity=0.7))])
-
-            fig.update_layout(
-                title="DBSCAN Data",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                                marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+
+            style_figure(fig, title="DBSCAN Data", xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_data.jpeg')
@@ -84,61 +84,60 @@ class DBScan:
     def train(self) -> None:
         """Trains the Model."""
 
-        self.clustering.fit(self.data_points)
+        if self.max_eps is not None:
+            graph = cached_fit(NeighborGraph(max_eps=self.max_eps), self.data_points)
+            self._graph_labels = graph.labels(self.max_dist, self.min_no_points)
+            return
+
+        self.clustering = cached_fit(self.clustering, self.data_points)
 
     @property
     def labels(self):
         """Gets the labels."""
 
+        if self._graph_labels is not None:
+            return self._graph_labels
+
         return self.clustering.labels_
 
+    @property
+    def noise_mask(self):
+        """Boolean mask of the data points labelled as noise, computed once per fit."""
+
+        labels = self.labels
+        if self._noise_mask is None or self._noise_mask_labels is not labels:
+            self._noise_mask, self._noise_mask_labels = labels == -1, labels
+
+        return self._noise_mask
+
     @property
     def num_clusters(self) -> int:
         """Returns the number of clusters."""
 
-        return len({x for x in set(self.labels) if x != -1})
+        return len(np.unique(self.labels[~self.noise_mask]))
 
     @property
     def num_outliers(self) -> int:
         """Returns the number of outliers."""
 
-        return len([x for x in self.labels if x == -1])
+        return int(np.count_nonzero(self.noise_mask))
 
     def _get_outliers_2d(self):
         """Returns outliers from the data points separately during 2d config."""
 
-        outliers_x = []
-        outliers_y = []
-        for label, xval, yval in list(zip(self.labels.squeeze(), self.x_values.squeeze(), self.y_values.squeeze())):
-            if label != -1:
-                continue
-            outliers_x.append(xval)
-            outliers_y.append(yval)
-
-        return outliers_x, outliers_y
+        return self.x_values[self.noise_mask], self.y_values[self.noise_mask]
 
     def _get_outliers_3d(self):
         """Returns outliers from the data points separately during 3d config."""
 
-        outliers_x1 = []
-        outliers_x2 = []
-        outliers_y = []
-        for label, x1val, x2val, yval in list(zip(self.labels.squeeze(), self.x1_values.squeeze(),
-                                                  self.x2_values.squeeze(), self.y_values.squeeze())):
-            if label != -1:
-                continue
-            outliers_x1.append(x1val)
-            outliers_x2.append(x2val)
-            outliers_y.append(yval)
-
-        return outliers_x1, outliers_x2, outliers_y
+        return self.x1_values[self.noise_mask], self.x2_values[self.noise_mask], self.y_values[self.noise_mask]
 
     @property
     def avg_silhouette_score(self) -> float:
         """Returns the average silhouette score of the data points."""
 
         try:
-            _score = round(AvgSilhouetteScore().compute(self.data_points, self.labels), 2)
+            _score = round(AvgSilhouetteScore(self.silhouette_mode).compute(self.data_points, self.labels), 2)
         except ValueError:
             # Happens when there is only one label
             return 1.0
@@ -156,55 +155,39 @@ class DBScan:
 
         if self.is_3d:
             outliers_x1, outliers_x2, outliers_y = self._get_outliers_3d()
-
-            fig = go.Figure(data=[go.Scatter3d(x=[x for x in self.x1_values.squeeze() if x not in outliers_x1],
-                                               y=[x for x in self.x2_values.squeeze() if x not in outliers_x2],
-                                               z=[x for x in self.y_values.squeeze() if x not in outliers_y],
-                                               mode='markers',
-                                               marker=dict(size=8,
-                                                           color=[x + 5 for x in self.labels if x != -1],
-                                                           # added 5 to avoid grey color
-                                                           opacity=0.7),
-                                               name='Data Points')])
-            fig.add_traces(data=[go.Scatter3d(x=outliers_x1, y=outliers_x2, z=outliers_y, mode='markers',
-                                              marker=dict(size=8, color='#FFFFFF'),
-                                              name='Outliers')])
-
-            fig.update_layout(
-                title="Clustering",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            clustered = ~self.noise_mask
+
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values[clustered],
+                                                  y=self.x2_values[clustered],
+                                                  z=self.y_values[clustered],
+                                                  mode='markers',
+                                                  marker=dict(size=8,
+                                                              color=self.labels[clustered] + 5,
+                                                              # added 5 to avoid grey color
+                                                              opacity=0.7),
+                                                  name='Data Points')])
+            fig.add_traces(data=[scatter3d_trace(x=outliers_x1, y=outliers_x2, z=outliers_y, mode='markers',
+                                                 marker=dict(size=8, color='#FFFFFF'),
+                                                 name='Outliers')])
+
+            style_figure(fig, title="Clustering")
 
         else:
             outliers_x, outliers_y = self._get_outliers_2d()
-            fig = go.Figure(data=[go.Scatter(x=[x for x in self.x_values.squeeze() if x not in outliers_x],
-                                             y=[x for x in self.y_values.squeeze() if x not in outliers_y],
-                                             mode='markers',
-                                             marker=dict(size=8,
-                                                         color=[x + 5 for x in self.labels if x != -1],
-                                                         # added 5 to avoid grey color
-                                                         opacity=0.7),
-                                             name='Data Points')])
-            fig.add_traces(data=[go.Scatter(x=outliers_x, y=outliers_y, mode='markers',
-                                            marker=dict(size=8, color='#FFFFFF'),
-                                            name='Outliers')])
-
-            fig.update_layout(
-                title="Clustering",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            clustered = ~self.noise_mask
+            fig = go.Figure(data=[scatter_trace(x=self.x_values[clustered],
+                                                y=self.y_values[clustered],
+                                                mode='markers',
+                                                marker=dict(size=8,
+                                                            color=self.labels[clustered] + 5,
+                                                            # added 5 to avoid grey color
+                                                            opacity=0.7),
+                                                name='Data Points')])
+            fig.add_traces(data=[scatter_trace(x=outliers_x, y=outliers_y, mode='markers',
+                                               marker=dict(size=8, color='#FFFFFF'),
+                                               name='Outliers')])
+
+            style_figure(fig, title="Clustering", xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_clusters.jpeg')
@@ -224,11 +207,11 @@ class DBScan:
         """
 
         try:
-            sample_silhouette_values = AllSilhouetteScores().compute(self.data_points, self.labels)
+            estimate = AllSilhouetteScores(self.silhouette_mode).estimate(self.data_points, self.labels)
+            scores_label = list(zip(estimate.values, self.labels[estimate.indices]))
         except ValueError:
             # Happens when there is only one cluster
-            sample_silhouette_values = [1.0] * len(self.labels)
-        scores_label = list(zip(sample_silhouette_values, self.labels))
+            scores_label = [(1.0, label) for label in self.labels]
 
         # Bug in mypy - cannot use lambda inside sort
         def _key0(x):
@@ -240,22 +223,12 @@ class DBScan:
         scores_label.sort(key=_key0, reverse=True)
         scores_label.sort(key=_key1)
 
-        fig = go.Figure(data=[go.Bar(x=list(range(1, self.no_points + 1)), y=[x[0] for x in scores_label],
+        fig = go.Figure(data=[go.Bar(x=list(range(1, len(scores_label) + 1)), y=[x[0] for x in scores_label],
                                      marker=dict(color=[x[1] for x in scores_label]),
                                      name='Sample Silhouette Scores')])
 
-        fig.update_layout(
-            title="Silhouette Coefficient Values",
-            xaxis_title="Number of Data Points",
-            yaxis_title="Silhouette Score",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Silhouette Coefficient Values", xaxis_title="Number of Data Points",
+                     yaxis_title="Silhouette Score", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_silhouette_plot.jpeg')
@@ -282,16 +255,7 @@ class DBScan:
                                      marker=dict(color='#FF4C29', opacity=0.6),
                                      orientation='h')])
 
-        fig.update_layout(
-            title="Metrics",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Metrics", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_silhouette_plot.jpeg')
@@ -316,18 +280,8 @@ class DBScan:
                                      text=_y, textposition='inside',
                                      marker=dict(color='#FF4C29', opacity=0.7))])
 
-        fig.update_layout(
-            title="Data Points in Each Cluster",
-            title_x=0.5,
-            xaxis_title="Labels",
-            yaxis_title="Frequency",
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Data Points in Each Cluster", xaxis_title="Labels", yaxis_title="Frequency",
+                     grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_freq_distribution.jpeg')
@@ -336,3 +290,32 @@ class DBScan:
             return fig
 
         fig.show()
+
+    def show_k_distance_plot(self, **kwargs) -> Figure:
+        """
+        Shows a plot of the sorted distances of the data points to their min_no_points-th nearest neighbor, counting
+        the points themselves. The distance where the curve bends is a good choice of max_dist.
+
+        Pass save=True as a keyword argument to save figure.
+
+        Pass return_fig=True as a keyword argument to return the figure.
+        """
+
+        neighbors = NearestNeighbors(n_neighbors=min(self.min_no_points, self.no_points), algorithm='kd_tree')
+        k_distances = np.sort(neighbors.fit(self.data_points).kneighbors(self.data_points)[0][:, -1])
+
+        fig = go.Figure(data=[go.Scatter(x=list(range(1, self.no_points + 1)), y=k_distances,
+                                         marker=dict(color='#6D9886'), name='K Distances')])
+
+        fig.add_hline(y=self.max_dist, line=dict(color='#FFFFFF', dash='dash'), annotation_text='Current max_dist')
+
+        style_figure(fig, title="K Distance Plot", xaxis_title="Data Points Sorted by Distance",
+                     yaxis_title=f"Distance to Neighbour {self.min_no_points}", grid=True)
+
+        if kwargs.get('save'):
+            fig.write_image('show_k_distance_plot.jpeg')
+
+        if kwargs.get('return_fig'):
+            return fig
+
+        fig.show()
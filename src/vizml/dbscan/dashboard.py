@@ -1,15 +1,26 @@
-import dash
 import numpy as np
 from dash import html, dcc
 from dash.dependencies import Input, Output
+from vizml._dashboard_app import LazyDash
 from vizml._dashboard_configs import DASH_STYLE
+from vizml._dashboard_figures import DECODE_FIGURE, get_figure_store
 from vizml.dbscan.clustering import DBScan
 
 
 class DashBoard:
     """Class to run a dashboard for DBScan."""
 
-    _dbscan_visualizer = dash.Dash(name="dbscan")
+    _tab_figures = {'tab-1': 'show_data',
+                    'tab-2': 'show_clusters',
+                    'tab-3': 'show_silhouette_plot',
+                    'tab-4': 'show_freq_distribution',
+                    'tab-5': 'show_metrics',
+                    'tab-6': 'show_k_distance_plot'}
+
+    # Largest max_dist of the slider, so moving the sliders reuses the neighbor graph of the data points
+    _max_eps = 2.0
+
+    _dbscan_visualizer = LazyDash(name="dbscan")
 
     _dbscan_visualizer.layout = html.Div([
         html.H1("Density Based Spatial Clustering of Applications with Noise",
@@ -25,12 +36,14 @@ class DashBoard:
                     style=DASH_STYLE),
             dcc.Tab(label='Model Metrics', value='tab-5',
                     style=DASH_STYLE),
+            dcc.Tab(label='K Distance Plot', value='tab-6',
+                    style=DASH_STYLE),
         ], style=DASH_STYLE),
         html.Div([
             dcc.Slider(
                 id="min-dist",
                 min=0.1,
-                max=2,
+                max=_max_eps,
                 step=0.1,
                 marks={str(float(i/10)): "max_dist {}".format(i/10) for i in range(2, 21, 3)},
                 tooltip={"placement": "bottom", "always_visible": False},
@@ -81,13 +94,16 @@ class DashBoard:
         ], style=DASH_STYLE),
         dcc.Graph('plot'),
         dcc.Store(id='random-state'),
-        dcc.Store(id='plot1'),
-        dcc.Store(id='plot2'),
-        dcc.Store(id='plot3'),
-        dcc.Store(id='plot4'),
-        dcc.Store(id='plot5')
+        dcc.Store(id='figure-key'),
+        dcc.Store(id='figure-payload'),
     ], style=DASH_STYLE)
 
+    _dbscan_visualizer.clientside_callback(
+        DECODE_FIGURE,
+        Output(component_id='plot', component_property='figure'),
+        Input(component_id='figure-payload', component_property='data')
+    )
+
     @staticmethod
     @_dbscan_visualizer.callback(
         Output(component_id='random-state', component_property='value'),
@@ -103,55 +119,46 @@ class DashBoard:
 
         return -1
 
+    @staticmethod
+    def _init_clustering(random_state, num_points, max_dist, min_neighbours, num_dim):
+        """Initializes and trains the model."""
+
+        is_3d = False if num_dim == '2d' else True
+
+        clu = DBScan(no_points=num_points, max_dist=max_dist, min_no_points=min_neighbours,
+                     random_state=random_state, is_3d=is_3d, max_eps=DashBoard._max_eps)
+        clu.train()
+
+        return clu
+
     @staticmethod
     @_dbscan_visualizer.callback(
-        Output(component_id='plot1', component_property='figure'),
-        Output(component_id='plot2', component_property='figure'),
-        Output(component_id='plot3', component_property='figure'),
-        Output(component_id='plot4', component_property='figure'),
-        Output(component_id='plot5', component_property='figure'),
+        Output(component_id='figure-key', component_property='data'),
         Input(component_id='random-state', component_property='value'),
         Input(component_id='no-points', component_property='value'),
         Input(component_id='min-dist', component_property='value'),
         Input(component_id='min-neighbours', component_property='value'),
         Input(component_id='no-dimensions', component_property='value')
     )
-    def _init_clustering(random_state, num_points, max_dist, min_neighbours, num_dim):
-        """Initialize K Means Clustering and store all the plots."""
+    def _update_figure_key(random_state, num_points, max_dist, min_neighbours, num_dim):
+        """Registers the inputs with the server-side figure store, keeping only their key in the browser."""
 
-        is_3d = False if num_dim == '2d' else True
-
-        clu = DBScan(no_points=num_points, max_dist=max_dist, min_no_points=min_neighbours,
-                     random_state=random_state, is_3d=is_3d)
-        clu.train()
-
-        return (clu.show_data(return_fig=True), clu.show_clusters(return_fig=True),
-                clu.show_silhouette_plot(return_fig=True), clu.show_freq_distribution(return_fig=True),
-                clu.show_metrics(return_fig=True))
+        return get_figure_store().register(DashBoard._init_clustering, DashBoard._tab_figures,
+                                           random_state, num_points, max_dist, min_neighbours, num_dim)
 
     @staticmethod
     @_dbscan_visualizer.callback(
-        Output(component_id='plot', component_property='figure'),
+        Output(component_id='figure-payload', component_property='data'),
         Input(component_id='plot-tabs', component_property='value'),
-        Input(component_id='plot1', component_property='figure'),
-        Input(component_id='plot2', component_property='figure'),
-        Input(component_id='plot3', component_property='figure'),
-        Input(component_id='plot4', component_property='figure'),
-        Input(component_id='plot5', component_property='figure')
+        Input(component_id='figure-key', component_property='data')
     )
-    def _update_plots(plot_tab, fig1, fig2, fig3, fig4, fig5):
-        """Updates the plot based on the chosen tab."""
-
-        if plot_tab == "tab-1":
-            return fig1
-        elif plot_tab == "tab-2":
-            return fig2
-        elif plot_tab == "tab-3":
-            return fig3
-        elif plot_tab == "tab-4":
-            return fig4
-        else:
-            return fig5
+    def _update_plots(plot_tab, figure_key):
+        """
+        Sends the plot of the chosen tab, computed the first time the tab is shown for the inputs, with its arrays
+        encoded as typed arrays that are decoded into the graph in the browser.
+        """
+
+        return get_figure_store().payload(figure_key, plot_tab, DashBoard._init_clustering, DashBoard._tab_figures)
 
     def run(self):
         """Runs a dashboard on localhost to visualize DBScan."""
@@ -0,0 +1,84 @@
+"""Contains a radius neighbor graph from which DBSCAN clusters are derived for any eps and min_samples."""
+
+from typing import Any, Dict
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from sklearn.neighbors import NearestNeighbors
+
+
+class NeighborGraph:
+    """
+    Sparse graph of the distances between data points up to max_eps, each row sorted by distance.
+
+    The neighbors are searched once, after which the DBSCAN labels for any eps up to max_eps and any min_samples
+    are derived from the graph. Like an estimator, it exposes get_params and fit so fitted graphs are reused
+    through the fit cache for the same data points.
+
+    :param max_eps: largest eps the labels can be computed for
+    """
+
+    def __init__(self, max_eps: float = 2.0) -> None:
+        self.max_eps = max_eps
+
+    def get_params(self, deep: bool = True) -> Dict[str, Any]:
+        """Parameters of the graph, keying it in the fit cache."""
+
+        return {'max_eps': self.max_eps}
+
+    def fit(self, data_points: NDArray[Any]) -> 'NeighborGraph':
+        """Searches the neighbors of all the data points within max_eps, including the points themselves."""
+
+        neighbors = NearestNeighbors(radius=self.max_eps, algorithm='kd_tree').fit(data_points)
+        self.graph_ = neighbors.radius_neighbors_graph(data_points, mode='distance', sort_results=True)
+        self.rows_ = np.repeat(np.arange(self.graph_.shape[0], dtype=np.int32), np.diff(self.graph_.indptr))
+        self.order_ = np.argsort(self.graph_.data, kind='stable')
+        self.sorted_distances_ = self.graph_.data[self.order_]
+
+        return self
+
+    def labels(self, eps: float, min_samples: int) -> NDArray[Any]:
+        """
+        Computes the DBSCAN labels from the graph.
+
+        Core points and their clusters match sklearn's DBSCAN, clusters being numbered in the order of their first
+        core point. Border points reachable from several clusters join the cluster of their nearest core point.
+
+        :param eps: maximum distance between two neighbors, at most max_eps
+        :param min_samples: number of neighbors of a core point, including itself
+        :return: cluster labels of the data points, -1 for noise
+        """
+
+        if eps > self.max_eps:
+            raise ValueError(f"eps must be at most the max_eps of the graph {self.max_eps}, got {eps}.")
+
+        no_points = self.graph_.shape[0]
+
+        # Edges within eps, found from the distance order and kept grouped by row in the order of the graph
+        within = np.zeros(len(self.order_), dtype=bool)
+        within[self.order_[:np.searchsorted(self.sorted_distances_, eps, side='right')]] = True
+        edges = np.flatnonzero(within)
+        rows, columns = self.rows_[edges], self.graph_.indices[edges]
+        core = np.bincount(rows, minlength=no_points) >= min_samples
+
+        core_edges = core[rows] & core[columns]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows[core_edges], minlength=no_points))))
+        core_graph = csr_matrix((np.ones(indptr[-1]), columns[core_edges], indptr), shape=(no_points, no_points))
+        _, components = connected_components(core_graph, directed=False)
+
+        labels = np.full(no_points, -1)
+        core_points = np.flatnonzero(core)
+        core_components, first_core_points = np.unique(components[core_points], return_index=True)
+        cluster_numbers = np.empty(no_points, dtype=int)
+        cluster_numbers[core_components] = np.argsort(np.argsort(first_core_points))
+        labels[core_points] = cluster_numbers[components[core_points]]
+
+        # Rows are sorted by distance, so the first core neighbor of a border point is its nearest one
+        border_edges = ~core[rows] & core[columns]
+        border_rows, border_columns = rows[border_edges], columns[border_edges]
+        first_edges = np.flatnonzero(np.diff(border_rows, prepend=-1))
+        labels[border_rows[first_edges]] = labels[border_columns[first_edges]]
+
+        return labels
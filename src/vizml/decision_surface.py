@@ -0,0 +1,249 @@
+"""Contains the grid evaluation shared by the decision boundary and decision probability plots of the classifiers."""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+Extent = Tuple[Tuple[float, float], ...]
+
+SCORE_METHODS = ('predict_proba', 'decision_function')
+ISO_LEVELS = {'predict_proba': 0.5, 'decision_function': 0.0}
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+COARSE_CELLS = 16
+
+
+@lru_cache(maxsize=32)
+def _grid(extent: Extent, resolution: int) -> Tuple[Tuple[NDArray[Any], ...], NDArray[Any]]:
+    """
+    Builds the grid axes and the grid points covering the given extent.
+
+    In 3D the points fill the volume of the extent, one per voxel corner.
+    The returned arrays are shared between calls and therefore read-only.
+    """
+
+    axes = tuple(np.linspace(low, high, resolution) for low, high in extent)
+    points = np.stack([axis.ravel() for axis in np.meshgrid(*axes)], axis=1)
+
+    for array in axes + (points,):
+        array.flags.writeable = False
+
+    return axes, points
+
+
+def data_extent(data_points: NDArray[Any], margin: float = 1.0) -> Extent:
+    """Computes the extent of each axis of the data points, padded by the margin."""
+
+    return tuple((float(low) - margin, float(high) + margin)
+                 for low, high in zip(data_points.min(axis=0), data_points.max(axis=0)))
+
+
+def _bytes_per_point(classifier: Any, n_features: int) -> int:
+    """
+    Rough estimate of the memory needed by the classifier to predict a single point.
+
+    Neighbour based models build a row of distances to every training sample, kernel models a row of kernels to
+    every support vector, and ensembles stack the outputs of every estimator.
+    """
+
+    n_values = n_features + 2
+    n_values += getattr(classifier, 'n_samples_fit_', 0)
+    n_values += len(getattr(classifier, 'support_', ()))
+    for estimator in getattr(classifier, 'estimators_', ()):
+        n_values += 2 + getattr(estimator, 'n_samples_fit_', 0) + len(getattr(estimator, 'support_', ()))
+
+    return 8 * n_values
+
+
+def batch_size_for(classifier: Any, n_features: int, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> int:
+    """Number of points the classifier can predict at once while staying within the memory budget in bytes."""
+
+    return max(memory_budget // _bytes_per_point(classifier, n_features), 1)
+
+
+def predict_in_batches(method: Callable[[NDArray[Any]], NDArray[Any]], points: NDArray[Any], batch_size: int,
+                       n_jobs: int = 1) -> NDArray[Any]:
+    """
+    Applies a prediction method to the points in batches, writing the results into a single preallocated array.
+
+    :param method: prediction method of a fitted model, like predict_proba or decision_function
+    :param points: points to predict
+    :param batch_size: maximum number of points passed to the method at once
+    :param n_jobs: number of threads running batches concurrently, most sklearn prediction paths release the GIL
+    :return: the outputs of the method for all the points
+    """
+
+    if batch_size < 1:
+        raise ValueError(f"Batch size must be a positive integer, got {batch_size}.")
+
+    first = method(points[:batch_size])
+    outputs = np.empty((len(points),) + first.shape[1:], dtype=first.dtype)
+    outputs[:len(first)] = first
+
+    def predict_batch(start: int) -> None:
+        outputs[start:start + batch_size] = method(points[start:start + batch_size])
+
+    starts = range(batch_size, len(points), batch_size)
+    if n_jobs > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(predict_batch, starts))
+    else:
+        for start in starts:
+            predict_batch(start)
+
+    return outputs
+
+
+def _coarse_step(resolution: int) -> int:
+    """Largest power of two step giving at least COARSE_CELLS cells along each axis of the grid."""
+
+    return 1 << max(((resolution - 1) // COARSE_CELLS).bit_length() - 1, 0)
+
+
+class DecisionSurface:
+    """
+    Outputs of a fitted binary classifier over a grid spanning the data.
+
+    The classifier is evaluated once with either predict_proba or decision_function, and both the predicted labels
+    for the decision boundary and the surface for the decision probabilities are derived from that single pass.
+
+    The points are passed to the classifier in batches sized to stay within memory_budget bytes, optionally
+    predicted on n_jobs threads.
+
+    In 3D the classifier is evaluated over a voxel grid through the volume spanned by the data, and the decision
+    surface is the isosurface of the scores at iso_level.
+
+    With adaptive=True a 2D surface is evaluated on a coarse grid first, and only the cells whose corners differ in
+    predicted class, or in score by more than the tolerance times the score range, are recursively split and
+    evaluated further. The remaining cells are filled in by bilinear interpolation of their corners. The resolution
+    is rounded up so that the coarse cells split evenly down to single grid cells.
+    """
+
+    def __init__(self, classifier: Any, data_points: NDArray[Any], resolution: int = 300,
+                 score_method: str = 'predict_proba', adaptive: bool = False, tolerance: float = 0.05,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, n_jobs: int = 1) -> None:
+
+        if score_method not in SCORE_METHODS:
+            raise ValueError(f"Unknown score method {score_method}, use 'predict_proba' or 'decision_function'.")
+
+        self.is_3d = data_points.shape[1] == 3
+        if adaptive and self.is_3d:
+            raise ValueError("Adaptive refinement is only supported for 2D decision surfaces.")
+
+        self.score_method = score_method
+        self.iso_level = ISO_LEVELS[score_method]
+        self.adaptive = adaptive
+        self.batch_size = batch_size_for(classifier, data_points.shape[1], memory_budget)
+        self.n_jobs = n_jobs
+
+        if adaptive:
+            step = _coarse_step(resolution)
+            resolution = step * -(-(resolution - 1) // step) + 1
+
+        self.resolution = resolution
+        self.axes, self.points = _grid(data_extent(data_points), resolution)
+
+        if adaptive:
+            scores, class_indices, evaluated = self._evaluate_adaptive(classifier, step, tolerance)
+            self.n_evaluations = int(evaluated.sum())
+        else:
+            scores, class_indices = self._evaluate(classifier, self.points)
+            self.n_evaluations = len(self.points)
+
+        self.scores = scores.ravel()
+        labels = classifier.classes_[class_indices.ravel()]
+        self.labels = labels if self.is_3d else labels.reshape(resolution, resolution)
+
+    def _evaluate(self, classifier: Any, points: NDArray[Any]) -> Tuple[NDArray[Any], NDArray[Any]]:
+        """Scores and predicted class indices of the classifier at the given points, evaluated in batches."""
+
+        if self.score_method == 'predict_proba':
+            probabilities = predict_in_batches(classifier.predict_proba, points, self.batch_size, self.n_jobs)
+            return probabilities[:, 1], probabilities.argmax(axis=1)
+
+        scores = predict_in_batches(classifier.decision_function, points, self.batch_size, self.n_jobs)
+        class_indices = (scores > 0).astype(int)
+
+        return scores, class_indices
+
+    def _evaluate_adaptive(self, classifier: Any, step: int,
+                           tolerance: float) -> Tuple[NDArray[Any], NDArray[Any], NDArray[Any]]:
+        """
+        Quadtree evaluation of the grid, refining only the cells where the class or the score changes.
+
+        :param classifier: fitted classifier
+        :param step: size in grid cells of the coarse cells, a power of two
+        :param tolerance: fraction of the coarse score range above which a cell is refined
+        :return: scores, class indices and the mask of points evaluated by the classifier
+        """
+
+        n = self.resolution
+        x_axis, y_axis = self.axes
+        scores = np.zeros((n, n))
+        class_indices = np.zeros((n, n), dtype=int)
+        evaluated = np.zeros((n, n), dtype=bool)
+
+        def evaluate(rows: NDArray[Any], cols: NDArray[Any]) -> None:
+            rows, cols = np.divmod(np.unique(rows * n + cols), n)
+            keep = ~evaluated[rows, cols]
+            rows, cols = rows[keep], cols[keep]
+            if len(rows):
+                scores[rows, cols], class_indices[rows, cols] = self._evaluate(classifier,
+                                                                               np.c_[x_axis[cols], y_axis[rows]])
+                evaluated[rows, cols] = True
+
+        rows, cols = np.meshgrid(np.arange(0, n, step), np.arange(0, n, step), indexing='ij')
+        evaluate(rows.ravel(), cols.ravel())
+        threshold = tolerance * np.ptp(scores[evaluated])
+
+        cell_rows, cell_cols = rows[:-1, :-1].ravel(), cols[:-1, :-1].ravel()
+        while step > 1:
+            corner_rows = np.stack([cell_rows, cell_rows, cell_rows + step, cell_rows + step])
+            corner_cols = np.stack([cell_cols, cell_cols + step, cell_cols, cell_cols + step])
+            corner_classes = class_indices[corner_rows, corner_cols]
+            corner_scores = scores[corner_rows, corner_cols]
+
+            refine = ((corner_classes.min(axis=0) != corner_classes.max(axis=0)) |
+                      (np.ptp(corner_scores, axis=0) > threshold))
+
+            self._fill_cells(scores, class_indices, evaluated, corner_rows[:, ~refine], corner_cols[:, ~refine], step)
+
+            half = step // 2
+            r, c = cell_rows[refine], cell_cols[refine]
+            evaluate(np.concatenate([r + half, r, r + half, r + half, r + step]),
+                     np.concatenate([c, c + half, c + half, c + step, c + half]))
+
+            cell_rows = np.concatenate([r, r + half, r, r + half])
+            cell_cols = np.concatenate([c, c, c + half, c + half])
+            step = half
+
+        return scores, class_indices, evaluated
+
+    @staticmethod
+    def _fill_cells(scores: NDArray[Any], class_indices: NDArray[Any], evaluated: NDArray[Any],
+                    corner_rows: NDArray[Any], corner_cols: NDArray[Any], step: int) -> None:
+        """Fills the points of uniform cells not evaluated by the classifier by interpolating their corners."""
+
+        offsets = np.arange(step + 1)
+        weights = offsets / step
+        rows, cols = np.broadcast_arrays(corner_rows[0][:, None, None] + offsets[None, :, None],
+                                         corner_cols[0][:, None, None] + offsets[None, None, :])
+
+        s00, s01, s10, s11 = (scores[r, c][:, None, None] for r, c in zip(corner_rows, corner_cols))
+        u, v = weights[None, :, None], weights[None, None, :]
+        values = (s00 * (1 - u) * (1 - v) + s01 * (1 - u) * v + s10 * u * (1 - v) + s11 * u * v)
+        classes = np.broadcast_to(class_indices[corner_rows[0], corner_cols[0]][:, None, None], values.shape)
+
+        missing = ~evaluated[rows, cols]
+        scores[rows[missing], cols[missing]] = values[missing]
+        class_indices[rows[missing], cols[missing]] = classes[missing]
+
+    @property
+    def probabilities(self) -> NDArray[Any]:
+        """Scores centred on their mean and scaled by their range, shaped like the labels."""
+
+        scores: NDArray[Any] = (self.scores - self.scores.mean()) / (self.scores.max() - self.scores.min())
+
+        return scores if self.is_3d else scores.reshape(self.resolution, self.resolution)
@@ -1,15 +1,22 @@
-import dash
 import numpy as np
 from dash import html, dcc
 from dash.dependencies import Input, Output
+from vizml._dashboard_app import LazyDash
 from vizml._dashboard_configs import DASH_STYLE
+from vizml._dashboard_figures import DECODE_FIGURE, get_figure_store
 from vizml.decision_tree.classification import DecisionTree
 
 
 class DashBoard:
     """Class to run a dashboard for Decision Tree."""
 
-    _decision_tree_visualizer = dash.Dash(name="decision_tree")
+    _tab_figures = {'tab-1': 'show_data',
+                    'tab-2': 'show_decision_boundary',
+                    'tab-3': 'show_decision_probabilities',
+                    'tab-4': 'show_confusion_matrix',
+                    'tab-5': 'show_metrics'}
+
+    _decision_tree_visualizer = LazyDash(name="decision_tree")
 
     _decision_tree_visualizer.layout = html.Div([
         html.H1("Decision Tree Classifier",
@@ -80,13 +87,16 @@ class DashBoard:
         ], style=DASH_STYLE),
         dcc.Graph('plot'),
         dcc.Store(id='random-state'),
-        dcc.Store(id='plot1'),
-        dcc.Store(id='plot2'),
-        dcc.Store(id='plot3'),
-        dcc.Store(id='plot4'),
-        dcc.Store(id='plot5'),
+        dcc.Store(id='figure-key'),
+        dcc.Store(id='figure-payload'),
     ], style=DASH_STYLE)
 
+    _decision_tree_visualizer.clientside_callback(
+        DECODE_FIGURE,
+        Output(component_id='plot', component_property='figure'),
+        Input(component_id='figure-payload', component_property='data')
+    )
+
     @staticmethod
     @_decision_tree_visualizer.callback(
         Output(component_id='random-state', component_property='value'),
@@ -103,20 +113,8 @@ class DashBoard:
         return -1
 
     @staticmethod
-    @_decision_tree_visualizer.callback(
-        Output(component_id='plot1', component_property='figure'),
-        Output(component_id='plot2', component_property='figure'),
-        Output(component_id='plot3', component_property='figure'),
-        Output(component_id='plot4', component_property='figure'),
-        Output(component_id='plot5', component_property='figure'),
-        Input(component_id='random-state', component_property='value'),
-        Input(component_id='no-points', component_property='value'),
-        Input(component_id='data-shape', component_property='value'),
-        Input(component_id='no-dimensions', component_property='value'),
-        Input(component_id='max-depth', component_property='value')
-    )
     def _init_classifier(random_state, no_points, data_shape, num_dim, max_depth):
-        """Initializes the classifier and stores the initial plots."""
+        """Initializes and trains the model."""
 
         is_3d = False if num_dim == '2d' else True
 
@@ -125,26 +123,36 @@ class DashBoard:
 
         clf.train()
 
-        return (clf.show_data(return_fig=True), clf.show_decision_boundary(return_fig=True),
-                clf.show_decision_probabilities(return_fig=True), clf.show_confusion_matrix(return_fig=True),
-                clf.show_metrics(return_fig=True))
+        return clf
 
     @staticmethod
     @_decision_tree_visualizer.callback(
-        Output(component_id='plot', component_property='figure'),
-        Input(component_id='plot-tabs', component_property='value'),
-        Input(component_id='plot1', component_property='figure'),
-        Input(component_id='plot2', component_property='figure'),
-        Input(component_id='plot3', component_property='figure'),
-        Input(component_id='plot4', component_property='figure'),
-        Input(component_id='plot5', component_property='figure'),
+        Output(component_id='figure-key', component_property='data'),
+        Input(component_id='random-state', component_property='value'),
+        Input(component_id='no-points', component_property='value'),
+        Input(component_id='data-shape', component_property='value'),
+        Input(component_id='no-dimensions', component_property='value'),
+        Input(component_id='max-depth', component_property='value')
     )
-    def _update_graph(plot_tab, plot1, plot2, plot3, plot4, plot5):
-        """Switches plot based on selection."""
+    def _update_figure_key(random_state, no_points, data_shape, num_dim, max_depth):
+        """Registers the inputs with the server-side figure store, keeping only their key in the browser."""
 
-        plots = {'tab-1': plot1, 'tab-2': plot2, 'tab-3': plot3, 'tab-4': plot4, 'tab-5': plot5}
+        return get_figure_store().register(DashBoard._init_classifier, DashBoard._tab_figures,
+                                           random_state, no_points, data_shape, num_dim, max_depth)
+
+    @staticmethod
+    @_decision_tree_visualizer.callback(
+        Output(component_id='figure-payload', component_property='data'),
+        Input(component_id='plot-tabs', component_property='value'),
+        Input(component_id='figure-key', component_property='data')
+    )
+    def _update_graph(plot_tab, figure_key):
+        """
+        Sends the plot of the chosen tab, computed the first time the tab is shown for the inputs, with its arrays
+        encoded as typed arrays that are decoded into the graph in the browser.
+        """
 
-        return plots[plot_tab]
+        return get_figure_store().payload(figure_key, plot_tab, DashBoard._init_classifier, DashBoard._tab_figures)
 
     def run(self):
         """Runs a dashboard on localhost to visualize Decision Tree."""
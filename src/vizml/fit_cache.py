@@ -0,0 +1,139 @@
+"""Contains an in-memory cache of the estimators fitted by the models."""
+
+import hashlib
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+class FitCache:
+    """
+    Bounded cache of fitted estimators.
+
+    Entries are keyed by the estimator class, its hyperparameters and a hash of the data it is fitted on, so
+    revisiting a configuration returns the estimator fitted before instead of fitting it again. Estimators are
+    stored pickled and the least recently used ones are evicted once the pickles exceed max_bytes.
+
+    Every hit returns a new copy of the fitted estimator, so callers may update the estimators they get, like with
+    partial_fit, without affecting the cache or other callers. Estimators with a random_state left to None are
+    fitted anew every time, as their fits are random, unless cache_unseeded is set.
+
+    :param max_bytes: total size of the pickled estimators above which the least recently used are evicted
+    :param cache_unseeded: whether to also cache the first fit of estimators without a fixed random_state
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_unseeded: bool = False) -> None:
+        self.max_bytes = max_bytes
+        self.cache_unseeded = cache_unseeded
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of the cached estimators."""
+        return sum(len(pickled) for pickled in self._entries.values())
+
+    @staticmethod
+    def _is_unseeded(estimator: Any) -> bool:
+        """Whether the estimator, or one of its nested estimators, draws its randomness from an unfixed seed."""
+
+        return any(value is None or isinstance(value, np.random.RandomState)
+                   for name, value in estimator.get_params().items()
+                   if name == 'random_state' or name.endswith('__random_state'))
+
+    @staticmethod
+    def _key(estimator: Any, arrays: Tuple[NDArray[Any], ...]) -> str:
+        """Computes the key of an estimator fitted on the arrays."""
+
+        key = hashlib.sha1(f"{type(estimator).__module__}.{type(estimator).__qualname__}".encode())
+        key.update(repr(sorted(estimator.get_params().items())).encode())
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            key.update(f"{array.dtype.str}{array.shape}".encode())
+            key.update(array.data)
+
+        return key.hexdigest()
+
+    def fit(self, estimator: Any, *arrays: NDArray[Any]) -> Any:
+        """
+        Fits the estimator on the arrays, returning a copy of the cached estimator when it has been fitted before.
+
+        :param estimator: unfitted scikit-learn estimator
+        :param arrays: arrays passed to estimator.fit, like the data points and their labels
+        :return: the fitted estimator, owned by the caller
+        """
+
+        if not self.cache_unseeded and self._is_unseeded(estimator):
+            return estimator.fit(*arrays)
+
+        key = self._key(estimator, arrays)
+
+        with self._lock:
+            pickled = self._entries.get(key)
+            if pickled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if pickled is not None:
+            return pickle.loads(pickled)
+
+        estimator.fit(*arrays)
+        pickled = pickle.dumps(estimator, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if len(pickled) <= self.max_bytes:
+            with self._lock:
+                self._entries[key] = pickled
+                self._evict()
+
+        return estimator
+
+    def _evict(self) -> None:
+        """Removes the least recently used estimators until the cache fits in max_bytes."""
+
+        total = self.total_bytes
+        while total > self.max_bytes:
+            _, pickled = self._entries.popitem(last=False)
+            total -= len(pickled)
+
+    def clear(self) -> None:
+        """Removes all cached estimators."""
+
+        with self._lock:
+            self._entries.clear()
+
+
+_fit_cache: Optional[FitCache] = FitCache()
+
+
+def set_fit_cache(cache: Optional[FitCache]) -> None:
+    """Sets the cache used when training the models, pass None to disable caching."""
+
+    global _fit_cache
+    _fit_cache = cache
+
+
+def get_fit_cache() -> Optional[FitCache]:
+    """Returns the cache used when training the models."""
+
+    return _fit_cache
+
+
+def cached_fit(estimator: Any, *arrays: NDArray[Any]) -> Any:
+    """Fits the estimator on the arrays, using the fit cache when one is set."""
+
+    if _fit_cache is None:
+        return estimator.fit(*arrays)
+
+    return _fit_cache.fit(estimator, *arrays)
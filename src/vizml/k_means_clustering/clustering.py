@@ -1,41 +1,106 @@
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
 
+import numpy as np
 import plotly.graph_objects as go
+from numpy.typing import NDArray
 from plotly.graph_objects import Figure
-from sklearn.cluster import KMeans
-from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from vizml._figure_factory import style_figure
 from vizml.data_generator import Normal2DGenerator, Normal3DGenerator, NormalDataGenerator
-from vizml.metrics.clustering_metrics import AvgSilhouetteScore, AllSilhouetteScores
+from vizml.dataset_cache import cached_generate
+from vizml.fit_cache import cached_fit
+from vizml.metrics.clustering_metrics import AvgSilhouetteScore, AllSilhouetteScores, SilhouetteEstimate
+from vizml.scatter_renderer import scatter3d_trace, scatter_trace
+
+K_RANGE = range(2, 11)
+ENGINES = ('batch', 'minibatch', 'online')
+DEFAULT_BATCH_SIZE = 1024
+
+
+class KFit(NamedTuple):
+    """Inertia, labels and average silhouette score of K Means fitted with k clusters."""
+
+    k: int
+    inertia: float
+    labels: NDArray[Any]
+    silhouette: SilhouetteEstimate
+
+
+def _grow_centers(data_points: NDArray[Any], centers: NDArray[Any], seed: int) -> NDArray[Any]:
+    """
+    Adds a center to the centers, sampled with probability proportional to the squared distance from them.
+
+    The center is sampled uniformly when all the data points coincide with the centers.
+    """
+
+    squared_distances = ((data_points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+    total = squared_distances.sum()
+    rng = np.random.default_rng(seed)
+    new_center = data_points[rng.choice(len(data_points), p=squared_distances / total if total > 0 else None)]
+
+    return np.vstack((centers, new_center))
 
 
 class KMeansClustering:
-    """Class to perform and visualize K Means Clustering."""
+    """
+    Class to perform and visualize K Means Clustering.
+
+    The engine chooses how the clusters are fitted:
+
+    - batch: K Means on all the data points at once.
+    - minibatch: Mini-Batch K Means on all the data points at once.
+    - online: Mini-Batch K Means updated with partial_fit one batch of data points at a time, recording the centers
+      after every update. Streams of chunks, like the output of the generate_iter methods of the data generators,
+      can be clustered without holding them in memory with fit_stream.
+    """
 
     def __init__(self, no_points: int = 100, no_clusters: int = 3, randomize: bool = False,
-                 random_state: int = -1, is_3d: bool = False):
+                 random_state: int = -1, is_3d: bool = False, silhouette_mode: str = 'auto',
+                 engine: str = 'batch', batch_size: int = DEFAULT_BATCH_SIZE):
+
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine}, expected one of {ENGINES}.")
 
+        self.engine = engine
+        self.batch_size = batch_size
         self.no_clusters = no_clusters
-        self.clustering = KMeans(n_clusters=no_clusters)
+        self.clustering = self._new_clustering(no_clusters)
+        self.center_history: List[NDArray[Any]] = []
+        self._streamed_labels: Optional[NDArray[Any]] = None
         self.randomize = randomize
         self.is_3d = is_3d
+        self.silhouette_mode = silhouette_mode
+        self._k_sweep: Optional[Dict[int, KFit]] = None
         self.no_points = no_points
         dpgen: NormalDataGenerator
         if self.is_3d:
             dpgen = Normal3DGenerator(random=randomize, random_state=random_state)
-            self.data_points = dpgen.generate(no_of_points=self.no_points)
+            self.data_points = cached_generate(dpgen, no_of_points=self.no_points)
             self.x1_values = self.data_points[:, 0]
             self.x2_values = self.data_points[:, 1]
             self.y_values = self.data_points[:, 2]
         else:
             dpgen = Normal2DGenerator(random=randomize, random_state=random_state)
-            self.data_points = dpgen.generate(no_of_points=self.no_points)
+            self.data_points = cached_generate(dpgen, no_of_points=self.no_points)
             self.x_values = self.data_points[:, 0]
             self.y_values = self.data_points[:, 1]
 
+    def _new_clustering(self, no_clusters: int) -> Any:
+        """Creates the unfitted estimator of the engine."""
+
+        if self.engine == 'batch':
+            return KMeans(n_clusters=no_clusters)
+
+        return MiniBatchKMeans(n_clusters=no_clusters, batch_size=self.batch_size)
+
     def change_num_clusters(self, no_clusters: int) -> None:
         """Change the number of clusters to detect for the same data."""
         self.no_clusters = no_clusters
-        self.clustering = KMeans(n_clusters=no_clusters)
+        self.clustering = self._new_clustering(no_clusters)
+        self.center_history = []
+        self._streamed_labels = None
 
     def show_data(self, **kwargs) -> Figure:
         """
@@ -47,35 +112,17 @@ class KMeansClustering:
         """
 
         if self.is_3d:
-            fig = go.Figure(data=[go.Scatter3d(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
-                                               z=self.y_values.squeeze(), mode='markers',
-                                               marker=dict(size=8, color='#FF4C29', opacity=0.7))])
-            fig.update_layout(
-                title="K Means Clustering Data",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
+                                                  z=self.y_values.squeeze(), mode='markers',
+                                                  marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+            style_figure(fig, title="K Means Clustering Data")
 
         else:
-            fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                             marker=dict(size=8, color='#FF4C29', opacity=0.7))])
-
-            fig.update_layout(
-                title="K Means Clustering Data",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                                marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+
+            style_figure(fig, title="K Means Clustering Data", xaxis_title="X Values", yaxis_title="Y Values",
+                         grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_data.jpeg')
@@ -87,12 +134,105 @@ class KMeansClustering:
 
     def train(self) -> None:
         """Trains the Model"""
-        self.clustering.fit(self.data_points)
+
+        if self.engine == 'online':
+            self.fit_stream(self.data_points[start:start + self.batch_size]
+                            for start in range(0, self.no_points, self.batch_size))
+            return
+
+        if self.engine == 'minibatch':
+            # partial_fit updates the estimator in place, so it is fitted here rather than taken from the fit cache
+            self.clustering.fit(self.data_points)
+            return
+
+        self.clustering = cached_fit(self.clustering, self.data_points)
+
+    def partial_fit(self, data_points: NDArray[Any]) -> None:
+        """
+        Updates the clusters with a chunk of data points, recording the centers after the update.
+
+        Only available with the minibatch and online engines. The first chunk needs at least no_clusters points.
+
+        :param data_points: chunk of data points with the dimensions of the model
+        """
+
+        if self.engine == 'batch':
+            raise ValueError("partial_fit needs the minibatch or online engine.")
+
+        self.clustering.partial_fit(data_points)
+        self.center_history.append(self.clustering.cluster_centers_.copy())
+        self._streamed_labels = None
+
+    def fit_stream(self, chunks: Iterable[NDArray[Any]]) -> None:
+        """
+        Updates the clusters with each chunk of a stream of data points, like the output of generate_iter.
+
+        :param chunks: chunks of data points with the dimensions of the model
+        """
+
+        for chunk in chunks:
+            self.partial_fit(chunk)
 
     @property
     def labels(self):
         """Gets the labels"""
-        return self.clustering.labels_
+
+        if not self.center_history:
+            return self.clustering.labels_
+
+        # After partial fits the estimator only holds the labels of the last chunk
+        if self._streamed_labels is None:
+            self._streamed_labels = self.clustering.predict(self.data_points)
+
+        return self._streamed_labels
+
+    def k_sweep(self, n_jobs: int = 4, warm_start: bool = False) -> Dict[int, KFit]:
+        """
+        Fits K Means once for each number of clusters in K_RANGE, caching the fits for the elbow and silhouette plots.
+
+        The sweep is computed on the first call and reused afterwards.
+
+        :param n_jobs: number of threads fitting and scoring the numbers of clusters concurrently
+        :param warm_start: initialize each fit from the centers of the previous number of clusters and a new sampled
+                           center, fitting one after the other while only the silhouette scores are computed
+                           concurrently. Each warm fit runs a single initialization, which is faster with few threads
+                           but chains the fits, so the numbers of clusters are fitted concurrently by default
+        :return: the fits by number of clusters
+        """
+
+        if self._k_sweep is None:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                if warm_start:
+                    futures = []
+                    centers = None
+                    for k in K_RANGE:
+                        if centers is None:
+                            k_means = cached_fit(KMeans(n_clusters=k), self.data_points)
+                        else:
+                            k_means = cached_fit(KMeans(n_clusters=k, n_init=1,
+                                                        init=_grow_centers(self.data_points, centers, k)),
+                                                 self.data_points)
+                        centers = k_means.cluster_centers_
+                        futures.append(executor.submit(self._score_fit, k_means))
+                else:
+                    futures = [executor.submit(self._fit_and_score, k) for k in K_RANGE]
+
+                self._k_sweep = {future.result().k: future.result() for future in futures}
+
+        return self._k_sweep
+
+    def _fit_and_score(self, k: int) -> KFit:
+        """Fits K Means with k clusters and scores the fit."""
+
+        return self._score_fit(cached_fit(KMeans(n_clusters=k), self.data_points))
+
+    def _score_fit(self, k_means: KMeans) -> KFit:
+        """Computes the average silhouette score of a fit."""
+
+        silhouette = AvgSilhouetteScore(self.silhouette_mode, centers=k_means.cluster_centers_).estimate(
+            self.data_points, k_means.labels_)
+
+        return KFit(k_means.n_clusters, float(k_means.inertia_), k_means.labels_, silhouette)
 
     def show_clusters(self, **kwargs) -> Figure:
         """
@@ -104,45 +244,27 @@ class KMeansClustering:
         """
 
         if self.is_3d:
-            fig = go.Figure(data=[go.Scatter3d(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
-                                               z=self.y_values.squeeze(), mode='markers',
-                                               marker=dict(size=8, color=self.labels, opacity=0.7),
-                                               name='Data Points')])
-            fig.add_traces(data=[go.Scatter3d(x=self.clustering.cluster_centers_[:, 0],
-                                              y=self.clustering.cluster_centers_[:, 1],
-                                              z=self.clustering.cluster_centers_[:, 2], mode='markers',
-                                              marker=dict(size=6, color='#FFFFFF'),
-                                              name='Cluster Centers')])
-            fig.update_layout(
-                title="Clustering",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
+                                                  z=self.y_values.squeeze(), mode='markers',
+                                                  marker=dict(size=8, color=self.labels, opacity=0.7),
+                                                  name='Data Points')])
+            fig.add_traces(data=[scatter3d_trace(x=self.clustering.cluster_centers_[:, 0],
+                                                 y=self.clustering.cluster_centers_[:, 1],
+                                                 z=self.clustering.cluster_centers_[:, 2], mode='markers',
+                                                 marker=dict(size=6, color='#FFFFFF'),
+                                                 name='Cluster Centers')])
+            style_figure(fig, title="Clustering")
 
         else:
-            fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                             marker=dict(size=8, color=self.labels, opacity=0.7),
-                                             name='Data Points')])
+            fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                                marker=dict(size=8, color=self.labels, opacity=0.7),
+                                                name='Data Points')])
 
             fig.add_traces(data=[go.Scatter(x=self.clustering.cluster_centers_[:, 0],
                                             y=self.clustering.cluster_centers_[:, 1], mode='markers',
                                             marker=dict(size=6, color='#FFFFFF'), name='Cluster Centers')])
 
-            fig.update_layout(
-                title="Clustering",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            style_figure(fig, title="Clustering", xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_clusters.jpeg')
@@ -161,33 +283,17 @@ class KMeansClustering:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        wcss_list = []
-        for i in range(2, 11):
-            k_means = KMeans(n_clusters=i)
-            k_means.fit(self.data_points)
-            inertia = k_means.inertia_
-            wcss_list.append(inertia)
+        wcss_list = [fit.inertia for fit in self.k_sweep().values()]
 
-        fig = go.Figure(data=[go.Scatter(x=list(range(2, 11)), y=wcss_list,
+        fig = go.Figure(data=[go.Scatter(x=list(K_RANGE), y=wcss_list,
                                          marker=dict(color='#6D9886'), name='Elbow Plot')])
 
         fig.add_traces(data=[go.Scatter(x=[self.no_clusters],
-                                        y=[wcss_list[self.no_clusters - 2]], mode='markers',
+                                        y=[wcss_list[self.no_clusters - K_RANGE.start]], mode='markers',
                                         marker=dict(size=8, color='#FFFFFF'),
                                         name='Current Clusters')])
 
-        fig.update_layout(
-            title="Elbow Method",
-            xaxis_title="Number of Clusters",
-            yaxis_title="WCSS",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Elbow Method", xaxis_title="Number of Clusters", yaxis_title="WCSS", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_elbow_method_plot.jpeg')
@@ -206,8 +312,9 @@ class KMeansClustering:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        sample_silhouette_values = AllSilhouetteScores().compute(self.data_points, self.labels)
-        scores_label = list(zip(sample_silhouette_values, self.labels))
+        estimate = AllSilhouetteScores(self.silhouette_mode, centers=self.clustering.cluster_centers_).estimate(
+            self.data_points, self.labels)
+        scores_label = list(zip(estimate.values, self.labels[estimate.indices]))
 
         # Bug in mypy - cannot use lambda inside sort
         def _key0(x):
@@ -219,22 +326,12 @@ class KMeansClustering:
         scores_label.sort(key=_key0, reverse=True)
         scores_label.sort(key=_key1)
 
-        fig = go.Figure(data=[go.Bar(x=list(range(1, self.no_points + 1)), y=[x[0] for x in scores_label],
+        fig = go.Figure(data=[go.Bar(x=list(range(1, len(scores_label) + 1)), y=[x[0] for x in scores_label],
                                      marker=dict(color=[x[1] for x in scores_label]),
                                      name='Sample Silhouette Scores')])
 
-        fig.update_layout(
-            title="Silhouette Coefficient Values",
-            xaxis_title="Number of Data Points",
-            yaxis_title="Silhouette Score",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Silhouette Coefficient Values", xaxis_title="Number of Data Points",
+                     yaxis_title="Silhouette Score", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_silhouette_plot.jpeg')
@@ -253,30 +350,15 @@ class KMeansClustering:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        silhouette_scores = []
-        silhouette_scores_rounded = []
-        for i in range(2, 11):
-            k_means = KMeans(n_clusters=i)
-            k_means.fit(self.data_points)
-            silhouette_score = AvgSilhouetteScore().compute(self.data_points, k_means.labels_)
-            silhouette_scores.append(silhouette_score)
-            silhouette_scores_rounded.append(round(silhouette_score, 3))
+        silhouette_scores = [fit.silhouette.score for fit in self.k_sweep().values()]
+        silhouette_errors = [fit.silhouette.error for fit in self.k_sweep().values()]
 
-        fig = go.Figure(data=[go.Scatter(x=list(range(2, 11)), y=silhouette_scores,
+        fig = go.Figure(data=[go.Scatter(x=list(K_RANGE), y=silhouette_scores,
+                                         error_y=dict(type='data', array=silhouette_errors),
                                          marker=dict(color='#6D9886'), name='Average Silhouette Scores')])
 
-        fig.update_layout(
-            title="Average Silhouette Scores",
-            xaxis_title="Number of Clusters",
-            yaxis_title="Silhouette Score",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Average Silhouette Scores", xaxis_title="Number of Clusters",
+                     yaxis_title="Silhouette Score", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_avg_silhouette_scores.jpeg')
@@ -301,18 +383,8 @@ class KMeansClustering:
                                      text=_y, textposition='inside',
                                      marker=dict(color='#FF4C29', opacity=0.7))])
 
-        fig.update_layout(
-            title="Data Points in Each Cluster",
-            title_x=0.5,
-            xaxis_title="Labels",
-            yaxis_title="Frequency",
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Data Points in Each Cluster", xaxis_title="Labels", yaxis_title="Frequency",
+                     grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_freq_distribution.jpeg')
@@ -321,3 +393,47 @@ class KMeansClustering:
             return fig
 
         fig.show()
+
+    def show_center_convergence(self, **kwargs) -> Figure:
+        """
+        Shows the paths of the cluster centers over the updates of the online engine, with an animation of the
+        centers converging. Shows the final centers only when trained all at once.
+
+        Pass save=True as a keyword argument to save figure.
+
+        Pass return_fig=True as a keyword argument to return the figure.
+        """
+
+        history = np.stack(self.center_history or [self.clustering.cluster_centers_])
+        scatter: Any = go.Scatter3d if self.is_3d else go.Scatter
+
+        def _centers_trace(centers: NDArray[Any]) -> Any:
+            coordinates = dict(zip('xyz', centers.T))
+            return scatter(**coordinates, mode='markers', marker=dict(size=8, color='#FFFFFF'), name='Cluster Centers')
+
+        fig = go.Figure(data=[scatter(**dict(zip('xyz', history[:, center].T)), mode='lines',
+                                      line=dict(color='#FF4C29'), opacity=0.6, name=f'Center {center} Path')
+                              for center in range(history.shape[1])] + [_centers_trace(history[-1])])
+
+        trace_index = history.shape[1]
+        fig.frames = [go.Frame(data=[_centers_trace(centers)], traces=[trace_index], name=str(step))
+                      for step, centers in enumerate(history)]
+
+        if self.is_3d:
+            style_figure(fig, title="Cluster Center Convergence")
+        else:
+            style_figure(fig, title="Cluster Center Convergence", xaxis_title="X Values", yaxis_title="Y Values",
+                         grid=True)
+
+        fig.update_layout(updatemenus=[dict(type='buttons', showactive=False,
+                                            buttons=[dict(label='Play', method='animate',
+                                                          args=[None, dict(frame=dict(duration=100, redraw=self.is_3d),
+                                                                           fromcurrent=True)])])])
+
+        if kwargs.get('save'):
+            fig.write_image('show_center_convergence.jpeg')
+
+        if kwargs.get('return_fig'):
+            return fig
+
+        fig.show()
@@ -1,15 +1,24 @@
-import dash
 import numpy as np
 from dash import html, dcc
 from dash.dependencies import Input, Output
+from vizml._dashboard_app import LazyDash
 from vizml._dashboard_configs import DASH_STYLE
+from vizml._dashboard_figures import DECODE_FIGURE, get_figure_store
 from vizml.k_means_clustering.clustering import KMeansClustering
 
 
 class DashBoard:
     """Class to run a dashboard for K Means Clustering"""
 
-    _k_means_clustering_visualizer = dash.Dash(name="k_means_clustering")
+    _tab_figures = {'tab-1': 'show_data',
+                    'tab-2': 'show_clusters',
+                    'tab-3': 'show_elbow_plot',
+                    'tab-4': 'show_silhouette_plot',
+                    'tab-5': 'show_avg_silhouette_scores',
+                    'tab-6': 'show_freq_distribution',
+                    'tab-7': 'show_center_convergence'}
+
+    _k_means_clustering_visualizer = LazyDash(name="k_means_clustering")
 
     _k_means_clustering_visualizer.layout = html.Div([
         html.H1("K Means Clustering",
@@ -27,6 +36,8 @@ class DashBoard:
                     style=DASH_STYLE),
             dcc.Tab(label='Cluster Frequencies', value='tab-6',
                     style=DASH_STYLE),
+            dcc.Tab(label='Center Convergence', value='tab-7',
+                    style=DASH_STYLE),
         ], style=DASH_STYLE),
         html.Div([
             dcc.Slider(
@@ -58,7 +69,7 @@ class DashBoard:
                     {'label': 'Random', 'value': 'random'},
                 ],
                 value='initial',
-                style={'display': 'inline-block', 'width': '40%'}
+                style={'display': 'inline-block', 'width': '30%'}
             ),
             dcc.RadioItems(
                 id='no-dimensions',
@@ -67,19 +78,31 @@ class DashBoard:
                     {'label': '3D', 'value': '3d'},
                 ],
                 value='2d',
-                style={'display': 'inline-block', 'width': '40%'}
+                style={'display': 'inline-block', 'width': '30%'}
+            ),
+            dcc.RadioItems(
+                id='engine',
+                options=[
+                    {'label': 'Batch', 'value': 'batch'},
+                    {'label': 'Mini-Batch', 'value': 'minibatch'},
+                    {'label': 'Online', 'value': 'online'},
+                ],
+                value='batch',
+                style={'display': 'inline-block', 'width': '30%'}
             )
         ], style=DASH_STYLE),
         dcc.Graph('plot'),
         dcc.Store(id='random-state'),
-        dcc.Store(id='plot1'),
-        dcc.Store(id='plot2'),
-        dcc.Store(id='plot3'),
-        dcc.Store(id='plot4'),
-        dcc.Store(id='plot5'),
-        dcc.Store(id='plot6')
+        dcc.Store(id='figure-key'),
+        dcc.Store(id='figure-payload'),
     ], style=DASH_STYLE)
 
+    _k_means_clustering_visualizer.clientside_callback(
+        DECODE_FIGURE,
+        Output(component_id='plot', component_property='figure'),
+        Input(component_id='figure-payload', component_property='data')
+    )
+
     @staticmethod
     @_k_means_clustering_visualizer.callback(
         Output(component_id='random-state', component_property='value'),
@@ -96,57 +119,46 @@ class DashBoard:
         return -1
 
     @staticmethod
-    @_k_means_clustering_visualizer.callback(
-        Output(component_id='plot1', component_property='figure'),
-        Output(component_id='plot2', component_property='figure'),
-        Output(component_id='plot3', component_property='figure'),
-        Output(component_id='plot4', component_property='figure'),
-        Output(component_id='plot5', component_property='figure'),
-        Output(component_id='plot6', component_property='figure'),
-        Input(component_id='random-state', component_property='value'),
-        Input(component_id='no-points', component_property='value'),
-        Input(component_id='no-clusters', component_property='value'),
-        Input(component_id='no-dimensions', component_property='value')
-    )
-    def _init_clustering(random_state, num_points, num_clusters, num_dim):
-        """Initialize K Means Clustering and store all the plots."""
+    def _init_clustering(random_state, num_points, num_clusters, num_dim, engine='batch'):
+        """Initializes and trains the model."""
 
         is_3d = False if num_dim == '2d' else True
 
+        # Small batches so the online engine shows the centers converging over several updates
         clu = KMeansClustering(no_points=num_points, no_clusters=num_clusters, random_state=random_state,
-                               is_3d=is_3d)
+                               is_3d=is_3d, engine=engine, batch_size=25)
         clu.train()
 
-        return (clu.show_data(return_fig=True), clu.show_clusters(return_fig=True),
-                clu.show_elbow_plot(return_fig=True), clu.show_silhouette_plot(return_fig=True),
-                clu.show_avg_silhouette_scores(return_fig=True), clu.show_freq_distribution(return_fig=True))
+        return clu
 
     @staticmethod
     @_k_means_clustering_visualizer.callback(
-        Output(component_id='plot', component_property='figure'),
+        Output(component_id='figure-key', component_property='data'),
+        Input(component_id='random-state', component_property='value'),
+        Input(component_id='no-points', component_property='value'),
+        Input(component_id='no-clusters', component_property='value'),
+        Input(component_id='no-dimensions', component_property='value'),
+        Input(component_id='engine', component_property='value')
+    )
+    def _update_figure_key(random_state, num_points, num_clusters, num_dim, engine='batch'):
+        """Registers the inputs with the server-side figure store, keeping only their key in the browser."""
+
+        return get_figure_store().register(DashBoard._init_clustering, DashBoard._tab_figures,
+                                           random_state, num_points, num_clusters, num_dim, engine)
+
+    @staticmethod
+    @_k_means_clustering_visualizer.callback(
+        Output(component_id='figure-payload', component_property='data'),
         Input(component_id='plot-tabs', component_property='value'),
-        Input(component_id='plot1', component_property='figure'),
-        Input(component_id='plot2', component_property='figure'),
-        Input(component_id='plot3', component_property='figure'),
-        Input(component_id='plot4', component_property='figure'),
-        Input(component_id='plot5', component_property='figure'),
-        Input(component_id='plot6', component_property='figure')
+        Input(component_id='figure-key', component_property='data')
     )
-    def _update_plots(plot_tab, fig1, fig2, fig3, fig4, fig5, fig6):
-        """Updates the plot based on the chosen tab."""
-
-        if plot_tab == "tab-1":
-            return fig1
-        elif plot_tab == "tab-2":
-            return fig2
-        elif plot_tab == "tab-3":
-            return fig3
-        elif plot_tab == "tab-4":
-            return fig4
-        elif plot_tab == "tab-5":
-            return fig5
-        else:
-            return fig6
+    def _update_plots(plot_tab, figure_key):
+        """
+        Sends the plot of the chosen tab, computed the first time the tab is shown for the inputs, with its arrays
+        encoded as typed arrays that are decoded into the graph in the browser.
+        """
+
+        return get_figure_store().payload(figure_key, plot_tab, DashBoard._init_clustering, DashBoard._tab_figures)
 
     def run(self):
         """Runs a dashboard on localhost to visualize K Means Clustering."""
@@ -1,19 +1,25 @@
-import numpy as np
+from typing import Optional
+
 import plotly.graph_objects as go
 from plotly.graph_objects import Figure
 from sklearn.linear_model import LogisticRegression as LogReg
-from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from vizml._figure_factory import style_figure
 from vizml.data_generator import (LinearlySeparable2DGenerator, LinearlySeparable3DGenerator,
                                   MoonData2DGenerator, MoonData3DGenerator,
                                   CircleDataGenerator, SphericalDataGenerator)
+from vizml.dataset_cache import cached_generate
+from vizml.fit_cache import cached_fit
+from vizml.decision_surface import DEFAULT_MEMORY_BUDGET, DecisionSurface
 from vizml.metrics.classification_metrics import compute_all_metrics, compute_all_prob_metrics, ConfusionMatrix
+from vizml.scatter_renderer import scatter3d_trace, scatter_trace
 
 
 class LogisticRegression:
     """Class to perform and visualize Logistic Regression."""
 
     def __init__(self, no_points: int = 100, randomize: bool = False, random_state: int = -1,
-                 is_3d: bool = False, data_shape: str = 'linearly_separable'):
+                 is_3d: bool = False, data_shape: str = 'linearly_separable', adaptive_surface: bool = False,
+                 surface_memory_budget: int = DEFAULT_MEMORY_BUDGET, surface_n_jobs: int = 1):
 
         data_shape_generators = {(False, 'linearly_separable'): LinearlySeparable2DGenerator(random=randomize,
                                                                                              random_state=random_state),
@@ -32,14 +38,14 @@ class LogisticRegression:
         dpgen = data_shape_generators[(self.is_3d, self.data_shape)]
 
         if self.is_3d:
-            self.generated_data = dpgen.generate(no_of_points=self.no_points)
+            self.generated_data = cached_generate(dpgen, no_of_points=self.no_points)
             self.x1_values = self.generated_data[:, 0]
             self.x2_values = self.generated_data[:, 1]
             self.y_values = self.generated_data[:, 2]
             self.labels = self.generated_data[:, 3]
             self.data_points = self.generated_data[:, :3]
         else:
-            self.generated_data = dpgen.generate(no_of_points=self.no_points)
+            self.generated_data = cached_generate(dpgen, no_of_points=self.no_points)
             self.x_values = self.generated_data[:, 0]
             self.y_values = self.generated_data[:, 1]
             self.labels = self.generated_data[:, 2]
@@ -47,6 +53,11 @@ class LogisticRegression:
 
         self.classifier = LogReg(n_jobs=-1)
 
+        self.adaptive_surface = adaptive_surface
+        self.surface_memory_budget = surface_memory_budget
+        self.surface_n_jobs = surface_n_jobs
+        self._decision_surface: Optional[DecisionSurface] = None
+
     def show_data(self, **kwargs) -> Figure:
         """
         Shows a plot of the data points used to perform Logistic Regression.
@@ -57,35 +68,17 @@ class LogisticRegression:
         """
 
         if self.is_3d:
-            fig = go.Figure(data=[go.Scatter3d(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
-                                               z=self.y_values.squeeze(), mode='markers',
-                                               marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8))])
-            fig.update_layout(
-                title="Logistic Regression Data",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
+                                                  z=self.y_values.squeeze(), mode='markers',
+                                                  marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8))])
+            style_figure(fig, title="Logistic Regression Data")
 
         else:
-            fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                             marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8))])
-
-            fig.update_layout(
-                title="Logistic Regression Data",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                                marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8))])
+
+            style_figure(fig, title="Logistic Regression Data", xaxis_title="X Values", yaxis_title="Y Values",
+                         grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_data.jpeg')
@@ -97,7 +90,8 @@ class LogisticRegression:
 
     def train(self) -> None:
         """Trains the Model"""
-        self.classifier.fit(self.data_points, self.labels)
+        self.classifier = cached_fit(self.classifier, self.data_points, self.labels)
+        self._decision_surface = None
 
     @property
     def predicted_values(self):
@@ -109,6 +103,16 @@ class LogisticRegression:
         """Decision Probabilities predicted by the model."""
         return self.classifier.decision_function(self.data_points)
 
+    @property
+    def decision_surface(self) -> DecisionSurface:
+        """Model outputs over a grid spanning the data, evaluated once per training."""
+        if self._decision_surface is None:
+            self._decision_surface = DecisionSurface(self.classifier, self.data_points,
+                                                     resolution=30 if self.is_3d else 200, score_method='decision_function',
+                                                     adaptive=self.adaptive_surface and not self.is_3d,
+                                                     memory_budget=self.surface_memory_budget, n_jobs=self.surface_n_jobs)
+        return self._decision_surface
+
     def show_decision_boundary(self, **kwargs) -> Figure:
         """
         Shows a plot of the decision boundary formed by Logistic Regression.
@@ -119,62 +123,33 @@ class LogisticRegression:
         """
 
         if self.is_3d:
-            x_min, x_max = self.x1_values.min() - 1, self.x1_values.max() + 1
-            y_min, y_max = self.x2_values.min() - 1, self.x2_values.max() + 1
-            z_min, z_max = self.y_values.min() - 1, self.y_values.max() + 1
-            x_range_vals = np.linspace(x_min, x_max, 200)
-            y_range_vals = np.linspace(y_min, y_max, 200)
-            z_range_vals = np.linspace(z_min, z_max, 200)
-
-            xx, yy = np.meshgrid(x_range_vals, y_range_vals)
-            zz, _ = np.meshgrid(z_range_vals, z_range_vals)
-
-            Z = self.classifier.predict(np.c_[xx.ravel(), yy.ravel(), zz.ravel()])
-
-            fig = go.Figure(data=[go.Scatter3d(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
-                                               z=self.y_values.squeeze(), mode='markers',
-                                               marker=dict(size=8, color=self.labels, opacity=0.8),
-                                               name='Data Points')])
-
-            fig.add_traces(data=[go.Scatter3d(x=xx.ravel(), y=yy.ravel(), z=zz.ravel(), opacity=0.2,
-                                              name='Decision Boundary', marker=dict(color=Z, opacity=0.2))])
-
-            fig.update_layout(
-                title="Classification",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            xx, yy, zz = self.decision_surface.points.T
+            Z = self.decision_surface.scores
+
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
+                                                  z=self.y_values.squeeze(), mode='markers',
+                                                  marker=dict(size=8, color=self.labels, opacity=0.8),
+                                                  name='Data Points')])
+
+            fig.add_traces(data=[go.Isosurface(x=xx, y=yy, z=zz, value=Z, isomin=self.decision_surface.iso_level,
+                                               isomax=self.decision_surface.iso_level, surface_count=1,
+                                               caps=dict(x_show=False, y_show=False, z_show=False),
+                                               opacity=0.3, showscale=False, name='Decision Boundary')])
+
+            style_figure(fig, title="Classification")
 
         else:
-            x_min, x_max = self.x_values.min() - 1, self.x_values.max() + 1
-            y_min, y_max = self.y_values.min() - 1, self.y_values.max() + 1
-            x_range_vals = np.linspace(x_min, x_max, 200)
-            y_range_vals = np.linspace(y_min, y_max, 200)
-            xx, yy = np.meshgrid(x_range_vals, y_range_vals)
-            Z = self.classifier.predict(np.c_[xx.ravel(), yy.ravel()]).reshape(xx.shape)
+            x_range_vals, y_range_vals = self.decision_surface.axes
+            Z = self.decision_surface.labels
 
-            fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                             marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8),
-                                             name='Data Points')])
+            fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                                marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8),
+                                                name='Data Points')])
 
             fig.add_traces(data=[go.Contour(x=x_range_vals, y=y_range_vals, z=Z, connectgaps=True,
                                             opacity=0.2, name='Decision Boundary', showscale=False)])
 
-            fig.update_layout(
-                title="Classification",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            style_figure(fig, title="Classification", xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_decision_boundary.jpeg')
@@ -194,65 +169,31 @@ class LogisticRegression:
         """
 
         if self.is_3d:
-            x_min, x_max = self.x1_values.min() - 1, self.x1_values.max() + 1
-            y_min, y_max = self.x2_values.min() - 1, self.x2_values.max() + 1
-            z_min, z_max = self.y_values.min() - 1, self.y_values.max() + 1
-            x_range_vals = np.linspace(x_min, x_max, 200)
-            y_range_vals = np.linspace(y_min, y_max, 200)
-            z_range_vals = np.linspace(z_min, z_max, 200)
-
-            xx, yy = np.meshgrid(x_range_vals, y_range_vals)
-            zz, _ = np.meshgrid(z_range_vals, z_range_vals)
+            xx, yy, zz = self.decision_surface.points.T
+            Z = self.decision_surface.probabilities
 
-            Z = self.classifier.decision_function(np.c_[xx.ravel(), yy.ravel(), zz.ravel()])
+            fig = go.Figure(data=[scatter3d_trace(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
+                                                  z=self.y_values.squeeze(), mode='markers', showlegend=False,
+                                                  marker=dict(size=8, color=self.labels, opacity=0.8))])
 
-            Z = (Z - Z.mean()) / (Z.max() - Z.min())
+            fig.add_traces(data=[go.Isosurface(x=xx, y=yy, z=zz, value=Z, surface_count=5, opacity=0.2,
+                                               caps=dict(x_show=False, y_show=False, z_show=False),
+                                               showscale=True, showlegend=False)])
 
-            fig = go.Figure(data=[go.Scatter3d(x=self.x1_values.squeeze(), y=self.x2_values.squeeze(),
-                                               z=self.y_values.squeeze(), mode='markers', showlegend=False,
-                                               marker=dict(size=8, color=self.labels, opacity=0.8))])
-
-            fig.add_traces(data=[go.Scatter3d(x=xx.ravel(), y=yy.ravel(), z=zz.ravel(), opacity=0.2,
-                                              marker=dict(color=Z, opacity=0.2, showscale=True),
-                                              showlegend=False)])
-
-            fig.update_layout(
-                title="Decision Probabilities",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
+            style_figure(fig, title="Decision Probabilities")
 
         else:
-            x_min, x_max = self.x_values.min() - 1, self.x_values.max() + 1
-            y_min, y_max = self.y_values.min() - 1, self.y_values.max() + 1
-            x_range_vals = np.linspace(x_min, x_max, 200)
-            y_range_vals = np.linspace(y_min, y_max, 200)
-            xx, yy = np.meshgrid(x_range_vals, y_range_vals)
-            Z = self.classifier.decision_function(np.c_[xx.ravel(), yy.ravel()]).reshape(xx.shape)
-            Z = (Z - Z.mean()) / (Z.max() - Z.min())
-
-            fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                             marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8),
-                                             showlegend=False)])
+            x_range_vals, y_range_vals = self.decision_surface.axes
+            Z = self.decision_surface.probabilities
+
+            fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                                marker=dict(size=8, color=self.labels.squeeze(), opacity=0.8),
+                                                showlegend=False)])
 
             fig.add_traces(data=[go.Contour(x=x_range_vals, y=y_range_vals, z=Z, connectgaps=True,
                                             opacity=0.5, showscale=True, showlegend=False)])
 
-            fig.update_layout(
-                title="Classification",
-                xaxis_title="X Values",
-                yaxis_title="Y Values",
-                title_x=0.5,
-                plot_bgcolor=DASH_STYLE["backgroundColor"],
-                paper_bgcolor=DASH_STYLE["backgroundColor"],
-                font_color=DASH_STYLE["color"],
-                template=PLOT_TEMPLATE
-            )
-            fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-            fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+            style_figure(fig, title="Classification", xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_decision_probabilities.jpeg')
@@ -277,21 +218,8 @@ class LogisticRegression:
         fig = go.Figure(data=[go.Heatmap(x=["P", "N"], y=["N", "P"], z=z, opacity=0.7,
                                          text=z, texttemplate="%{z}", colorscale='Blackbody')])
 
-        fig.update_layout(
-            title="Confusion Matrix",
-            xaxis_title="Predicted Labels",
-            yaxis_title="Actual Labels",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-
-        fig.update_yaxes(type='category')
-        fig.update_xaxes(type='category')
-        fig.update_xaxes(showgrid=False)
-        fig.update_yaxes(showgrid=False)
+        style_figure(fig, title="Confusion Matrix", xaxis_title="Predicted Labels", yaxis_title="Actual Labels",
+                     category_axes='xy', hide_grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_confusion_matrix.jpeg')
@@ -325,20 +253,8 @@ class LogisticRegression:
         fig = go.Figure(data=[go.Bar(x=metric_val, y=metric_type, text=metric_val, textposition='inside',
                                      orientation='h', marker=dict(color='#FF4C29', opacity=0.6))])
 
-        fig.update_layout(
-            title="Classification Metrics Computed",
-            xaxis_title="Metric Value",
-            yaxis_title="Metric Name",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-
-        fig.update_yaxes(type='category')
-        fig.update_xaxes(showgrid=False)
-        fig.update_yaxes(showgrid=False)
+        style_figure(fig, title="Classification Metrics Computed", xaxis_title="Metric Value",
+                     yaxis_title="Metric Name", category_axes='y', hide_grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_metrics.jpeg')
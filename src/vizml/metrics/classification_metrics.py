@@ -2,10 +2,9 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Sequence, Union, Any, List, Tuple
 
+import numpy as np
 from numpy.typing import NDArray
-from sklearn.metrics import (accuracy_score, f1_score, precision_score, recall_score, log_loss, roc_auc_score,
-                             hinge_loss, cohen_kappa_score, hamming_loss, jaccard_score, matthews_corrcoef,
-                             balanced_accuracy_score, confusion_matrix)
+from sklearn.metrics import log_loss, roc_auc_score, hinge_loss
 
 
 class BaseErrorMetric(ABC):
@@ -17,76 +16,133 @@ class BaseErrorMetric(ABC):
         """Computes the cost."""
 
 
-class Accuracy(BaseErrorMetric):
-    """Class to compute the Accuracy Score."""
+def confusion_counts(array1: Union[NDArray[Any], Sequence[Any]],
+                     array2: Union[NDArray[Any], Sequence[Any]]) -> Tuple[NDArray[Any], NDArray[Any]]:
+    """
+    Computes the confusion matrix of true and predicted labels in a single bincount.
+
+    :param array1: true labels
+    :param array2: predicted labels
+    :return: sorted labels and the confusion matrix, with true labels along the rows like sklearn
+    """
+
+    y_true, y_pred = np.ravel(array1), np.ravel(array2)
+    if len(y_true) != len(y_pred):
+        raise ValueError(f"Found inconsistent numbers of labels: {len(y_true)} and {len(y_pred)}.")
+
+    labels, indices = np.unique(np.concatenate((y_true, y_pred)), return_inverse=True)
+    n_labels = len(labels)
+    counts = np.bincount(indices[:len(y_true)] * n_labels + indices[len(y_true):], minlength=n_labels * n_labels)
+
+    return labels, counts.reshape(n_labels, n_labels)
+
+
+def _binary_counts(labels: NDArray[Any], matrix: NDArray[Any]) -> Tuple[int, int, int]:
+    """True positives, false positives and false negatives of the positive label 1, as in sklearn binary averaging."""
+
+    positive = np.flatnonzero(labels == 1)
+    if len(labels) > 2 or (len(labels) == 2 and not len(positive)):
+        raise ValueError(f"Binary metrics need labels within 0 and 1 (positive), got {labels.tolist()}.")
+    if not len(positive):
+        return 0, 0, 0
+
+    tp = int(matrix[positive[0], positive[0]])
+    return tp, int(matrix[:, positive[0]].sum()) - tp, int(matrix[positive[0]].sum()) - tp
+
+
+def _safe_divide(numerator: float, denominator: float) -> float:
+    """Divides, returning 0 for a zero denominator like sklearn's default zero_division."""
+
+    return numerator / denominator if denominator else 0.0
+
+
+class ConfusionMatrixMetric(BaseErrorMetric):
+    """Base class for the metrics derived from the confusion matrix of the labels."""
 
     def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
                 array2: Union[NDArray[Any], Sequence[Any]]):
-        return accuracy_score(array1, array2)
+        return self.from_confusion(*confusion_counts(array1, array2))
+
+    @abstractmethod
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        """Computes the metric from the sorted labels and the confusion matrix."""
 
 
-class BalancedAccuracy(BaseErrorMetric):
+class Accuracy(ConfusionMatrixMetric):
+    """Class to compute the Accuracy Score."""
+
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        return float(np.trace(matrix) / matrix.sum())
+
+
+class BalancedAccuracy(ConfusionMatrixMetric):
     """Class to compute the Balanced Accuracy Score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return balanced_accuracy_score(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            per_class = np.diag(matrix) / matrix.sum(axis=1)
+        return float(per_class[~np.isnan(per_class)].mean())
 
 
-class F1Score(BaseErrorMetric):
+class F1Score(ConfusionMatrixMetric):
     """Class to compute the F1 Score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return f1_score(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        tp, fp, fn = _binary_counts(labels, matrix)
+        return _safe_divide(2 * tp, 2 * tp + fp + fn)
 
 
-class Precision(BaseErrorMetric):
+class Precision(ConfusionMatrixMetric):
     """Class to compute the Precision Score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return precision_score(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        tp, fp, _ = _binary_counts(labels, matrix)
+        return _safe_divide(tp, tp + fp)
 
 
-class Recall(BaseErrorMetric):
+class Recall(ConfusionMatrixMetric):
     """Class to compute the Recall Score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return recall_score(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        tp, _, fn = _binary_counts(labels, matrix)
+        return _safe_divide(tp, tp + fn)
 
 
-class CohenKappaScore(BaseErrorMetric):
+class CohenKappaScore(ConfusionMatrixMetric):
     """Class to compute the Cohen Kappa Score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return cohen_kappa_score(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        n_samples = float(matrix.sum())
+        expected_agreement = np.dot(matrix.sum(axis=1), matrix.sum(axis=0)) / n_samples
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(1 - (n_samples - np.trace(matrix)) / np.float64(n_samples - expected_agreement))
 
 
-class HammingLoss(BaseErrorMetric):
+class HammingLoss(ConfusionMatrixMetric):
     """Class to compute the Hamming Loss."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return hamming_loss(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        return float(1 - np.trace(matrix) / matrix.sum())
 
 
-class JaccardSimilarity(BaseErrorMetric):
+class JaccardSimilarity(ConfusionMatrixMetric):
     """Class to compute the Jaccard Similarity Score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return jaccard_score(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        tp, fp, fn = _binary_counts(labels, matrix)
+        return _safe_divide(tp, tp + fp + fn)
 
 
-class MatthewsCorrelation(BaseErrorMetric):
+class MatthewsCorrelation(ConfusionMatrixMetric):
     """Class to compute the Matthews Correlation Coefficient."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return matthews_corrcoef(array1, array2)
+    def from_confusion(self, labels: NDArray[Any], matrix: NDArray[Any]) -> float:
+        t_sum, p_sum = matrix.sum(axis=1).astype(float), matrix.sum(axis=0).astype(float)
+        n_samples, n_correct = float(matrix.sum()), float(np.trace(matrix))
+        cov_ytyp = n_correct * n_samples - np.dot(t_sum, p_sum)
+        cov_ypyp = n_samples ** 2 - np.dot(p_sum, p_sum)
+        cov_ytyt = n_samples ** 2 - np.dot(t_sum, t_sum)
+        return float(cov_ytyp / np.sqrt(cov_ytyt * cov_ypyp)) if cov_ytyt * cov_ypyp else 0.0
 
 
 class LogLoss(BaseErrorMetric):
@@ -118,7 +174,7 @@ class ConfusionMatrix(BaseErrorMetric):
 
     def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
                 array2: Union[NDArray[Any], Sequence[Any]]):
-        return confusion_matrix(array1, array2)
+        return confusion_counts(array1, array2)[1]
 
 
 class Metric(Enum):
@@ -146,12 +202,13 @@ class ProbMetric(Enum):
 def compute_all_metrics(array1: Union[NDArray[Any], Sequence[Any]],
                         array2: Union[NDArray[Any], Sequence[Any]],
                         rounding: int = 3) -> List[Tuple[str, float]]:
-    """Function to compute all available metrics."""
+    """Function to compute all available metrics from a single confusion matrix."""
 
+    labels, matrix = confusion_counts(array1, array2)
     computed_metrics = list()
 
     for name, metric in Metric.__members__.items():
-        computed_metrics.append((name, round(metric.value.compute(array1, array2), rounding)))
+        computed_metrics.append((name, round(metric.value.from_confusion(labels, matrix), rounding)))
 
     return computed_metrics
 
@@ -167,3 +224,155 @@ def compute_all_prob_metrics(array1: Union[NDArray[Any], Sequence[Any]],
         computed_metrics.append((name, round(metric.value.compute(array1, array2), rounding)))
 
     return computed_metrics
+
+
+class ConfusionAccumulator:
+    """
+    Running confusion counts of streamed labels, from which all the metrics of the Metric enum are derived.
+
+    Accumulators of separate parts of the labels, like the predictions of worker processes, can be merged into one.
+    """
+
+    def __init__(self) -> None:
+        self.labels: NDArray[Any] = np.empty(0)
+        self.matrix: NDArray[Any] = np.zeros((0, 0), dtype=np.int64)
+
+    def update(self, array1: Union[NDArray[Any], Sequence[Any]],
+               array2: Union[NDArray[Any], Sequence[Any]]) -> 'ConfusionAccumulator':
+        """
+        Adds a chunk of labels.
+
+        :param array1: true labels of the chunk
+        :param array2: predicted labels of the chunk
+        :return: the accumulator itself
+        """
+
+        labels, matrix = confusion_counts(array1, array2)
+        self._add(labels, matrix)
+
+        return self
+
+    def merge(self, other: 'ConfusionAccumulator') -> 'ConfusionAccumulator':
+        """
+        Adds the counts of another accumulator.
+
+        :param other: accumulator of other labels
+        :return: the accumulator itself
+        """
+
+        self._add(other.labels, other.matrix)
+
+        return self
+
+    def _add(self, labels: NDArray[Any], matrix: NDArray[Any]) -> None:
+        """Adds a confusion matrix, growing the counts with the labels not seen before."""
+
+        if not len(labels):
+            return
+        if not len(self.labels):
+            self.labels, self.matrix = labels, matrix.astype(np.int64)
+            return
+
+        all_labels = np.union1d(self.labels, labels)
+        counts = np.zeros((len(all_labels), len(all_labels)), dtype=np.int64)
+        for known_labels, known_matrix in ((self.labels, self.matrix), (labels, matrix)):
+            indices = np.searchsorted(all_labels, known_labels)
+            counts[np.ix_(indices, indices)] += known_matrix
+
+        self.labels, self.matrix = all_labels, counts
+
+    def result(self, rounding: int = 3) -> List[Tuple[str, float]]:
+        """
+        Metrics of all the labels added, in the order of the Metric enum.
+
+        :param rounding: number of decimals of the metrics
+        """
+
+        if not self.matrix.sum():
+            raise ValueError("Cannot compute metrics without any labels.")
+
+        return [(name, round(metric.value.from_confusion(self.labels, self.matrix), rounding))
+                for name, metric in Metric.__members__.items()]
+
+
+class RocAucAccumulator:
+    """
+    Approximate ROC AUC score of streamed labels and scores, from histograms of the scores of each class.
+
+    Scores within the same bin are counted as ties, so the approximation differs from the exact score by at most
+    error_bound(). Scores outside score_range fall into the edge bins. Accumulators with the same bins can be merged.
+
+    :param n_bins: number of bins of the histograms
+    :param score_range: range of the scores, like (0, 1) for probabilities
+    :param pos_label: label of the positive class, all other labels are negative
+    """
+
+    def __init__(self, n_bins: int = 1024, score_range: Tuple[float, float] = (0.0, 1.0), pos_label: Any = 1) -> None:
+
+        if n_bins < 1 or score_range[0] >= score_range[1]:
+            raise ValueError(f"Expected at least 1 bin over an increasing range, got {n_bins} over {score_range}.")
+
+        self.edges = np.linspace(score_range[0], score_range[1], n_bins + 1)
+        self.pos_label = pos_label
+        self.positives = np.zeros(n_bins, dtype=np.int64)
+        self.negatives = np.zeros(n_bins, dtype=np.int64)
+
+    def update(self, array1: Union[NDArray[Any], Sequence[Any]],
+               array2: Union[NDArray[Any], Sequence[Any]]) -> 'RocAucAccumulator':
+        """
+        Adds a chunk of labels and scores.
+
+        :param array1: true labels of the chunk
+        :param array2: scores of the positive class of the chunk
+        :return: the accumulator itself
+        """
+
+        y_true, y_score = np.ravel(array1), np.ravel(array2)
+        if len(y_true) != len(y_score):
+            raise ValueError(f"Found inconsistent numbers of values: {len(y_true)} and {len(y_score)}.")
+
+        n_bins = len(self.positives)
+        bins = np.clip(np.searchsorted(self.edges, y_score, side='right') - 1, 0, n_bins - 1)
+        positive = y_true == self.pos_label
+        self.positives += np.bincount(bins[positive], minlength=n_bins)
+        self.negatives += np.bincount(bins[~positive], minlength=n_bins)
+
+        return self
+
+    def merge(self, other: 'RocAucAccumulator') -> 'RocAucAccumulator':
+        """
+        Adds the histograms of another accumulator.
+
+        :param other: accumulator of other labels with the same bins
+        :return: the accumulator itself
+        """
+
+        if not np.array_equal(self.edges, other.edges) or self.pos_label != other.pos_label:
+            raise ValueError("Cannot merge accumulators with different bins or positive labels.")
+
+        self.positives += other.positives
+        self.negatives += other.negatives
+
+        return self
+
+    def _pairs(self) -> int:
+        """Number of positive and negative pairs, raising an error when a class is missing like sklearn."""
+
+        pairs = int(self.positives.sum()) * int(self.negatives.sum())
+        if not pairs:
+            raise ValueError("Only one class present in y_true. ROC AUC score is not defined in that case.")
+
+        return pairs
+
+    def result(self) -> float:
+        """Approximate ROC AUC score of all the labels and scores added."""
+
+        negatives_below = np.cumsum(self.negatives) - self.negatives
+        ranked_pairs = np.dot(self.positives, negatives_below) + 0.5 * np.dot(self.positives, self.negatives)
+
+        return float(ranked_pairs / self._pairs())
+
+    def error_bound(self) -> float:
+        """Largest difference between the approximate and exact score, from the pairs tied within bins."""
+
+        return float(0.5 * np.dot(self.positives, self.negatives) / self._pairs())
@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, Union, Any
+from typing import Sequence, Union, Any, NamedTuple, Optional, Tuple
 
+import numpy as np
 from numpy.typing import NDArray
-from sklearn.metrics import silhouette_samples, silhouette_score
+from sklearn.metrics import silhouette_samples
+
+SILHOUETTE_MODES = ('auto', 'exact', 'chunked', 'sampled', 'simplified')
+AUTO_EXACT_POINTS = 10000
+DEFAULT_SAMPLE_SIZE = 2000
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
 
 
 class BaseErrorMetric(ABC):
@@ -14,7 +20,220 @@ class BaseErrorMetric(ABC):
         """Computes the metric."""
 
 
-class AvgSilhouetteScore(BaseErrorMetric):
+class SilhouetteEstimate(NamedTuple):
+    """
+    Silhouette Coefficients of the evaluated data points along with their mean.
+
+    :param values: silhouette coefficients of the evaluated data points
+    :param indices: indices of the evaluated data points
+    :param score: estimate of the mean silhouette coefficient of all the data points
+    :param error: estimated absolute error of the score, 0 when computed exactly
+    """
+
+    values: NDArray[Any]
+    indices: NDArray[Any]
+    score: float
+    error: float
+
+
+def _encode_labels(data_points: NDArray[Any], labels: NDArray[Any]) -> Tuple[NDArray[Any], NDArray[Any]]:
+    """Encodes the labels to cluster indices and counts the cluster sizes, validating them like sklearn."""
+
+    if len(data_points) != len(labels):
+        raise ValueError(f"Found inconsistent numbers of samples: {len(data_points)} and {len(labels)}.")
+
+    _, codes, counts = np.unique(labels, return_inverse=True, return_counts=True)
+    if not 1 < len(counts) < len(labels):
+        raise ValueError(f"Number of labels is {len(counts)}. Valid values are 2 to n_samples - 1 (inclusive)")
+
+    return codes, counts
+
+
+def _coefficients(inner: NDArray[Any], outer: NDArray[Any], sizes: NDArray[Any]) -> NDArray[Any]:
+    """Silhouette coefficients from the inner and nearest outer cluster distances, 0 for single point clusters."""
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.nan_to_num((outer - inner) / np.maximum(inner, outer))
+
+    return np.where(sizes > 1, values, 0.0)
+
+
+def _chunked_silhouette(data_points: NDArray[Any], codes: NDArray[Any], counts: NDArray[Any],
+                        rows: NDArray[Any], max_bytes: int) -> NDArray[Any]:
+    """Exact silhouette coefficients of the rows, computing their distances to all points a chunk of rows at a time."""
+
+    order = np.argsort(codes, kind='stable')
+    sorted_features = np.ascontiguousarray(data_points[order].T)
+    starts = np.cumsum(counts) - counts
+
+    chunk_size = max(1, max_bytes // (24 * len(data_points)))
+    values = np.empty(len(rows))
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+
+        # The data points have few features, so the squared distances are summed feature by feature
+        distances = np.zeros((len(chunk), len(data_points)))
+        for point_features, features in zip(data_points[chunk].T, sorted_features):
+            distances += (point_features[:, None] - features) ** 2
+        np.sqrt(distances, out=distances)
+
+        cluster_distances = np.add.reduceat(distances, starts, axis=1)
+        own = codes[chunk]
+        inner = cluster_distances[np.arange(len(chunk)), own] / np.maximum(counts[own] - 1, 1)
+        cluster_distances /= counts
+        cluster_distances[np.arange(len(chunk)), own] = np.inf
+        values[start:start + len(chunk)] = _coefficients(inner, cluster_distances.min(axis=1), counts[own])
+
+    return values
+
+
+def _stratified_sample(codes: NDArray[Any], counts: NDArray[Any], sample_size: int,
+                       random_state: int) -> NDArray[Any]:
+    """Samples the points of each cluster in proportion to its size, at least one point per cluster."""
+
+    rng = np.random.default_rng(random_state)
+    order = np.argsort(codes, kind='stable')
+    starts = np.cumsum(counts) - counts
+    sizes = np.minimum(np.maximum(np.round(counts * sample_size / counts.sum()).astype(int), 1), counts)
+
+    return np.sort(np.concatenate([order[start + rng.choice(count, size, replace=False)]
+                                   for start, count, size in zip(starts, counts, sizes)]))
+
+
+def _stratified_mean(values: NDArray[Any], sampled_codes: NDArray[Any],
+                     counts: NDArray[Any]) -> Tuple[float, float]:
+    """Stratified mean of values sampled by cluster and its standard error with the finite population correction."""
+
+    weights = counts / counts.sum()
+    sizes = np.bincount(sampled_codes, minlength=len(counts))
+    means = np.bincount(sampled_codes, weights=values, minlength=len(counts)) / sizes
+    squares = np.bincount(sampled_codes, weights=(values - means[sampled_codes]) ** 2, minlength=len(counts))
+    variances = squares / np.maximum(sizes - 1, 1)
+    error = np.sqrt(np.sum(weights ** 2 * variances / sizes * (1 - sizes / counts)))
+
+    return float(np.dot(weights, means)), float(error)
+
+
+def _present_centers(labels: NDArray[Any], counts: NDArray[Any], centers: NDArray[Any]) -> Optional[NDArray[Any]]:
+    """
+    Centers of the clusters present in the labels, in the order of the sorted labels.
+
+    The centers are either given for the present clusters only, or indexed by the integer labels like the
+    cluster_centers_ of k means, which keeps the centers of clusters left empty. None if they are neither.
+    """
+
+    if len(centers) == len(counts):
+        return centers
+
+    present = np.unique(labels)
+    if np.issubdtype(present.dtype, np.integer) and present[0] >= 0 and present[-1] < len(centers):
+        present_centers: NDArray[Any] = centers[present]
+        return present_centers
+
+    return None
+
+
+def _simplified_silhouette(data_points: NDArray[Any], codes: NDArray[Any], counts: NDArray[Any],
+                           centers: Optional[NDArray[Any]]) -> NDArray[Any]:
+    """Silhouette coefficients using the distances to the cluster centers instead of all the points."""
+
+    if centers is None:
+        centers = np.stack([np.bincount(codes, weights=column) for column in data_points.T], axis=1) / counts[:, None]
+
+    distances = np.sqrt(((data_points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2))
+    inner = distances[np.arange(len(codes)), codes]
+    distances[np.arange(len(codes)), codes] = np.inf
+
+    return _coefficients(inner, distances.min(axis=1), counts[codes])
+
+
+def estimate_silhouette(data_points: Union[NDArray[Any], Sequence[Any]], labels: Union[NDArray[Any], Sequence[Any]],
+                        mode: str = 'auto', sample_size: int = DEFAULT_SAMPLE_SIZE, random_state: int = 0,
+                        centers: Optional[NDArray[Any]] = None,
+                        max_bytes: int = DEFAULT_MEMORY_BUDGET) -> SilhouetteEstimate:
+    """
+    Computes or estimates the Silhouette Coefficients of the data points.
+
+    The modes are:
+
+    - exact: sklearn's silhouette_samples.
+    - chunked: exact coefficients computed a chunk of points at a time within max_bytes of distances.
+    - sampled: exact coefficients of a reproducible sample stratified by cluster, the error being the standard
+      error of the stratified mean.
+    - simplified: coefficients from the distances to the cluster centers, like the centers of k means, in linear
+      time. The simplified silhouette is a different, biased measure rather than an approximation of the exact
+      one, so the error is the difference of its mean from the exact mean on a stratified sample of the points,
+      plus twice the standard error of that difference. Falls back to sampled when the centers do not match the labels.
+    - auto: chunked up to AUTO_EXACT_POINTS points and sampled beyond.
+
+    :param data_points: data points
+    :param labels: cluster labels of the data points
+    :param mode: one of SILHOUETTE_MODES
+    :param sample_size: number of points evaluated exactly when sampling
+    :param random_state: seed of the sample
+    :param centers: centers of the clusters, in the order of the sorted labels or indexed by the integer labels,
+        computed from the labels if not passed
+    :param max_bytes: memory budget of the distances computed at a time
+    """
+
+    if mode not in SILHOUETTE_MODES:
+        raise ValueError(f"Unknown silhouette mode {mode}, expected one of {SILHOUETTE_MODES}.")
+
+    data_points = np.asarray(data_points, dtype=np.float64)
+    labels = np.ravel(labels)
+    codes, counts = _encode_labels(data_points, labels)
+    all_rows = np.arange(len(labels))
+
+    if mode == 'auto':
+        mode = 'chunked' if len(labels) <= AUTO_EXACT_POINTS else 'sampled'
+    if mode == 'simplified' and centers is not None:
+        centers = _present_centers(labels, counts, np.asarray(centers, dtype=np.float64))
+        if centers is None:
+            mode = 'sampled'
+
+    if mode == 'sampled' and sample_size < len(labels):
+        rows = _stratified_sample(codes, counts, sample_size, random_state)
+        values = _chunked_silhouette(data_points, codes, counts, rows, max_bytes)
+
+        score, error = _stratified_mean(values, codes[rows], counts)
+
+        return SilhouetteEstimate(values, rows, score, error)
+
+    if mode == 'simplified':
+        values = _simplified_silhouette(data_points, codes, counts, centers)
+        rows = _stratified_sample(codes, counts, min(sample_size, len(labels)) // 10, random_state)
+        bias, bias_error = _stratified_mean(values[rows] - _chunked_silhouette(data_points, codes, counts, rows, max_bytes),
+                                            codes[rows], counts)
+
+        return SilhouetteEstimate(values, all_rows, float(values.mean()), abs(bias) + 2 * bias_error)
+
+    if mode == 'exact':
+        values = silhouette_samples(data_points, labels)
+    else:
+        values = _chunked_silhouette(data_points, codes, counts, all_rows, max_bytes)
+
+    return SilhouetteEstimate(values, all_rows, float(values.mean()), 0.0)
+
+
+class SilhouetteMetric(BaseErrorMetric):
+    """
+    Base class for the silhouette metrics, computed exactly by default or estimated with the options of
+    estimate_silhouette.
+    """
+
+    def __init__(self, mode: str = 'exact', **options: Any) -> None:
+        self.mode = mode
+        self.options = options
+
+    def estimate(self, array1: Union[NDArray[Any], Sequence[Any]],
+                 array2: Union[NDArray[Any], Sequence[Any]]) -> SilhouetteEstimate:
+        """Computes the silhouette coefficients along with the estimated error of their mean."""
+
+        return estimate_silhouette(array1, array2, mode=self.mode, **self.options)
+
+
+class AvgSilhouetteScore(SilhouetteMetric):
     """
     Class to compute the Mean Silhouette Coefficient of all samples.
     """
@@ -23,16 +242,16 @@ class AvgSilhouetteScore(BaseErrorMetric):
                 array2: Union[NDArray[Any], Sequence[Any]]):
         """Computes the metric"""
 
-        return silhouette_score(array1, array2)
+        return self.estimate(array1, array2).score
 
 
-class AllSilhouetteScores(BaseErrorMetric):
+class AllSilhouetteScores(SilhouetteMetric):
     """
-    Class to compute the Silhouette Coefficient for each sample.
+    Class to compute the Silhouette Coefficient for each sample, only of the sampled points in sampled mode.
     """
 
     def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
                 array2: Union[NDArray[Any], Sequence[Any]]):
         """Computes the metric"""
 
-        return silhouette_samples(array1, array2)
+        return self.estimate(array1, array2).values
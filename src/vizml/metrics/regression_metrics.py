@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Sequence, Union, Any, List, Tuple
+from typing import Sequence, Union, Any, Iterable, List, Tuple
 
+import numpy as np
 from numpy.typing import NDArray
-from sklearn.metrics import (mean_squared_error, mean_absolute_error, max_error, mean_squared_log_error,
-                             median_absolute_error, mean_absolute_percentage_error, r2_score)
+
+EPSILON = np.finfo(np.float64).eps
 
 
 class BaseErrorMetric(ABC):
@@ -16,68 +17,130 @@ class BaseErrorMetric(ABC):
         """Computes the cost."""
 
 
-class MeanSquaredError(BaseErrorMetric):
-    """Class to compute the error using Mean Squared Error."""
+def _as_values(array: Union[NDArray[Any], Sequence[Any]]) -> NDArray[Any]:
+    """Flattens single output values to a float array."""
+
+    values = np.asarray(array, dtype=np.float64)
+    if values.ndim == 2 and values.shape[1] == 1:
+        values = values[:, 0]
+    if values.ndim != 1:
+        raise ValueError(f"Expected single output values, got shape {values.shape}.")
+
+    return values
+
+
+class Residuals:
+    """
+    True values, predicted values and their residuals, computed once and shared by all the error metrics.
+
+    :param array1: true values
+    :param array2: predicted values
+    """
+
+    def __init__(self, array1: Union[NDArray[Any], Sequence[Any]],
+                 array2: Union[NDArray[Any], Sequence[Any]]) -> None:
+
+        self.y_true, self.y_pred = _as_values(array1), _as_values(array2)
+        if len(self.y_true) != len(self.y_pred):
+            raise ValueError(f"Found inconsistent numbers of values: {len(self.y_true)} and {len(self.y_pred)}.")
+
+        self.residuals = self.y_true - self.y_pred
+        self.abs_residuals = np.abs(self.residuals)
+        self.non_negative = not len(self.y_true) or bool(min(self.y_true.min(), self.y_pred.min()) >= 0)
+
+
+class ResidualMetric(BaseErrorMetric):
+    """Base class for the error metrics derived from the residuals."""
 
     def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
                 array2: Union[NDArray[Any], Sequence[Any]]):
-        return mean_squared_error(array1, array2)
+        return self.from_residuals(Residuals(array1, array2))
+
+    def is_defined(self, residuals: Residuals) -> bool:
+        """Whether the metric is defined for the values."""
+        return True
+
+    @abstractmethod
+    def from_residuals(self, residuals: Residuals) -> float:
+        """Computes the error from the residuals."""
+
 
+class MeanSquaredError(ResidualMetric):
+    """Class to compute the error using Mean Squared Error."""
+
+    def from_residuals(self, residuals: Residuals) -> float:
+        return float(np.dot(residuals.residuals, residuals.residuals) / len(residuals.residuals))
 
-class RootMeanSquaredError(BaseErrorMetric):
+
+class RootMeanSquaredError(ResidualMetric):
     """Class to compute the error using Root Mean Squared Error."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return mean_squared_error(array1, array2, squared=False)
+    def from_residuals(self, residuals: Residuals) -> float:
+        return float(np.sqrt(np.dot(residuals.residuals, residuals.residuals) / len(residuals.residuals)))
 
 
-class MeanAbsoluteError(BaseErrorMetric):
+class MeanAbsoluteError(ResidualMetric):
     """Class to compute the error using Mean Absolute Error."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return mean_absolute_error(array1, array2)
+    def from_residuals(self, residuals: Residuals) -> float:
+        return float(residuals.abs_residuals.mean())
 
 
-class MaxError(BaseErrorMetric):
+class MaxError(ResidualMetric):
     """Class to compute the error using the Maximum Error."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return max_error(array1, array2)
+    def from_residuals(self, residuals: Residuals) -> float:
+        return float(residuals.abs_residuals.max())
 
 
-class MeanSquaredLogError(BaseErrorMetric):
+class MeanSquaredLogError(ResidualMetric):
     """Class to compute the error using the Mean Squared Log Error."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return mean_squared_log_error(array1, array2)
+    def is_defined(self, residuals: Residuals) -> bool:
+        return residuals.non_negative
+
+    def from_residuals(self, residuals: Residuals) -> float:
+        if not residuals.non_negative:
+            raise ValueError("Mean Squared Logarithmic Error cannot be used when targets contain negative values.")
 
+        log_residuals = np.log1p(residuals.y_true) - np.log1p(residuals.y_pred)
+        return float(np.dot(log_residuals, log_residuals) / len(log_residuals))
 
-class MedianAbsoluteError(BaseErrorMetric):
+
+class MedianAbsoluteError(ResidualMetric):
     """Class to compute the error using the Median Absolute Error."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return median_absolute_error(array1, array2)
+    def from_residuals(self, residuals: Residuals) -> float:
+        n = len(residuals.abs_residuals)
+        middle = [n // 2] if n % 2 else [n // 2 - 1, n // 2]
+        return float(np.partition(residuals.abs_residuals, middle)[middle].mean())
 
 
-class MeanAbsolutePercentageError(BaseErrorMetric):
+class MeanAbsolutePercentageError(ResidualMetric):
     """Class to compute the error using the Mean Absolute Percentage Error."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return mean_absolute_percentage_error(array1, array2)
+    def from_residuals(self, residuals: Residuals) -> float:
+        return float((residuals.abs_residuals / np.maximum(np.abs(residuals.y_true), EPSILON)).mean())
 
 
-class RSquaredScore(BaseErrorMetric):
+class RSquaredScore(ResidualMetric):
     """Class to compute the R2 score."""
 
-    def compute(self, array1: Union[NDArray[Any], Sequence[Any]],
-                array2: Union[NDArray[Any], Sequence[Any]]):
-        return r2_score(array1, array2)
+    def from_residuals(self, residuals: Residuals) -> float:
+        centred = residuals.y_true - residuals.y_true.mean()
+        return _r2(float(np.dot(residuals.residuals, residuals.residuals)), float(np.dot(centred, centred)),
+                   len(centred))
+
+
+def _r2(residual_sum_of_squares: float, total_sum_of_squares: float, count: int) -> float:
+    """Computes the R2 score from the sums of squares, with sklearn's values for single and constant targets."""
+
+    if count < 2:
+        return float('nan')
+    if total_sum_of_squares == 0:
+        return 1.0 if residual_sum_of_squares == 0 else 0.0
+
+    return 1 - residual_sum_of_squares / total_sum_of_squares
 
 
 class Error(Enum):
@@ -96,16 +159,134 @@ class Error(Enum):
 def compute_all_errors(array1: Union[NDArray[Any], Sequence[Any]],
                        array2: Union[NDArray[Any], Sequence[Any]],
                        rounding: int = 3) -> List[Tuple[str, float]]:
-    """Function to compute all available errors."""
+    """Function to compute all available errors from a single computation of the residuals."""
 
+    residuals = Residuals(array1, array2)
     computed_errors = list()
 
     for name, err_comp in Error.__members__.items():
 
-        # MSLE throws value error for negative values
-        try:
-            computed_errors.append((name, round(err_comp.value.compute(array1, array2), rounding)))
-        except ValueError:
-            pass
+        # MSLE is not defined for negative values
+        if err_comp.value.is_defined(residuals):
+            computed_errors.append((name, round(err_comp.value.from_residuals(residuals), rounding)))
 
     return computed_errors
+
+
+class ErrorAccumulator:
+    """
+    Running moments of the residuals of streamed values, from which all errors except the median are derived.
+
+    Accumulators of separate parts of the values, like the predictions of worker processes, can be merged into one.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum_squares = 0.0
+        self.sum_abs = 0.0
+        self.max_abs = 0.0
+        self.sum_squared_logs = 0.0
+        self.sum_abs_percentages = 0.0
+        self.non_negative = True
+        self.mean_true = 0.0
+        self.total_sum_of_squares = 0.0
+
+    def update(self, array1: Union[NDArray[Any], Sequence[Any]],
+               array2: Union[NDArray[Any], Sequence[Any]]) -> 'ErrorAccumulator':
+        """
+        Adds a chunk of values.
+
+        :param array1: true values of the chunk
+        :param array2: predicted values of the chunk
+        :return: the accumulator itself
+        """
+
+        residuals = Residuals(array1, array2)
+        if not len(residuals.residuals):
+            return self
+
+        chunk = ErrorAccumulator()
+        chunk.count = len(residuals.residuals)
+        chunk.sum_squares = float(np.dot(residuals.residuals, residuals.residuals))
+        chunk.sum_abs = float(residuals.abs_residuals.sum())
+        chunk.max_abs = float(residuals.abs_residuals.max())
+        chunk.sum_abs_percentages = float((residuals.abs_residuals / np.maximum(np.abs(residuals.y_true), EPSILON)).sum())
+
+        chunk.non_negative = residuals.non_negative
+        if chunk.non_negative:
+            log_residuals = np.log1p(residuals.y_true) - np.log1p(residuals.y_pred)
+            chunk.sum_squared_logs = float(np.dot(log_residuals, log_residuals))
+
+        chunk.mean_true = float(residuals.y_true.mean())
+        centred = residuals.y_true - chunk.mean_true
+        chunk.total_sum_of_squares = float(np.dot(centred, centred))
+
+        return self.merge(chunk)
+
+    def merge(self, other: 'ErrorAccumulator') -> 'ErrorAccumulator':
+        """
+        Adds the values of another accumulator, combining the variances of the true values with Chan's formula.
+
+        :param other: accumulator of other values
+        :return: the accumulator itself
+        """
+
+        if not other.count:
+            return self
+
+        total = self.count + other.count
+        delta = other.mean_true - self.mean_true
+        self.total_sum_of_squares += other.total_sum_of_squares + delta ** 2 * self.count * other.count / total
+        self.mean_true += delta * other.count / total
+        self.count = total
+
+        self.sum_squares += other.sum_squares
+        self.sum_abs += other.sum_abs
+        self.max_abs = max(self.max_abs, other.max_abs)
+        self.sum_abs_percentages += other.sum_abs_percentages
+        self.non_negative = self.non_negative and other.non_negative
+        self.sum_squared_logs = self.sum_squared_logs + other.sum_squared_logs if self.non_negative else 0.0
+
+        return self
+
+    def result(self, rounding: int = 3) -> List[Tuple[str, float]]:
+        """
+        Errors of all the values added, in the order of the Error enum.
+
+        MSLE is left out when any value is negative and MdAE is always left out.
+
+        :param rounding: number of decimals of the errors
+        """
+
+        if not self.count:
+            raise ValueError("Cannot compute errors without any values.")
+
+        mse = self.sum_squares / self.count
+        errors = [('MSE', mse), ('RMSE', float(np.sqrt(mse))), ('MAE', self.sum_abs / self.count),
+                  ('MAX', self.max_abs)]
+        if self.non_negative:
+            errors.append(('MSLE', self.sum_squared_logs / self.count))
+        errors += [('MAPE', self.sum_abs_percentages / self.count),
+                   ('R2', _r2(self.sum_squares, self.total_sum_of_squares, self.count))]
+
+        return [(name, round(value, rounding)) for name, value in errors]
+
+
+def compute_all_errors_from_chunks(chunks: Iterable[Tuple[Union[NDArray[Any], Sequence[Any]],
+                                                          Union[NDArray[Any], Sequence[Any]]]],
+                                   rounding: int = 3) -> List[Tuple[str, float]]:
+    """
+    Function to compute the errors of streamed values, holding the residuals of a single chunk at a time.
+
+    The median absolute error needs all the residuals at once and is left out.
+
+    :param chunks: pairs of true values and predicted values
+    :param rounding: number of decimals of the errors
+    :return: the errors in the order of the Error enum
+    """
+
+    accumulator = ErrorAccumulator()
+    for array1, array2 in chunks:
+        accumulator.update(array1, array2)
+
+    return accumulator.result(rounding)
@@ -1,10 +1,9 @@
-import itertools
-
-import dash
 import numpy as np
 from dash import html, dcc
 from dash.dependencies import Input, Output
+from vizml._dashboard_app import LazyDash
 from vizml._dashboard_configs import DASH_STYLE
+from vizml._dashboard_figures import DECODE_FIGURE, get_figure_store
 from vizml.multi_linear_regression.regression import (OrdinaryLeastSquaresRegression, LassoRegression,
                                                       RidgeRegression)
 
@@ -12,7 +11,13 @@ from vizml.multi_linear_regression.regression import (OrdinaryLeastSquaresRegres
 class DashBoard:
     """Class to run a dashboard for Multi Linear Regression."""
 
-    _multi_linear_regression_visualizer = dash.Dash(name="multi_linear_regression")
+    _regressors = {'tab-1': OrdinaryLeastSquaresRegression, 'tab-2': LassoRegression, 'tab-3': RidgeRegression}
+
+    _tab_figures = {'tab-1': 'show_data',
+                    'tab-2': 'show_regression_plane',
+                    'tab-3': 'show_error_scores'}
+
+    _multi_linear_regression_visualizer = LazyDash(name="multi_linear_regression")
 
     _multi_linear_regression_visualizer.layout = html.Div([
         html.H1("Multi Linear Regression",
@@ -68,17 +73,16 @@ class DashBoard:
         ], style=DASH_STYLE),
         dcc.Graph('plot'),
         dcc.Store(id='random-state'),
-        dcc.Store(id='plot1'),
-        dcc.Store(id='plot2'),
-        dcc.Store(id='plot3'),
-        dcc.Store(id='plot4'),
-        dcc.Store(id='plot5'),
-        dcc.Store(id='plot6'),
-        dcc.Store(id='plot7'),
-        dcc.Store(id='plot8'),
-        dcc.Store(id='plot9')
+        dcc.Store(id='figure-key'),
+        dcc.Store(id='figure-payload'),
     ], style=DASH_STYLE)
 
+    _multi_linear_regression_visualizer.clientside_callback(
+        DECODE_FIGURE,
+        Output(component_id='plot', component_property='figure'),
+        Input(component_id='figure-payload', component_property='data')
+    )
+
     @staticmethod
     @_multi_linear_regression_visualizer.callback(
         Output(component_id='random-state', component_property='value'),
@@ -95,67 +99,43 @@ class DashBoard:
         return -1
 
     @staticmethod
-    @_multi_linear_regression_visualizer.callback(
-        Output(component_id='plot1', component_property='figure'),
-        Output(component_id='plot2', component_property='figure'),
-        Output(component_id='plot3', component_property='figure'),
-        Output(component_id='plot4', component_property='figure'),
-        Output(component_id='plot5', component_property='figure'),
-        Output(component_id='plot6', component_property='figure'),
-        Output(component_id='plot7', component_property='figure'),
-        Output(component_id='plot8', component_property='figure'),
-        Output(component_id='plot9', component_property='figure'),
-        Input(component_id='random-state', component_property='value'),
-        Input(component_id='no-points', component_property='value'),
-        Input(component_id='linearly-increasing', component_property='value')
-    )
-    def _init_regressors(random_state, no_points, is_inc):
-        """Initializes the regressor and stores the initial plots."""
+    def _init_regressor(type_tab, random_state, no_points, is_inc):
+        """Initializes and trains the regressor of the chosen type."""
 
         is_increasing = True if is_inc == 'increasing' else False
 
-        reg1 = LassoRegression(no_points=no_points, is_increasing=is_increasing, random_state=random_state)
-        reg2 = RidgeRegression(no_points=no_points, is_increasing=is_increasing, random_state=random_state)
-        reg3 = OrdinaryLeastSquaresRegression(no_points=no_points, is_increasing=is_increasing,
-                                              random_state=random_state)
+        reg = DashBoard._regressors[type_tab](no_points=no_points, is_increasing=is_increasing, random_state=random_state)
+        reg.train()
 
-        reg1.train()
-        reg2.train()
-        reg3.train()
-
-        return (reg1.show_data(return_fig=True), reg1.show_regression_plane(return_fig=True),
-                reg1.show_error_scores(return_fig=True), reg2.show_data(return_fig=True),
-                reg2.show_regression_plane(return_fig=True), reg2.show_error_scores(return_fig=True),
-                reg3.show_data(return_fig=True), reg3.show_regression_plane(return_fig=True),
-                reg3.show_error_scores(return_fig=True))
+        return reg
 
     @staticmethod
     @_multi_linear_regression_visualizer.callback(
-        Output(component_id='plot', component_property='figure'),
-        Input(component_id='plot-tabs', component_property='value'),
+        Output(component_id='figure-key', component_property='data'),
         Input(component_id='type-tabs', component_property='value'),
-        Input(component_id='plot1', component_property='figure'),
-        Input(component_id='plot2', component_property='figure'),
-        Input(component_id='plot3', component_property='figure'),
-        Input(component_id='plot4', component_property='figure'),
-        Input(component_id='plot5', component_property='figure'),
-        Input(component_id='plot6', component_property='figure'),
-        Input(component_id='plot7', component_property='figure'),
-        Input(component_id='plot8', component_property='figure'),
-        Input(component_id='plot9', component_property='figure')
+        Input(component_id='random-state', component_property='value'),
+        Input(component_id='no-points', component_property='value'),
+        Input(component_id='linearly-increasing', component_property='value')
     )
-    def _update_graph(plot_tab, type_tab, plot1, plot2, plot3, plot4, plot5, plot6, plot7, plot8, plot9):
-        """Switches plot based on selection."""
+    def _update_figure_key(type_tab, random_state, no_points, is_inc):
+        """Registers the inputs with the server-side figure store, keeping only their key in the browser."""
 
-        all_plots = [plot1, plot2, plot3, plot4, plot5, plot6, plot7, plot8, plot9]
+        return get_figure_store().register(DashBoard._init_regressor, DashBoard._tab_figures,
+                                           type_tab, random_state, no_points, is_inc)
 
-        tab_types = ['tab-1', 'tab-2', 'tab-3']
-        combs = list(itertools.product(*[tab_types, tab_types]))
-        for i, comb in enumerate(combs):
-            if (type_tab, plot_tab) == comb:
-                return all_plots[i]
+    @staticmethod
+    @_multi_linear_regression_visualizer.callback(
+        Output(component_id='figure-payload', component_property='data'),
+        Input(component_id='plot-tabs', component_property='value'),
+        Input(component_id='figure-key', component_property='data')
+    )
+    def _update_graph(plot_tab, figure_key):
+        """
+        Sends the plot of the chosen tab, computed the first time the tab is shown for the inputs, with its arrays
+        encoded as typed arrays that are decoded into the graph in the browser.
+        """
 
-        return plot1
+        return get_figure_store().payload(figure_key, plot_tab, DashBoard._init_regressor, DashBoard._tab_figures)
 
     def run(self):
         """Runs a dashboard on localhost to visualize Multi Linear Regression."""
@@ -4,9 +4,12 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.graph_objects import Figure
 from sklearn.linear_model import LinearRegression, Lasso, Ridge
-from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from vizml._figure_factory import style_figure
 from vizml.data_generator import Linear1DGenerator, Linear2DGenerator
+from vizml.dataset_cache import cached_generate
+from vizml.fit_cache import cached_fit
 from vizml.metrics.regression_metrics import compute_all_errors
+from vizml.scatter_renderer import scatter3d_trace
 
 
 class MultiLinearRegression:
@@ -20,13 +23,13 @@ class MultiLinearRegression:
         self.randomize = randomize
         dpgen1 = Linear2DGenerator(random=randomize, random_state=random_state)
         dpgen2 = Linear1DGenerator(random=randomize, random_state=random_state)
-        self.x_values = dpgen1.generate(no_of_points=no_points)
-        self.y_values = dpgen2.generate(no_of_points=no_points, is_increasing=is_increasing)
+        self.x_values = cached_generate(dpgen1, no_of_points=no_points)
+        self.y_values = cached_generate(dpgen2, no_of_points=no_points, is_increasing=is_increasing)
         self.data_points: Any = np.concatenate((self.x_values, self.y_values), axis=1)
 
     def train(self) -> None:
         """Trains the Model"""
-        self.regressor.fit(self.x_values, self.y_values)
+        self.regressor = cached_fit(self.regressor, self.x_values, self.y_values)
 
     @property
     def predicted_values(self):
@@ -45,16 +48,9 @@ class MultiLinearRegression:
         x1 = self.x_values[:, 0]
         x2 = self.x_values[:, 1]
 
-        fig = go.Figure(data=[go.Scatter3d(x=x1, y=x2, z=self.y_values.squeeze(), mode='markers',
-                                           marker=dict(size=8, color='#FF4C29', opacity=0.7))])
-        fig.update_layout(
-            title="Multi Linear Regression Data",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
+        fig = go.Figure(data=[scatter3d_trace(x=x1, y=x2, z=self.y_values.squeeze(), mode='markers',
+                                              marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+        style_figure(fig, title="Multi Linear Regression Data")
 
         if kwargs.get('save'):
             fig.write_image('show_data.jpeg')
@@ -76,8 +72,8 @@ class MultiLinearRegression:
         x1 = self.x_values[:, 0]
         x2 = self.x_values[:, 1]
 
-        fig = go.Figure(data=[go.Scatter3d(x=x1, y=x2, z=self.y_values.squeeze(), mode='markers',
-                                           marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+        fig = go.Figure(data=[scatter3d_trace(x=x1, y=x2, z=self.y_values.squeeze(), mode='markers',
+                                              marker=dict(size=8, color='#FF4C29', opacity=0.7))])
 
         fig.add_traces(data=[go.Mesh3d(x=x1,
                                        y=x2,
@@ -85,14 +81,7 @@ class MultiLinearRegression:
                                        name='Regression Plane',
                                        color='#6D9886')])
 
-        fig.update_layout(
-            title="Regression Plane",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
+        style_figure(fig, title="Regression Plane")
 
         if kwargs.get('save'):
             fig.write_image('show_regression_plane.jpeg')
@@ -117,20 +106,8 @@ class MultiLinearRegression:
         fig = go.Figure(data=[go.Bar(x=err_metrics, y=err_types, text=err_metrics, textposition='inside',
                                      orientation='h', marker=dict(color='#FF4C29', opacity=0.6))])
 
-        fig.update_layout(
-            title="Error Metrics Computed",
-            xaxis_title="Error Value",
-            yaxis_title="Error Metric",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-
-        fig.update_yaxes(type='category')
-        fig.update_xaxes(showgrid=False)
-        fig.update_yaxes(showgrid=False)
+        style_figure(fig, title="Error Metrics Computed", xaxis_title="Error Value", yaxis_title="Error Metric",
+                     category_axes='y', hide_grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_error_scores.jpeg')
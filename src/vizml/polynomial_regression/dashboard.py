@@ -1,15 +1,20 @@
-import dash
 import numpy as np
 from dash import html, dcc
 from dash.dependencies import Input, Output
+from vizml._dashboard_app import LazyDash
 from vizml._dashboard_configs import DASH_STYLE
+from vizml._dashboard_figures import DECODE_FIGURE, get_figure_store
 from vizml.polynomial_regression.regression import PolynomialRegression
 
 
 class DashBoard:
     """Class to run a dashboard for Polynomial Regression."""
 
-    _polynomial_regression_visualizer = dash.Dash(name="polynomial_regression")
+    _tab_figures = {'tab-1': 'show_data',
+                    'tab-2': 'show_regression_curve',
+                    'tab-3': 'show_error_scores'}
+
+    _polynomial_regression_visualizer = LazyDash(name="polynomial_regression")
 
     _polynomial_regression_visualizer.layout = html.Div([
         html.H1("Polynomial Regression",
@@ -66,11 +71,16 @@ class DashBoard:
         ], style=DASH_STYLE),
         dcc.Graph('plot'),
         dcc.Store(id='random-state'),
-        dcc.Store(id='plot1'),
-        dcc.Store(id='plot2'),
-        dcc.Store(id='plot3'),
+        dcc.Store(id='figure-key'),
+        dcc.Store(id='figure-payload'),
     ], style=DASH_STYLE)
 
+    _polynomial_regression_visualizer.clientside_callback(
+        DECODE_FIGURE,
+        Output(component_id='plot', component_property='figure'),
+        Input(component_id='figure-payload', component_property='data')
+    )
+
     @staticmethod
     @_polynomial_regression_visualizer.callback(
         Output(component_id='random-state', component_property='value'),
@@ -87,17 +97,8 @@ class DashBoard:
         return -1
 
     @staticmethod
-    @_polynomial_regression_visualizer.callback(
-        Output(component_id='plot1', component_property='figure'),
-        Output(component_id='plot2', component_property='figure'),
-        Output(component_id='plot3', component_property='figure'),
-        Input(component_id='random-state', component_property='value'),
-        Input(component_id='no-points', component_property='value'),
-        Input(component_id='linearly-increasing', component_property='value'),
-        Input(component_id='degree', component_property='value')
-    )
     def _init_regressor(random_state, num_points, is_lin_inc, degree):
-        """"Initialize Polynomial Regression and store all the plots."""
+        """Initializes and trains the model."""
 
         is_increasing = True if is_lin_inc == 'increasing' else False
 
@@ -105,26 +106,35 @@ class DashBoard:
                                     is_increasing=is_increasing, degree=degree)
         reg1.train()
 
-        return (reg1.show_data(return_fig=True), reg1.show_regression_curve(return_fig=True),
-                reg1.show_error_scores(return_fig=True))
+        return reg1
 
     @staticmethod
     @_polynomial_regression_visualizer.callback(
-        Output(component_id='plot', component_property='figure'),
+        Output(component_id='figure-key', component_property='data'),
+        Input(component_id='random-state', component_property='value'),
+        Input(component_id='no-points', component_property='value'),
+        Input(component_id='linearly-increasing', component_property='value'),
+        Input(component_id='degree', component_property='value')
+    )
+    def _update_figure_key(random_state, num_points, is_lin_inc, degree):
+        """Registers the inputs with the server-side figure store, keeping only their key in the browser."""
+
+        return get_figure_store().register(DashBoard._init_regressor, DashBoard._tab_figures,
+                                           random_state, num_points, is_lin_inc, degree)
+
+    @staticmethod
+    @_polynomial_regression_visualizer.callback(
+        Output(component_id='figure-payload', component_property='data'),
         Input(component_id='plot-tabs', component_property='value'),
-        Input(component_id='plot1', component_property='figure'),
-        Input(component_id='plot2', component_property='figure'),
-        Input(component_id='plot3', component_property='figure')
+        Input(component_id='figure-key', component_property='data')
     )
-    def _update_plots(plot_tab, fig1, fig2, fig3):
-        """Updates the plot based on the chosen tab."""
-
-        if plot_tab == "tab-1":
-            return fig1
-        elif plot_tab == "tab-2":
-            return fig2
-        else:
-            return fig3
+    def _update_plots(plot_tab, figure_key):
+        """
+        Sends the plot of the chosen tab, computed the first time the tab is shown for the inputs, with its arrays
+        encoded as typed arrays that are decoded into the graph in the browser.
+        """
+
+        return get_figure_store().payload(figure_key, plot_tab, DashBoard._init_regressor, DashBoard._tab_figures)
 
     def run(self):
         """Runs a dashboard on localhost to visualize Polynomial Regression."""
@@ -6,9 +6,12 @@ from numpy.typing import NDArray
 from plotly.graph_objects import Figure
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import PolynomialFeatures
-from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from vizml._figure_factory import style_figure
 from vizml.data_generator import Linear1DGenerator
+from vizml.dataset_cache import cached_generate
+from vizml.fit_cache import cached_fit
 from vizml.metrics.regression_metrics import compute_all_errors
+from vizml.scatter_renderer import scatter_trace
 
 
 class PolynomialRegression:
@@ -26,8 +29,8 @@ class PolynomialRegression:
         self.is_increasing = is_increasing
 
         dpgen = Linear1DGenerator(random=randomize, random_state=random_state)
-        self.x_values = dpgen.generate(no_of_points=no_points)
-        self.y_values = dpgen.generate(no_of_points=no_points, is_increasing=is_increasing)
+        self.x_values = cached_generate(dpgen, no_of_points=no_points)
+        self.y_values = cached_generate(dpgen, no_of_points=no_points, is_increasing=is_increasing)
         self.data_points: Any = np.concatenate((self.x_values, self.y_values), axis=1)
 
         poly_reg = PolynomialFeatures(degree=self.degree)
@@ -39,7 +42,7 @@ class PolynomialRegression:
 
     def train(self) -> None:
         """Trains the Model"""
-        self.regressor.fit(self.X_poly, self.y_values)
+        self.regressor = cached_fit(self.regressor, self.X_poly, self.y_values)
 
     def _predicted_vals_for_plot(self):
         """Y-values predicted by model used for plotting."""
@@ -59,22 +62,11 @@ class PolynomialRegression:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                         marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+        fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                            marker=dict(size=8, color='#FF4C29', opacity=0.7))])
 
-        fig.update_layout(
-            title="Polynomial Regression Data",
-            xaxis_title="X Values",
-            yaxis_title="Y Values",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        style_figure(fig, title="Polynomial Regression Data", xaxis_title="X Values", yaxis_title="Y Values",
+                     grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_data.jpeg')
@@ -109,25 +101,14 @@ class PolynomialRegression:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                         marker=dict(size=8, color='#FF4C29', opacity=0.7), name='Data Points')])
-
-        fig.add_traces(data=[go.Scatter(x=self.x_range.squeeze(),
-                                        y=self._predicted_vals_for_plot().squeeze(),
-                                        name="Regression Curve", marker=dict(color='#6D9886'))])
-
-        fig.update_layout(
-            title=self.equation,
-            xaxis_title="X Values",
-            yaxis_title="Y Values",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                            marker=dict(size=8, color='#FF4C29', opacity=0.7), name='Data Points')])
+
+        fig.add_traces(data=[scatter_trace(x=self.x_range.squeeze(),
+                                           y=self._predicted_vals_for_plot().squeeze(),
+                                           name="Regression Curve", marker=dict(color='#6D9886'))])
+
+        style_figure(fig, title=self.equation, xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_regression_curve.jpeg')
@@ -152,20 +133,8 @@ class PolynomialRegression:
         fig = go.Figure(data=[go.Bar(x=err_metrics, y=err_types, text=err_metrics, textposition='inside',
                                      orientation='h', marker=dict(color='#FF4C29', opacity=0.6))])
 
-        fig.update_layout(
-            title="Error Metrics Computed",
-            xaxis_title="Error Value",
-            yaxis_title="Error Metric",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-
-        fig.update_yaxes(type='category')
-        fig.update_xaxes(showgrid=False)
-        fig.update_yaxes(showgrid=False)
+        style_figure(fig, title="Error Metrics Computed", xaxis_title="Error Value", yaxis_title="Error Metric",
+                     category_axes='y', hide_grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_error_scores.jpeg')
@@ -0,0 +1,244 @@
+"""Contains the rendering of the scatter traces of the models, switching to WebGL and downsampling large data."""
+
+from math import isqrt
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+import plotly.graph_objects as go
+from numpy.typing import NDArray
+
+WEBGL_THRESHOLD = 20000
+MAX_MARKERS = 100000
+MAX_LINE_POINTS = 5000
+MAX_COLOR_GROUPS = 32
+
+
+def lttb_indices(x_values: NDArray[Any], y_values: NDArray[Any], no_points: int) -> NDArray[Any]:
+    """
+    Largest Triangle Three Buckets downsampling of a line sorted by its x values.
+
+    The first and last points are kept and the points in between are split into no_points - 2 buckets, keeping
+    the point of each bucket forming the largest triangle with the point kept before it and the mean of the next
+    bucket, which preserves the peaks and the shape of the line.
+
+    :param x_values: sorted x values of the line
+    :param y_values: y values of the line
+    :param no_points: number of points to keep
+    :return: sorted indices of the kept points
+    """
+
+    length = len(x_values)
+    if no_points >= length or no_points < 3:
+        return np.arange(length)
+
+    edges = np.linspace(1, length - 1, no_points - 1).astype(int)
+    indices = np.empty(no_points, dtype=int)
+    indices[0], indices[-1] = 0, length - 1
+
+    previous = 0
+    for bucket in range(no_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x, next_y = x_values[end:edges[bucket + 2]].mean(), y_values[end:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x_values[-1], y_values[-1]
+
+        areas = np.abs((x_values[previous] - next_x) * (y_values[start:end] - y_values[previous])
+                       - (x_values[previous] - x_values[start:end]) * (next_y - y_values[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+
+    return indices
+
+
+def _grid_cells(values: NDArray[Any], no_bins: int) -> NDArray[Any]:
+    """Bins the values into no_bins equal bins spanning them."""
+
+    low, span = np.nanmin(values), np.ptp(values)
+    if not span > 0:
+        return np.zeros(len(values), dtype=np.int64)
+
+    cells: NDArray[Any] = np.minimum(((values - low) / span * no_bins).astype(np.int64), no_bins - 1)
+
+    return cells
+
+
+def _icbrt(value: int) -> int:
+    """Integer cube root, the largest integer whose cube is at most the value."""
+
+    root = int(round(value ** (1 / 3)))
+    while root ** 3 > value:
+        root -= 1
+    while (root + 1) ** 3 <= value:
+        root += 1
+
+    return root
+
+
+def binned_indices(x_values: NDArray[Any], y_values: NDArray[Any], max_points: int,
+                   groups: Optional[NDArray[Any]] = None, z_values: Optional[NDArray[Any]] = None) -> NDArray[Any]:
+    """
+    Downsamples markers by binning them on a grid of at most max_points cells, keeping one point per occupied cell.
+
+    Every region holding data keeps a marker, so the extent and the shape of the point cloud are preserved while
+    the number of markers is bounded by the grid. When groups are passed, like the labels coloring the markers,
+    a point is kept per group in each cell so that no group disappears from a region.
+
+    :param x_values: x values of the markers
+    :param y_values: y values of the markers
+    :param max_points: number of cells of the grid
+    :param groups: group of each marker
+    :param z_values: z values of the markers, binning them on a 3D grid
+    :return: sorted indices of the kept points
+    """
+
+    coordinates = [x_values, y_values] if z_values is None else [x_values, y_values, z_values]
+    no_bins = max(isqrt(max_points) if z_values is None else _icbrt(max_points), 1)
+
+    keys = np.zeros(len(x_values), dtype=np.int64)
+    for values in coordinates:
+        keys = keys * no_bins + _grid_cells(values, no_bins)
+    if groups is not None:
+        keys += np.unique(groups, return_inverse=True)[1].astype(np.int64) * no_bins ** len(coordinates)
+
+    return np.sort(np.unique(keys, return_index=True)[1])
+
+
+def _take(value: Any, indices: NDArray[Any], length: int) -> Any:
+    """Takes the indices of the per point values of a trace property, recursing into nested properties."""
+
+    if isinstance(value, dict):
+        return {key: _take(item, indices, length) for key, item in value.items()}
+    if not isinstance(value, str) and np.ndim(value) == 1 and len(value) == length:
+        return np.asarray(value)[indices]
+
+    return value
+
+
+class ScatterRenderer:
+    """
+    Renders scatter traces, in WebGL and downsampled when they get large.
+
+    Traces of more than webgl_threshold points are drawn with Scattergl instead of SVG. Markers of more than
+    max_markers points, in 2D or 3D, are binned on a grid with one point per cell and color, and lines of more than
+    max_line_points points are reduced with Largest Triangle Three Buckets, keeping the payload of the figures
+    bounded regardless of the number of data points. Per point properties, like marker colors, are downsampled
+    along with the points.
+
+    :param webgl_threshold: number of points above which traces are drawn with WebGL
+    :param max_markers: number of markers above which markers are downsampled
+    :param max_line_points: number of points above which lines are downsampled
+    """
+
+    def __init__(self, webgl_threshold: int = WEBGL_THRESHOLD, max_markers: int = MAX_MARKERS,
+                 max_line_points: int = MAX_LINE_POINTS) -> None:
+        self.webgl_threshold = webgl_threshold
+        self.max_markers = max_markers
+        self.max_line_points = max_line_points
+
+    def _marker_groups(self, colors: Any, length: int) -> Optional[NDArray[Any]]:
+        """Per point colors of the markers to keep in every cell, None when they are not a few discrete colors."""
+
+        if not isinstance(colors, str) and np.ndim(colors) == 1 and len(colors) == length:
+            if len(np.unique(colors)) <= MAX_COLOR_GROUPS:
+                return np.asarray(colors)
+
+        return None
+
+    def downsample(self, x_values: NDArray[Any], y_values: NDArray[Any], is_line: bool,
+                   colors: Any = None) -> Optional[NDArray[Any]]:
+        """Indices of the points drawn, None when all of them are drawn in their order."""
+
+        if is_line and len(x_values) > self.max_line_points:
+            order = np.argsort(x_values, kind='stable')
+            kept: NDArray[Any] = order[lttb_indices(x_values[order], y_values[order], self.max_line_points)]
+            return kept
+
+        if not is_line and len(x_values) > self.max_markers:
+            return binned_indices(x_values, y_values, self.max_markers, self._marker_groups(colors, len(x_values)))
+
+        return None
+
+    def trace(self, x: Union[NDArray[Any], Sequence[Any]], y: Union[NDArray[Any], Sequence[Any]],
+              **kwargs: Any) -> Union[go.Scatter, go.Scattergl]:
+        """
+        Builds the scatter trace of the points.
+
+        :param x: x values of the points
+        :param y: y values of the points
+        :param kwargs: properties of the trace, as passed to go.Scatter
+        """
+
+        x_values, y_values = np.ravel(x), np.ravel(y)
+        length = len(x_values)
+        is_line = 'lines' in kwargs.get('mode', 'lines')
+        indices = self.downsample(x_values, y_values, is_line, kwargs.get('marker', {}).get('color'))
+
+        if indices is not None:
+            x_values, y_values = x_values[indices], y_values[indices]
+            kwargs = {key: _take(value, indices, length) for key, value in kwargs.items()}
+
+        scatter = go.Scattergl if len(x_values) > self.webgl_threshold else go.Scatter
+
+        return scatter(x=x_values, y=y_values, **kwargs)
+
+    def trace3d(self, x: Union[NDArray[Any], Sequence[Any]], y: Union[NDArray[Any], Sequence[Any]],
+                z: Union[NDArray[Any], Sequence[Any]], **kwargs: Any) -> go.Scatter3d:
+        """
+        Builds the 3D scatter trace of the points, always drawn with WebGL.
+
+        Markers of more than max_markers points are binned on a 3D grid with one point per cell and color, lines
+        are drawn in full.
+
+        :param x: x values of the points
+        :param y: y values of the points
+        :param z: z values of the points
+        :param kwargs: properties of the trace, as passed to go.Scatter3d
+        """
+
+        x_values, y_values, z_values = np.ravel(x), np.ravel(y), np.ravel(z)
+        length = len(x_values)
+
+        if 'lines' not in kwargs.get('mode', 'lines') and length > self.max_markers:
+            groups = self._marker_groups(kwargs.get('marker', {}).get('color'), length)
+            indices = binned_indices(x_values, y_values, self.max_markers, groups, z_values=z_values)
+            x_values, y_values, z_values = x_values[indices], y_values[indices], z_values[indices]
+            kwargs = {key: _take(value, indices, length) for key, value in kwargs.items()}
+
+        return go.Scatter3d(x=x_values, y=y_values, z=z_values, **kwargs)
+
+
+_scatter_renderer: Optional[ScatterRenderer] = ScatterRenderer()
+
+
+def set_scatter_renderer(renderer: Optional[ScatterRenderer]) -> None:
+    """Sets the renderer of the scatter traces of the models, pass None to always draw all points in SVG."""
+
+    global _scatter_renderer
+    _scatter_renderer = renderer
+
+
+def get_scatter_renderer() -> Optional[ScatterRenderer]:
+    """Returns the renderer of the scatter traces of the models."""
+
+    return _scatter_renderer
+
+
+def scatter_trace(x: Union[NDArray[Any], Sequence[Any]], y: Union[NDArray[Any], Sequence[Any]],
+                  **kwargs: Any) -> Union[go.Scatter, go.Scattergl]:
+    """Builds a scatter trace of the points, using the scatter renderer when one is set."""
+
+    if _scatter_renderer is None:
+        return go.Scatter(x=x, y=y, **kwargs)
+
+    return _scatter_renderer.trace(x, y, **kwargs)
+
+
+def scatter3d_trace(x: Union[NDArray[Any], Sequence[Any]], y: Union[NDArray[Any], Sequence[Any]],
+                    z: Union[NDArray[Any], Sequence[Any]], **kwargs: Any) -> go.Scatter3d:
+    """Builds a 3D scatter trace of the points, using the scatter renderer when one is set."""
+
+    if _scatter_renderer is None:
+        return go.Scatter3d(x=x, y=y, z=z, **kwargs)
+
+    return _scatter_renderer.trace3d(x, y, z, **kwargs)
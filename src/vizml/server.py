@@ -0,0 +1,108 @@
+"""
+Contains the multi-page Dash app hosting the dashboards of all the algorithms, each under its own route.
+
+The dashboards share the process, the loaded libraries and the figure and model caches. The Flask server can be
+served by a WSGI server with several worker processes, which must share the secret of the figure keys, e.g.
+VIZML_FIGURE_STORE_SECRET=<random value> gunicorn vizml.server:server --workers 4, or run on localhost with
+python -m vizml.server.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict
+
+import dash
+from dash import dcc, html
+from dash.dependencies import Input, Output
+from vizml import _load_dashboard
+from vizml._dashboard_app import LazyDash
+from vizml._dashboard_configs import DASH_STYLE
+from vizml._dashboard_figures import SECRET_ENV_VAR, shared_secret
+
+PAGES = {
+    'simple-linear-regression': ('DashBoard_SimpleLinearRegression', 'Simple Linear Regression'),
+    'multi-linear-regression': ('DashBoard_MultiLinearRegression', 'Multi Linear Regression'),
+    'polynomial-regression': ('DashBoard_PolynomialRegression', 'Polynomial Regression'),
+    'logistic-regression': ('DashBoard_LogisticRegression', 'Logistic Regression'),
+    'support-vector-machines': ('DashBoard_SupportVectorMachines', 'Support Vector Machines'),
+    'k-nearest-neighbors': ('DashBoard_KNN', 'K Nearest Neighbours'),
+    'naive-bayes': ('DashBoard_NaiveBayes', 'Naive Bayes'),
+    'decision-tree': ('DashBoard_DecisionTree', 'Decision Tree'),
+    'bagging-classifier': ('DashBoard_BaggingClassifier', 'Bagging Classifier'),
+    'adaboost-classifier': ('DashBoard_AdaBoostClassifier', 'AdaBoost Classifier'),
+    'k-means-clustering': ('DashBoard_KMeansClustering', 'K Means Clustering'),
+    'dbscan': ('DashBoard_DBScan', 'DBScan'),
+}
+
+LINK_STYLE = {'color': DASH_STYLE['color'], 'margin': '0px 10px', 'display': 'inline-block'}
+
+
+def dashboard_app(name: str) -> LazyDash:
+    """Lazy Dash app of the dashboard exported under the name."""
+
+    dashboard = _load_dashboard(name)
+    lazy_app: LazyDash = next(value for value in vars(dashboard).values() if isinstance(value, LazyDash))
+
+    return lazy_app
+
+
+@lru_cache(maxsize=None)
+def build_app() -> dash.Dash:
+    """
+    Builds the Dash app hosting all the dashboards, once per process.
+
+    The ids of the components of each dashboard are prefixed with its route, so that the callbacks of all the
+    dashboards are registered on the one app without clashing.
+    """
+
+    app = dash.Dash(name='vizml', suppress_callback_exceptions=True, title='Vizml')
+
+    pages: Dict[str, Any] = {}
+    for route, (name, _) in PAGES.items():
+        page = dashboard_app(name).namespaced(route)
+        page.register_callbacks(app)
+        pages[route] = page.layout
+
+    home = html.H1("Visualizations of Machine Learning Algorithms", style=DASH_STYLE)
+
+    app.layout = html.Div([
+        dcc.Location(id='url'),
+        html.Div([dcc.Link(title, href=app.get_relative_path(f'/{route}'), style=LINK_STYLE)
+                  for route, (_, title) in PAGES.items()],
+                 style={**DASH_STYLE, **{'padding': '10px'}}),
+        html.Div(id='page-content'),
+    ], style=DASH_STYLE)
+    app.validation_layout = html.Div([app.layout, home, *pages.values()])
+
+    @app.callback(
+        Output(component_id='page-content', component_property='children'),
+        Input(component_id='url', component_property='pathname')
+    )
+    def _display_page(pathname):
+        """Shows the dashboard of the route, and the links to the dashboards on other routes."""
+
+        route = app.strip_relative_path(pathname) if pathname else ''
+        return pages.get(route, home)
+
+    return app
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'app':
+        return build_app()
+    if name == 'server':
+        if shared_secret() is None:
+            raise RuntimeError(f"Set {SECRET_ENV_VAR} to the same secret for all the workers serving the dashboards, "
+                               f"so that each of them accepts the figure keys handed out by the others.")
+        return build_app().server
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def run(**kwargs: Any) -> None:
+    """Runs the dashboards of all the algorithms on localhost, with the arguments of dash.Dash.run_server."""
+
+    build_app().run_server(**kwargs)
+
+
+if __name__ == '__main__':
+    run()
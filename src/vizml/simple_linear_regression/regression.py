@@ -4,9 +4,12 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.graph_objects import Figure
 from sklearn.linear_model import LinearRegression, Lasso, Ridge
-from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from vizml._figure_factory import style_figure
 from vizml.data_generator import Linear1DGenerator
+from vizml.dataset_cache import cached_generate
+from vizml.fit_cache import cached_fit
 from vizml.metrics.regression_metrics import compute_all_errors
+from vizml.scatter_renderer import scatter_trace
 
 
 class SimpleLinearRegression:
@@ -19,13 +22,13 @@ class SimpleLinearRegression:
         self.regressor = LinearRegression(n_jobs=-1)
         self.randomize = randomize
         dpgen = Linear1DGenerator(random=randomize, random_state=random_state)
-        self.x_values = dpgen.generate(no_of_points=no_points)
-        self.y_values = dpgen.generate(no_of_points=no_points, is_increasing=is_increasing)
+        self.x_values = cached_generate(dpgen, no_of_points=no_points)
+        self.y_values = cached_generate(dpgen, no_of_points=no_points, is_increasing=is_increasing)
         self.data_points: Any = np.concatenate((self.x_values, self.y_values), axis=1)
 
     def train(self) -> None:
         """Trains the Model"""
-        self.regressor.fit(self.x_values, self.y_values)
+        self.regressor = cached_fit(self.regressor, self.x_values, self.y_values)
 
     @property
     def predicted_values(self):
@@ -41,20 +44,10 @@ class SimpleLinearRegression:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                         marker=dict(size=8, color='#FF4C29', opacity=0.7))])
-        fig.update_layout(
-            title="Simple Linear Regression Data",
-            xaxis_title="X Values",
-            yaxis_title="Y Values",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                            marker=dict(size=8, color='#FF4C29', opacity=0.7))])
+        style_figure(fig, title="Simple Linear Regression Data", xaxis_title="X Values", yaxis_title="Y Values",
+                     grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_data.jpeg')
@@ -73,25 +66,14 @@ class SimpleLinearRegression:
         Pass return_fig=True as a keyword argument to return the figure.
         """
 
-        fig = go.Figure(data=[go.Scatter(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
-                                         marker=dict(size=8, color='#FF4C29', opacity=0.7), name='Data Points')])
-
-        fig.add_traces(data=[go.Scatter(x=self.x_values.squeeze(),
-                                        y=self.predicted_values.squeeze(),
-                                        name='Regression Line', marker=dict(color='#6D9886'))])
-
-        fig.update_layout(
-            title="Regression Line",
-            xaxis_title="X Values",
-            yaxis_title="Y Values",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-        fig.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
-        fig.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        fig = go.Figure(data=[scatter_trace(x=self.x_values.squeeze(), y=self.y_values.squeeze(), mode='markers',
+                                            marker=dict(size=8, color='#FF4C29', opacity=0.7), name='Data Points')])
+
+        fig.add_traces(data=[scatter_trace(x=self.x_values.squeeze(),
+                                           y=self.predicted_values.squeeze(),
+                                           name='Regression Line', marker=dict(color='#6D9886'))])
+
+        style_figure(fig, title="Regression Line", xaxis_title="X Values", yaxis_title="Y Values", grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_regression_line.jpeg')
@@ -116,20 +98,8 @@ class SimpleLinearRegression:
         fig = go.Figure(data=[go.Bar(x=err_metrics, y=err_types, text=err_metrics, textposition='inside',
                                      orientation='h', marker=dict(color='#FF4C29', opacity=0.6))])
 
-        fig.update_layout(
-            title="Error Metrics Computed",
-            xaxis_title="Error Value",
-            yaxis_title="Error Metric",
-            title_x=0.5,
-            plot_bgcolor=DASH_STYLE["backgroundColor"],
-            paper_bgcolor=DASH_STYLE["backgroundColor"],
-            font_color=DASH_STYLE["color"],
-            template=PLOT_TEMPLATE
-        )
-
-        fig.update_yaxes(type='category')
-        fig.update_xaxes(showgrid=False)
-        fig.update_yaxes(showgrid=False)
+        style_figure(fig, title="Error Metrics Computed", xaxis_title="Error Value", yaxis_title="Error Metric",
+                     category_axes='y', hide_grid=True)
 
         if kwargs.get('save'):
             fig.write_image('show_error_scores.jpeg')
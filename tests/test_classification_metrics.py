@@ -0,0 +1,106 @@
+import warnings
+from typing import Any, List, Tuple
+
+import pytest
+from numpy import array, clip, concatenate, isclose, isnan, ones, zeros
+from numpy.random import default_rng
+from sklearn import metrics
+from vizml.metrics.classification_metrics import (ConfusionAccumulator, ConfusionMatrix, Metric, RocAucAccumulator,
+                                                  compute_all_metrics, confusion_counts)
+
+SKLEARN_METRICS = {'ACC': metrics.accuracy_score, 'BAL_ACC': metrics.balanced_accuracy_score,
+                   'F1': metrics.f1_score, 'PRECISION': metrics.precision_score, 'RECALL': metrics.recall_score,
+                   'KAPPA': metrics.cohen_kappa_score, 'HAMMING': metrics.hamming_loss,
+                   'JACCARD': metrics.jaccard_score, 'MCC': metrics.matthews_corrcoef}
+
+rng = default_rng(0)
+LABELS: List[Tuple[Any, Any]] = [(rng.integers(0, 2, 200).astype(float), rng.integers(0, 2, 200).astype(float)),
+                                 (rng.choice([-1, 1], 50), rng.choice([-1, 1], 50)),
+                                 (zeros(10), zeros(10)),
+                                 (zeros(10), ones(10)),
+                                 (array([0, 0, 1]), array([0, 0, 0])),
+                                 ([0, 1, 1, 0], [1, 1, 1, 1])]
+
+
+@pytest.mark.parametrize('array1, array2', LABELS)
+def test_metrics_match_sklearn(array1, array2):
+    """Metrics derived from the confusion matrix must match sklearn."""
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = {name: metric(array1, array2) for name, metric in SKLEARN_METRICS.items()}
+
+    for name, metric in Metric.__members__.items():
+        value = metric.value.compute(array1, array2)
+        assert (isnan(value) and isnan(expected[name])) or isclose(value, expected[name]), name
+
+
+@pytest.mark.parametrize('array1, array2', LABELS)
+def test_confusion_matrix_matches_sklearn(array1, array2):
+    """The confusion matrix must match sklearn."""
+
+    assert (ConfusionMatrix().compute(array1, array2) == metrics.confusion_matrix(array1, array2)).all()
+
+
+def test_compute_all_metrics():
+    """All metrics must be computed in the order of the enum from a single confusion matrix."""
+
+    array1, array2 = LABELS[0]
+    computed_metrics = compute_all_metrics(array1, array2)
+
+    assert [name for name, _ in computed_metrics] == list(Metric.__members__)
+    assert computed_metrics == [(name, round(metric(array1, array2), 3)) for name, metric in SKLEARN_METRICS.items()]
+
+
+@pytest.mark.parametrize('array1, array2', [([0, 1, 2], [0, 1, 1]), ([0, 2], [2, 0])])
+def test_binary_metrics_invalid_labels(array1, array2):
+    """Binary metrics must raise an error for labels other than 0 and 1 like sklearn."""
+
+    with pytest.raises(ValueError):
+        Metric.F1.value.compute(array1, array2)
+
+
+def test_confusion_counts_inconsistent_lengths():
+    """Labels of different lengths must raise an error."""
+
+    with pytest.raises(ValueError):
+        confusion_counts([0, 1], [0, 1, 1])
+
+
+def test_confusion_accumulator():
+    """Metrics of merged chunks must match the metrics of all the labels, including labels missing from chunks."""
+
+    array1, array2 = LABELS[0]
+    first, second = ConfusionAccumulator(), ConfusionAccumulator()
+    first.update(zeros(5), zeros(5))
+    for i in range(0, 200, 64):
+        second.update(array1[i:i + 64], array2[i:i + 64])
+
+    first.merge(second).update(ones(5), ones(5))
+
+    assert first.result() == compute_all_metrics(concatenate((zeros(5), array1, ones(5))),
+                                                 concatenate((zeros(5), array2, ones(5))))
+
+    with pytest.raises(ValueError):
+        ConfusionAccumulator().result()
+
+
+def test_roc_auc_accumulator():
+    """The approximate ROC AUC score of merged chunks must be within its error bound of sklearn."""
+
+    labels = rng.integers(0, 2, 1000)
+    scores = clip(labels * 0.2 + rng.random(1000) * 0.8, 0, 1)
+    first, second = RocAucAccumulator(), RocAucAccumulator()
+    first.update(labels[:300], scores[:300])
+    second.update(labels[300:], scores[300:])
+
+    accumulator = first.merge(second)
+
+    assert abs(accumulator.result() - metrics.roc_auc_score(labels, scores)) <= accumulator.error_bound() + 1e-12
+    assert accumulator.error_bound() < 0.01
+
+    with pytest.raises(ValueError):
+        first.merge(RocAucAccumulator(n_bins=10))
+
+    with pytest.raises(ValueError):
+        RocAucAccumulator().update(ones(3), ones(3)).result()
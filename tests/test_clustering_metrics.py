@@ -0,0 +1,114 @@
+import pytest
+from numpy import abs, array, isclose, sqrt
+from numpy.random import default_rng
+from vizml.metrics.clustering_metrics import AllSilhouetteScores, AvgSilhouetteScore, estimate_silhouette
+
+rng = default_rng(0)
+DATA_POINTS = rng.normal(size=(600, 2))
+LABELS = (DATA_POINTS[:, 0] > 0) * 2 + (DATA_POINTS[:, 1] > 0.5)
+LABELS[0] = 7
+
+
+def brute_force_silhouette(data_points, labels):
+    """Silhouette coefficients computed from the definition."""
+
+    distances = sqrt(((data_points[:, None, :] - data_points[None, :, :]) ** 2).sum(axis=2))
+    values = []
+    for i, label in enumerate(labels):
+        same = labels == label
+        if same.sum() == 1:
+            values.append(0.0)
+            continue
+        inner = distances[i, same].sum() / (same.sum() - 1)
+        outer = min(distances[i, labels == other].mean() for other in set(labels) if other != label)
+        values.append((outer - inner) / max(inner, outer))
+
+    return array(values)
+
+
+EXACT = brute_force_silhouette(DATA_POINTS, LABELS)
+
+
+@pytest.mark.parametrize('max_bytes', [1, 100000, 64 * 1024 * 1024])
+def test_chunked_silhouette(max_bytes):
+    """Chunked silhouette coefficients must be exact for any memory budget."""
+
+    estimate = estimate_silhouette(DATA_POINTS, LABELS, mode='chunked', max_bytes=max_bytes)
+
+    assert isclose(estimate.values, EXACT).all()
+    assert isclose(estimate.score, EXACT.mean())
+    assert estimate.error == 0.0
+
+
+def test_sampled_silhouette():
+    """Sampled silhouette scores must be reproducible, stratified and within a few errors of the exact score."""
+
+    estimate = estimate_silhouette(DATA_POINTS, LABELS, mode='sampled', sample_size=150, random_state=3)
+
+    assert (estimate.indices == estimate_silhouette(DATA_POINTS, LABELS, mode='sampled', sample_size=150,
+                                                    random_state=3).indices).all()
+    assert set(LABELS[estimate.indices]) == set(LABELS)
+    assert isclose(estimate.values, EXACT[estimate.indices]).all()
+    assert 0 < estimate.error < 0.05
+    assert abs(estimate.score - EXACT.mean()) < 4 * estimate.error
+
+
+def test_simplified_silhouette():
+    """Simplified silhouette scores must use the cluster centers and report their difference from the exact values."""
+
+    estimate = estimate_silhouette(DATA_POINTS, LABELS, mode='simplified')
+    centers = array([DATA_POINTS[LABELS == label].mean(axis=0) for label in sorted(set(LABELS))])
+
+    assert isclose(estimate_silhouette(DATA_POINTS, LABELS, mode='simplified', centers=centers).values,
+                   estimate.values).all()
+    assert 0 < estimate.error < 1
+    assert abs(estimate.score - EXACT.mean()) <= estimate.error
+    assert len(estimate.values) == len(DATA_POINTS)
+
+
+def test_simplified_silhouette_empty_clusters():
+    """Centers indexed by label, like those of k means with empty clusters, must only be used for present labels."""
+
+    present = array([DATA_POINTS[LABELS == label].mean(axis=0) for label in sorted(set(LABELS))])
+    centers = rng.normal(size=(max(LABELS) + 1, 2))
+    centers[sorted(set(LABELS))] = present
+
+    assert isclose(estimate_silhouette(DATA_POINTS, LABELS, mode='simplified', centers=centers).values,
+                   estimate_silhouette(DATA_POINTS, LABELS, mode='simplified', centers=present).values).all()
+    assert isclose(estimate_silhouette(DATA_POINTS, LABELS, mode='simplified', centers=present[:2]).values,
+                   EXACT).all()
+
+
+def test_simplified_silhouette_error_covers_bias():
+    """The error of simplified scores must cover their bias, which is large for poorly separated clusters."""
+
+    labels = default_rng(1).integers(0, 10, size=len(DATA_POINTS))
+    exact = brute_force_silhouette(DATA_POINTS, labels).mean()
+    estimate = estimate_silhouette(DATA_POINTS, labels, mode='simplified')
+
+    assert abs(estimate.score - exact) > 0.1
+    assert abs(estimate.score - exact) <= estimate.error
+
+
+def test_auto_silhouette():
+    """Small data sets must be computed exactly in auto mode."""
+
+    estimate = estimate_silhouette(DATA_POINTS, LABELS)
+
+    assert isclose(estimate.values, EXACT).all()
+
+
+def test_silhouette_metrics():
+    """Silhouette metrics must compute the scores in their mode."""
+
+    assert isclose(AvgSilhouetteScore('chunked').compute(DATA_POINTS, LABELS), EXACT.mean())
+    assert len(AllSilhouetteScores('sampled', sample_size=100).compute(DATA_POINTS, LABELS)) < len(DATA_POINTS)
+
+
+@pytest.mark.parametrize('labels, mode', [([0] * 600, 'chunked'), (list(range(600)), 'sampled'),
+                                          (LABELS[:10], 'chunked'), (LABELS, 'unknown')])
+def test_invalid_silhouette(labels, mode):
+    """Invalid labels or modes must raise an error."""
+
+    with pytest.raises(ValueError):
+        estimate_silhouette(DATA_POINTS, labels, mode=mode)
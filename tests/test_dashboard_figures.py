@@ -0,0 +1,212 @@
+from base64 import b64decode
+
+import pytest
+from numpy import arange, array, frombuffer, nan
+from plotly.graph_objects import Contour, Figure, Scatter
+from vizml._dashboard_figures import DIGEST_LENGTH, FigureStore, LazyFigures, encode_figure, figure_nbytes, get_figure_store, typed_array
+from vizml.k_means_clustering.dashboard import DashBoard as DashBoard_KMeansClustering
+from vizml.simple_linear_regression.dashboard import DashBoard as DashBoard_SimpleLinearRegression
+from vizml.simple_linear_regression.regression import OrdinaryLeastSquaresRegression
+
+
+class CountingModel:
+    """Model counting the times it is built and the figures computed from it."""
+
+    built = 0
+
+    def __init__(self, *inputs):
+        CountingModel.built += 1
+        self.inputs = inputs
+        self.computed = []
+
+    def show_data(self, **kwargs):
+        self.computed.append('show_data')
+        return Figure(Scatter(x=[1, 2, 3]))
+
+    def show_metrics(self, **kwargs):
+        self.computed.append('show_metrics')
+        return Figure()
+
+
+TAB_FIGURES = {'tab-1': 'show_data', 'tab-2': 'show_metrics'}
+
+
+@pytest.fixture(autouse=True)
+def reset_counts():
+    """Resets the number of models built."""
+
+    CountingModel.built = 0
+
+
+def test_lazy_figures_computed_on_request():
+    """Only the figures of requested tabs must be computed, each only once."""
+
+    figures = LazyFigures(CountingModel, TAB_FIGURES)
+
+    assert CountingModel.built == 0
+
+    fig = figures.figure('tab-2')
+
+    assert figures.figure('tab-2') is fig
+    assert figures.model.computed == ['show_metrics']
+    assert figures.computed_tabs == ('tab-2',)
+    assert CountingModel.built == 1
+
+
+def test_store_reuses_model():
+    """Switching tabs for the same inputs must reuse the trained model."""
+
+    store = FigureStore()
+    key = store.register(CountingModel, TAB_FIGURES, 1, 'a')
+
+    assert CountingModel.built == 0
+    assert store.register(CountingModel, TAB_FIGURES, 1, 'a') == key
+    assert key[DIGEST_LENGTH:] == '[1, "a"]'
+
+    store.figure(key, 'tab-1')
+    store.figure(key, 'tab-2')
+
+    assert CountingModel.built == 1
+    assert store.get(key).model.inputs == (1, 'a')
+
+    store.figure(store.register(CountingModel, TAB_FIGURES, 2, 'a'), 'tab-1')
+
+    assert CountingModel.built == 2
+
+
+def test_store_eviction():
+    """The least recently used figures must be dropped beyond max bytes and computed again when requested."""
+
+    store = FigureStore(max_bytes=1)
+    keys = [store.register(CountingModel, TAB_FIGURES, i) for i in range(3)]
+
+    for key in keys:
+        store.figure(key, 'tab-1')
+
+    assert len(store) == 1
+    assert store.total_bytes > 0
+
+    store.figure(keys[0], 'tab-1')
+
+    assert CountingModel.built == 4
+
+
+def test_store_unknown_key():
+    """Unregistered keys must raise an error."""
+
+    with pytest.raises(KeyError):
+        FigureStore().figure('unknown', 'tab-1')
+
+
+def test_store_restores_unknown_key():
+    """Keys registered by another store must be registered again when given their model builder."""
+
+    key = FigureStore(secret=b'secret').register(CountingModel, TAB_FIGURES, 1, 'a')
+    store = FigureStore(secret=b'secret')
+
+    assert store.payload(key, 'tab-1', CountingModel, TAB_FIGURES)['data']
+    assert store.get(key).model.inputs == (1, 'a')
+
+    with pytest.raises(KeyError):
+        store.get(FigureStore(secret=b'secret').register(CountingModel, TAB_FIGURES, 2, 'a'), lambda *inputs: None, TAB_FIGURES)
+    with pytest.raises(KeyError):
+        store.get(key[:DIGEST_LENGTH] + '[1, "b"]', CountingModel, TAB_FIGURES)
+
+
+@pytest.mark.parametrize('key', ['0' * DIGEST_LENGTH + '[1, "a"]', '0' * DIGEST_LENGTH + '[[1], "a"]',
+                                 '0' * DIGEST_LENGTH + '{"a": 1}', '0' * DIGEST_LENGTH + '[' * 2000, {'key': 1}])
+def test_store_rejects_forged_key(key):
+    """Keys not signed with the secret of the store, or holding anything but input values, must be rejected."""
+
+    with pytest.raises(KeyError):
+        FigureStore(secret=b'secret').get(key, CountingModel, TAB_FIGURES)
+
+    assert CountingModel.built == 0
+
+
+def test_store_keys_signed_with_secret():
+    """Keys must only be restored by stores sharing the secret of the store that registered them."""
+
+    key = FigureStore(secret=b'secret').register(CountingModel, TAB_FIGURES, 1, 'a')
+
+    assert FigureStore(secret=b'secret').get(key, CountingModel, TAB_FIGURES).model.inputs == (1, 'a')
+    assert FigureStore().register(CountingModel, TAB_FIGURES, 1, 'a') != key
+
+    with pytest.raises(KeyError):
+        FigureStore(secret=b'other secret').get(key, CountingModel, TAB_FIGURES)
+
+
+def test_store_drops_oversized_entries():
+    """Figures larger than the entry bound must be served without being kept."""
+
+    store = FigureStore(max_entry_bytes=1)
+    key = store.register(CountingModel, TAB_FIGURES, 1)
+
+    assert isinstance(store.figure(key, 'tab-1'), Figure)
+    assert len(store) == 0
+
+    store.figure(key, 'tab-1')
+
+    assert CountingModel.built == 2
+
+
+def test_figure_nbytes():
+    """The figure size must account for the data of its traces."""
+
+    assert figure_nbytes(Figure(Scatter(x=arange(1000.0), y=arange(1000.0)))) >= 16000
+
+
+def test_dashboard_computes_active_tab():
+    """Dashboards must compute only the figure of the active tab."""
+
+    key = DashBoard_KMeansClustering._update_figure_key(-1, 60, 3, '2d')
+    payload = DashBoard_KMeansClustering._update_plots('tab-2', key)
+
+    assert payload is get_figure_store().payload(key, 'tab-2')
+    assert get_figure_store().get(key).computed_tabs == ('tab-2',)
+
+
+def test_dashboard_type_tabs():
+    """Regression dashboards must build the regressor of the chosen type tab."""
+
+    key = DashBoard_SimpleLinearRegression._update_figure_key('tab-1', -1, 20, 'increasing')
+    DashBoard_SimpleLinearRegression._update_graph('tab-1', key)
+
+    assert isinstance(get_figure_store().get(key).model, OrdinaryLeastSquaresRegression)
+
+
+def test_dashboard_online_engine():
+    """The K Means dashboard must show the centers converging with the online engine."""
+
+    key = DashBoard_KMeansClustering._update_figure_key(-1, 100, 3, '2d', 'online')
+    payload = DashBoard_KMeansClustering._update_plots('tab-7', key)
+
+    assert len(payload['frames']) == 4
+
+
+@pytest.mark.parametrize('values, dtype', [(array([0, 1, 2]), 'u1'), (array([[0.0, 1.0], [2.0, 255.0]]), 'u1'),
+                                           (array([-1, 300]), 'i2'), (array([0.5, nan]), 'f4'),
+                                           (array([True, False]), 'u1')])
+def test_typed_array(values, dtype):
+    """Arrays must be encoded in the smallest type holding their values, keeping the shape of 2D arrays."""
+
+    encoded = typed_array(values)
+
+    assert encoded['dtype'] == dtype
+    assert encoded.get('shape') == (f"{values.shape[0]}, {values.shape[1]}" if values.ndim == 2 else None)
+    decoded = frombuffer(b64decode(encoded['bdata']), dtype=f'<{dtype}')
+    assert (decoded.reshape(values.shape) == values).sum() == (values == values).sum()
+
+
+def test_encode_figure():
+    """Encoded figures must hold typed arrays instead of their numpy arrays, along with their other properties."""
+
+    z_values = arange(90000.0).reshape(300, 300) / 7
+    payload = encode_figure(Figure(Contour(z=z_values, x=[1, 2], name='Contour'), layout=dict(title='Title')))
+
+    assert payload['data'][0]['z']['dtype'] == 'f4'
+    assert payload['data'][0]['x'] == [1, 2]
+    assert payload['data'][0]['name'] == 'Contour'
+    assert payload['layout']['title']['text'] == 'Title'
+    assert len(payload['data'][0]['z']['bdata']) < len(str(z_values.tolist())) / 3
+    assert typed_array(array(['a'])).tolist() == ['a']
@@ -1,4 +1,5 @@
 import pytest
+from numpy import concatenate, equal
 from vizml.data_generator import FloatingPointGenerator
 
 
@@ -65,3 +66,16 @@ def test_diff_random_state_gen_value():
     b = FloatingPointGenerator(random_state=11).generate()
 
     assert a != b
+
+
+@pytest.mark.parametrize(
+    "chunk_size", [1, 3, 10, 100]
+)
+def test_generate_iter(chunk_size):
+    """Blocks generated by generate_iter must concatenate to the values of as many calls of generate."""
+
+    gen = FloatingPointGenerator(random_state=7)
+    a = [gen.generate() for _ in range(25)]
+    b = concatenate(list(FloatingPointGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=chunk_size)))
+
+    assert b.shape == (25,) and equal(a, b).all()
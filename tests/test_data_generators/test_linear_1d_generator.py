@@ -1,5 +1,5 @@
 import pytest
-from numpy import equal
+from numpy import concatenate, equal, float32
 from vizml.data_generator import Linear1DGenerator
 
 
@@ -58,7 +58,7 @@ def test_increasing():
 def test_decreasing():
     """Tests the linearly decreasing functionality."""
 
-    a = Linear1DGenerator().generate(is_increasing=False)
+    a = Linear1DGenerator().generate(no_of_points=100, is_increasing=False)
     assert a[-1] < a[0]
 
 
@@ -99,3 +99,22 @@ def test_diff_random_state_gen_value():
     b = Linear1DGenerator(random_state=11).generate()
 
     assert not equal(a, b).any()
+
+
+def test_output_dtype():
+    """Tests that the data is generated with the requested dtype."""
+
+    a = Linear1DGenerator().generate(dtype=float32)
+    assert a.dtype == float32
+
+
+@pytest.mark.parametrize(
+    "chunk_size", [1, 3, 10, 100]
+)
+def test_generate_iter(chunk_size):
+    """Blocks generated by generate_iter must concatenate to the output of generate."""
+
+    a = Linear1DGenerator(random_state=7).generate(no_of_points=25)
+    b = concatenate(list(Linear1DGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=chunk_size)))
+
+    assert equal(a, b).all()
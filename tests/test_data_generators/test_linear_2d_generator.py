@@ -1,5 +1,6 @@
 import pytest
-from numpy import equal
+from numpy import allclose, arange, concatenate, equal, float32
+from numpy.random import PCG64, Generator, SeedSequence
 from vizml.data_generator import Linear2DGenerator
 
 
@@ -99,3 +100,54 @@ def test_diff_random_state_gen_value():
     b = Linear2DGenerator(random_state=11).generate()
 
     assert not equal(a, b).any()
+
+
+def test_output_dtype():
+    """Tests that the data is generated with the requested dtype."""
+
+    a = Linear2DGenerator().generate(dtype=float32)
+    assert a.dtype == float32
+
+
+@pytest.mark.parametrize(
+    "chunk_size", [1, 3, 10, 100]
+)
+def test_generate_iter(chunk_size):
+    """Blocks generated by generate_iter must concatenate to the output of generate."""
+
+    a = Linear2DGenerator(random_state=7).generate(no_of_points=25)
+    b = concatenate(list(Linear2DGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=chunk_size)))
+
+    assert equal(a, b).all()
+
+
+def test_generate_iter_decreasing():
+    """Blocks of decreasing data with a custom dtype must concatenate to the output of generate."""
+
+    a = Linear2DGenerator(random_state=7).generate(no_of_points=25, is_increasing=False, dtype=float32)
+    b = concatenate(list(Linear2DGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=4,
+                                                                         is_increasing=False, dtype=float32)))
+
+    assert equal(a, b).all()
+
+
+def test_generate_iter_invalid_chunk_size():
+    """Blocks must contain at least one data point."""
+
+    with pytest.raises(ValueError):
+        next(Linear2DGenerator().generate_iter(no_of_points=10, chunk_size=0))
+
+
+def test_consecutive_generations_independent_noise():
+    """Consecutive generations must keep drawing their normal samples from one persistent stream."""
+
+    generator = Linear2DGenerator(random_state=7)
+    a = generator.generate(no_of_points=5000)
+    b = generator.generate(no_of_points=5000)
+
+    bit_generator = PCG64(SeedSequence(7))
+    rng, normal_rng = Generator(bit_generator), Generator(bit_generator.jumped())
+    index = arange(5000.0)[:, None]
+    for data_points in (a, b):
+        noise = rng.uniform(1.75, 7, size=(5000, 2)) * normal_rng.standard_normal(size=(5000, 2))
+        assert allclose(data_points, index + noise)
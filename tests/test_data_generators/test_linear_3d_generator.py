@@ -1,5 +1,5 @@
 import pytest
-from numpy import equal
+from numpy import concatenate, equal, float32
 from vizml.data_generator import Linear3DGenerator
 
 
@@ -51,7 +51,7 @@ def test_output_shape(no_of_points):
 def test_increasing():
     """Tests the linearly increasing functionality."""
 
-    a = Linear3DGenerator().generate()
+    a = Linear3DGenerator().generate(no_of_points=100)
     assert a[-1][-1] > a[0][-1]
 
 
@@ -99,3 +99,22 @@ def test_diff_random_state_gen_value():
     b = Linear3DGenerator(random_state=11).generate()
 
     assert not equal(a, b).any()
+
+
+def test_output_dtype():
+    """Tests that the data is generated with the requested dtype."""
+
+    a = Linear3DGenerator().generate(dtype=float32)
+    assert a.dtype == float32
+
+
+@pytest.mark.parametrize(
+    "chunk_size", [1, 3, 10, 100]
+)
+def test_generate_iter(chunk_size):
+    """Blocks generated by generate_iter must concatenate to the output of generate."""
+
+    a = Linear3DGenerator(random_state=7).generate(no_of_points=25)
+    b = concatenate(list(Linear3DGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=chunk_size)))
+
+    assert equal(a, b).all()
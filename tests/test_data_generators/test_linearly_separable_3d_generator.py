@@ -85,3 +85,9 @@ def test_diff_random_state_gen_value():
     b = LinearlySeparable3DGenerator(random_state=11).generate()
 
     assert not equal(a[:, :3], b[:, :3]).any()
+
+
+def test_no_generate_iter():
+    """Classification data is drawn as a whole by sklearn, so it must not be offered in blocks."""
+
+    assert not hasattr(LinearlySeparable3DGenerator(random_state=7), 'generate_iter')
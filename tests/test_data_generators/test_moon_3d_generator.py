@@ -85,3 +85,16 @@ def test_diff_random_state_gen_value():
     b = MoonData3DGenerator(random_state=11).generate()
 
     assert not equal(a[:, :3], b[:, :3]).any()
+
+
+def test_no_generate_iter():
+    """Classification data is drawn as a whole by sklearn, so it must not be offered in blocks."""
+
+    assert not hasattr(MoonData3DGenerator(random_state=7), 'generate_iter')
+
+
+def test_third_axis_range():
+    """The generated third axis must lie within [0, 1.5)."""
+
+    a = MoonData3DGenerator().generate(no_of_points=100)
+    assert (a[:, 2] >= 0).all() and (a[:, 2] < 1.5).all()
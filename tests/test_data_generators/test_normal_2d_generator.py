@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
-from numpy import equal
+from numpy import concatenate, equal
 from vizml.data_generator import Normal2DGenerator
 
 
@@ -85,3 +88,65 @@ def test_diff_random_state_gen_value():
     b = Normal2DGenerator(random_state=11).generate()
 
     assert not equal(a, b).any()
+
+
+def test_global_state_untouched():
+    """Generating data must not change the global numpy random state."""
+
+    np.random.seed(seed=3)
+    expected = np.random.uniform()
+
+    np.random.seed(seed=3)
+    Normal2DGenerator(random_state=7).generate(no_of_points=10)
+
+    assert np.random.uniform() == expected
+
+
+def test_interleaved_instances():
+    """Instances must not share random state with each other."""
+
+    a = Normal2DGenerator(random_state=7).generate(no_of_points=4)
+
+    gen1 = Normal2DGenerator(random_state=7)
+    gen2 = Normal2DGenerator(random_state=11)
+    first = gen1.generate(no_of_points=2)
+    gen2.generate(no_of_points=2)
+    b = np.concatenate([first, gen1.generate(no_of_points=2)])
+
+    assert equal(a, b).all()
+
+
+def test_spawn_reproducible():
+    """Spawned children of generators with the same seed generate the same values."""
+
+    a = [child.generate(no_of_points=5) for child in Normal2DGenerator(random_state=7).spawn(3)]
+    b = [child.generate(no_of_points=5) for child in Normal2DGenerator(random_state=7).spawn(3)]
+
+    assert all(equal(x, y).all() for x, y in zip(a, b))
+    assert not equal(a[0], a[1]).any()
+
+
+def test_spawn_parallel_matches_serial():
+    """Generating chunks from spawned children in threads must match generating them one after another."""
+
+    serial = np.concatenate([child.generate(no_of_points=100)
+                             for child in Normal2DGenerator(random_state=7).spawn(4)])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        chunks = executor.map(lambda child: child.generate(no_of_points=100),
+                              Normal2DGenerator(random_state=7).spawn(4))
+        parallel = np.concatenate(list(chunks))
+
+    assert equal(serial, parallel).all()
+
+
+@pytest.mark.parametrize(
+    "chunk_size", [1, 3, 10, 100]
+)
+def test_generate_iter(chunk_size):
+    """Blocks generated by generate_iter must concatenate to the output of generate."""
+
+    a = Normal2DGenerator(random_state=7).generate(no_of_points=25)
+    b = concatenate(list(Normal2DGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=chunk_size)))
+
+    assert equal(a, b).all()
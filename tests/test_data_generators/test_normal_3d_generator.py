@@ -1,5 +1,5 @@
 import pytest
-from numpy import equal
+from numpy import concatenate, equal
 from vizml.data_generator import Normal3DGenerator
 
 
@@ -85,3 +85,15 @@ def test_diff_random_state_gen_value():
     b = Normal3DGenerator(random_state=11).generate()
 
     assert not equal(a, b).any()
+
+
+@pytest.mark.parametrize(
+    "chunk_size", [1, 3, 10, 100]
+)
+def test_generate_iter(chunk_size):
+    """Blocks generated by generate_iter must concatenate to the output of generate."""
+
+    a = Normal3DGenerator(random_state=7).generate(no_of_points=25)
+    b = concatenate(list(Normal3DGenerator(random_state=7).generate_iter(no_of_points=25, chunk_size=chunk_size)))
+
+    assert equal(a, b).all()
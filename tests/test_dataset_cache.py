@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pytest
+from numpy import equal, float32
+from vizml.bagging_classifier.classification import BaggingClassifier
+from vizml.data_generator import Linear1DGenerator, MoonData2DGenerator, Normal2DGenerator
+from vizml.dataset_cache import DatasetCache, cached_generate, get_dataset_cache, set_dataset_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Dataset cache in a temporary directory."""
+
+    return DatasetCache(tmp_path)
+
+
+def test_cache_hit_is_memmap(cache):
+    """Repeated requests must map the cached data instead of generating it again."""
+
+    a = cache.generate(Normal2DGenerator(random_state=7), no_of_points=50)
+    b = cache.generate(Normal2DGenerator(random_state=7), no_of_points=50)
+
+    assert not isinstance(a, np.memmap)
+    assert isinstance(b, np.memmap)
+    assert equal(a, b).all()
+
+
+def test_cache_matches_generator(cache):
+    """Cached data must match the data generated without the cache."""
+
+    a = MoonData2DGenerator(random_state=7).generate(no_of_points=50)
+    cache.generate(MoonData2DGenerator(random_state=7), no_of_points=50)
+    b = cache.generate(MoonData2DGenerator(random_state=7), no_of_points=50)
+
+    assert equal(a, b).all()
+
+
+def test_cache_restores_stream(cache):
+    """A cache hit must leave the generator where generating the data would have left it."""
+
+    gen = Linear1DGenerator(random_state=7)
+    expected = [gen.generate(no_of_points=20), gen.generate(no_of_points=20, is_increasing=False)]
+
+    for _ in range(2):
+        gen = Linear1DGenerator(random_state=7)
+        cached = [cache.generate(gen, no_of_points=20), cache.generate(gen, no_of_points=20, is_increasing=False)]
+        assert all(equal(x, y).all() for x, y in zip(expected, cached))
+
+
+def test_cache_restores_normal_stream(cache):
+    """Generating after a cache hit must give what generating after the uncached data would have given."""
+
+    gen = Linear1DGenerator(random_state=7)
+    gen.generate(no_of_points=20)
+    expected = gen.generate(no_of_points=20)
+
+    cache.generate(Linear1DGenerator(random_state=7), no_of_points=20)
+    gen = Linear1DGenerator(random_state=7)
+    cache.generate(gen, no_of_points=20)
+
+    assert equal(gen.generate(no_of_points=20), expected).all()
+
+
+def test_cache_key_shape_params(cache):
+    """Different shape parameters must be cached separately."""
+
+    a = cache.generate(Linear1DGenerator(random_state=7), no_of_points=20)
+    b = cache.generate(Linear1DGenerator(random_state=7), no_of_points=20, dtype=float32)
+
+    assert b.dtype == float32
+    assert not equal(a, b).all()
+    assert len([name for name in os.listdir(cache.cache_dir) if name.endswith('.npy')]) == 2
+
+
+def test_cache_skips_randomized(cache):
+    """Randomized generators must not be cached."""
+
+    cache.generate(Normal2DGenerator(random=True), no_of_points=50)
+
+    assert cache.total_bytes == 0
+
+
+def test_cache_eviction(tmp_path):
+    """The least recently used data sets must be evicted once the cache is full."""
+
+    cache = DatasetCache(tmp_path, max_bytes=4000)
+
+    cache.generate(Normal2DGenerator(random_state=1), no_of_points=100)
+    cache.generate(Normal2DGenerator(random_state=2), no_of_points=100)
+    os.utime(cache._paths(cache._key(Normal2DGenerator(random_state=1), 100))[0], (0, 0))
+    cache.generate(Normal2DGenerator(random_state=3), no_of_points=100)
+
+    assert cache.total_bytes <= cache.max_bytes
+    assert not isinstance(cache.generate(Normal2DGenerator(random_state=1), no_of_points=100), np.memmap)
+    assert isinstance(cache.generate(Normal2DGenerator(random_state=3), no_of_points=100), np.memmap)
+
+
+def test_cache_clear(cache):
+    """Clearing the cache must remove all data sets."""
+
+    cache.generate(Normal2DGenerator(random_state=7), no_of_points=50)
+    cache.clear()
+
+    assert cache.total_bytes == 0
+
+
+def test_cached_generate_with_models(cache):
+    """Models must work with data read from the cache."""
+
+    previous_cache = get_dataset_cache()
+    set_dataset_cache(cache)
+    try:
+        clf1 = BaggingClassifier(random_state=7)
+        clf2 = BaggingClassifier(random_state=7)
+        clf2.train()
+        assert isinstance(clf2.generated_data, np.memmap)
+        assert equal(clf1.data_points, clf2.data_points).all()
+
+        set_dataset_cache(None)
+        uncached = cached_generate(Normal2DGenerator(random_state=7), no_of_points=5)
+    finally:
+        set_dataset_cache(previous_cache)
+
+    assert not isinstance(uncached, np.memmap)
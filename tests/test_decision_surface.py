@@ -0,0 +1,208 @@
+import pytest
+from numpy import allclose, arange, equal, unique
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.svm import SVC
+from vizml.data_generator import MoonData2DGenerator, MoonData3DGenerator
+from vizml.decision_surface import DecisionSurface, _bytes_per_point, batch_size_for, predict_in_batches
+from vizml.k_nearest_neighbours.classification import KNearestNeighbours
+
+
+class CountingClassifier(KNeighborsClassifier):
+    """K Nearest Neighbours classifier counting the calls made to it."""
+
+    calls = 0
+
+    def predict(self, X):
+        CountingClassifier.calls += 1
+        return super().predict(X)
+
+    def predict_proba(self, X):
+        CountingClassifier.calls += 1
+        return super().predict_proba(X)
+
+
+@pytest.fixture
+def data():
+    """Moon shaped 2D data along with labels."""
+
+    generated_data = MoonData2DGenerator().generate(no_of_points=50)
+    return generated_data[:, :2], generated_data[:, 2]
+
+
+def test_labels_match_predict(data):
+    """Labels derived from the probabilities must match the predictions of the classifier."""
+
+    data_points, labels = data
+    clf = KNeighborsClassifier().fit(data_points, labels)
+    surface = DecisionSurface(clf, data_points, resolution=50)
+
+    assert surface.labels.shape == (50, 50)
+    assert equal(surface.labels.ravel(), clf.predict(surface.points)).all()
+
+
+def test_labels_match_predict_decision_function(data):
+    """Labels derived from the decision function must match the predictions of the classifier."""
+
+    data_points, labels = data
+    clf = LogisticRegression().fit(data_points, labels)
+    surface = DecisionSurface(clf, data_points, resolution=50, score_method='decision_function')
+
+    assert equal(surface.labels.ravel(), clf.predict(surface.points)).all()
+
+
+def test_labels_3d():
+    """Labels must be flat over the voxel grid in 3d config."""
+
+    generated_data = MoonData3DGenerator().generate(no_of_points=50)
+    clf = KNeighborsClassifier().fit(generated_data[:, :3], generated_data[:, 3])
+    surface = DecisionSurface(clf, generated_data[:, :3], resolution=20)
+
+    assert surface.points.shape == (8000, 3)
+    assert surface.labels.shape == (8000,)
+    assert surface.probabilities.shape == (8000,)
+    assert equal(surface.labels, clf.predict(surface.points)).all()
+
+
+def test_volume_3d():
+    """The voxel grid must span the volume of the data in 3d config."""
+
+    generated_data = MoonData3DGenerator().generate(no_of_points=50)
+    clf = KNeighborsClassifier().fit(generated_data[:, :3], generated_data[:, 3])
+    surface = DecisionSurface(clf, generated_data[:, :3], resolution=10)
+
+    assert all(len(unique(surface.points[:, axis])) == 10 for axis in range(3))
+    assert len(unique(surface.points, axis=0)) == 1000
+    assert surface.iso_level == 0.5
+
+
+def test_batched_evaluation(data):
+    """Grids beyond the memory budget must be evaluated in batches giving the same outputs."""
+
+    data_points, labels = data
+    clf = CountingClassifier().fit(data_points, labels)
+    surface = DecisionSurface(clf, data_points, resolution=50)
+    memory_budget = 300 * _bytes_per_point(clf, 2)
+
+    CountingClassifier.calls = 0
+    batched = DecisionSurface(clf, data_points, resolution=50, memory_budget=memory_budget)
+
+    assert batched.batch_size == 300
+    assert CountingClassifier.calls == 9
+    assert equal(surface.scores, batched.scores).all()
+    assert equal(surface.labels, batched.labels).all()
+
+    threaded = DecisionSurface(clf, data_points, resolution=50, memory_budget=memory_budget, n_jobs=4)
+
+    assert equal(surface.scores, threaded.scores).all()
+
+
+def test_batch_size_for_models(data):
+    """Models building larger intermediate arrays per point must be given smaller batches."""
+
+    data_points, labels = data
+    knn = KNeighborsClassifier().fit(data_points, labels)
+    lr = LogisticRegression().fit(data_points, labels)
+
+    assert batch_size_for(knn, 2) < batch_size_for(lr, 2)
+    assert batch_size_for(knn, 2, memory_budget=1) == 1
+
+
+def test_predict_in_batches():
+    """Batched predictions must be written in order into a single output array."""
+
+    points = arange(10).reshape(5, 2)
+
+    assert equal(predict_in_batches(lambda x: x * 2, points, batch_size=2), points * 2).all()
+    assert equal(predict_in_batches(lambda x: x.sum(axis=1), points, batch_size=3, n_jobs=2), points.sum(axis=1)).all()
+
+    with pytest.raises(ValueError):
+        predict_in_batches(lambda x: x, points, batch_size=0)
+
+
+def test_single_evaluation(data):
+    """The classifier must be evaluated once for both the boundary and the probabilities."""
+
+    data_points, labels = data
+    clf = CountingClassifier().fit(data_points, labels)
+    CountingClassifier.calls = 0
+
+    surface = DecisionSurface(clf, data_points, resolution=50)
+    _ = surface.labels, surface.probabilities
+
+    assert CountingClassifier.calls == 1
+
+
+def test_grid_cached(data):
+    """The grid must be reused for data with the same extent."""
+
+    data_points, labels = data
+    clf = KNeighborsClassifier().fit(data_points, labels)
+
+    assert DecisionSurface(clf, data_points).points is DecisionSurface(clf, data_points.copy()).points
+
+
+def test_invalid_score_method(data):
+    """Unknown score methods must raise an error."""
+
+    data_points, labels = data
+    clf = KNeighborsClassifier().fit(data_points, labels)
+
+    with pytest.raises(ValueError):
+        DecisionSurface(clf, data_points, score_method='predict')
+
+
+def test_model_surface_reset_on_train():
+    """Models must reuse the surface until they are trained again."""
+
+    clf = KNearestNeighbours(no_points=20)
+    clf.train()
+    surface = clf.decision_surface
+
+    assert clf.decision_surface is surface
+
+    clf.change_k_neighbors(3)
+    clf.train()
+
+    assert clf.decision_surface is not surface
+
+
+@pytest.mark.parametrize('clf, score_method', [(SVC(kernel='rbf'), 'decision_function'),
+                                               (KNeighborsClassifier(), 'predict_proba')])
+def test_adaptive_matches_dense(clf, score_method):
+    """Adaptive surfaces must match the dense surfaces with far fewer evaluations."""
+
+    generated_data = MoonData2DGenerator().generate(no_of_points=500)
+    data_points = generated_data[:, :2]
+    clf.fit(data_points, generated_data[:, 2])
+
+    adaptive = DecisionSurface(clf, data_points, resolution=300, score_method=score_method, adaptive=True)
+    dense = DecisionSurface(clf, data_points, resolution=adaptive.resolution, score_method=score_method)
+
+    assert adaptive.labels.shape == dense.labels.shape
+    assert (adaptive.labels != dense.labels).mean() < 0.001
+    assert adaptive.n_evaluations * 5 < dense.n_evaluations
+
+
+def test_adaptive_flat_surface(data):
+    """A linear decision function must be interpolated exactly from the coarse grid."""
+
+    data_points, labels = data
+    clf = LogisticRegression().fit(data_points, labels)
+
+    adaptive = DecisionSurface(clf, data_points, resolution=50, score_method='decision_function', adaptive=True)
+    dense = DecisionSurface(clf, data_points, resolution=adaptive.resolution, score_method='decision_function')
+
+    assert adaptive.resolution == 51
+    assert allclose(adaptive.scores, dense.scores)
+    assert equal(adaptive.labels, dense.labels).all()
+
+
+def test_adaptive_3d_not_supported():
+    """Adaptive refinement must raise an error in 3d config."""
+
+    generated_data = MoonData3DGenerator().generate(no_of_points=50)
+    clf = KNeighborsClassifier().fit(generated_data[:, :3], generated_data[:, 3])
+
+    with pytest.raises(ValueError):
+        DecisionSurface(clf, generated_data[:, :3], adaptive=True)
@@ -0,0 +1,63 @@
+import plotly.graph_objects as go
+import pytest
+from vizml._dashboard_configs import DASH_STYLE, PLOT_TEMPLATE
+from vizml._figure_factory import _base_layout, figure_layout, style_figure
+
+
+@pytest.mark.parametrize('grid', [True, False])
+def test_style_figure_matches_update_layout(grid):
+    """Styled figures must have the layout built by validating the same properties."""
+
+    expected = go.Figure(go.Scatter(x=[1, 2], y=[3, 4]))
+    expected.update_layout(title="Title", xaxis_title="X Values", yaxis_title="Y Values", title_x=0.5,
+                           plot_bgcolor=DASH_STYLE["backgroundColor"], paper_bgcolor=DASH_STYLE["backgroundColor"],
+                           font_color=DASH_STYLE["color"], template=PLOT_TEMPLATE)
+    if grid:
+        expected.update_xaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+        expected.update_yaxes(gridcolor='#000000', zerolinewidth=2, zerolinecolor='#000000')
+
+    fig = style_figure(go.Figure(go.Scatter(x=[1, 2], y=[3, 4])), title="Title", xaxis_title="X Values",
+                       yaxis_title="Y Values", grid=grid)
+
+    assert fig.layout.to_plotly_json() == expected.layout.to_plotly_json()
+    assert fig.layout.title.text == "Title"
+
+
+def test_styled_figure_validates_updates():
+    """Updates of styled figures must be validated and must not change the cached layout."""
+
+    fig = style_figure(go.Figure(), title="Title", grid=True)
+    fig.update_layout(title="New Title", xaxis_gridcolor='#FFFFFF')
+
+    with pytest.raises(ValueError):
+        fig.update_layout(unknown_property=1)
+
+    assert figure_layout(grid=True)['xaxis']['gridcolor'] == '#000000'
+    assert 'text' not in figure_layout(grid=True)['title']
+
+
+def test_style_figure_keeps_layout_properties():
+    """Styling must keep the layout properties set on the figure before, like shapes and annotations."""
+
+    fig = go.Figure(go.Scatter(x=[1, 2], y=[3, 4]))
+    fig.add_hline(y=3.5, annotation_text="Line")
+
+    style_figure(fig, title="Title", grid=True)
+
+    assert len(fig.layout.shapes) == 1 and fig.layout.annotations[0].text == "Line"
+    assert fig.layout.title.text == "Title" and fig.layout.xaxis.gridcolor == '#000000'
+    assert _base_layout(True).title.text is None
+
+
+def test_style_figure_category_axes():
+    """Category axes without grid lines must be styled with the cached layout, like updating the axes."""
+
+    expected = style_figure(go.Figure(go.Bar(x=[1, 2], y=["a", "b"])), title="Title")
+    expected.update_xaxes(type='category', showgrid=False)
+    expected.update_yaxes(type='category', showgrid=False)
+
+    fig = style_figure(go.Figure(go.Bar(x=[1, 2], y=["a", "b"])), title="Title", category_axes='xy', hide_grid=True)
+
+    assert fig.layout.to_plotly_json() == expected.layout.to_plotly_json()
+    assert _base_layout(False, 'xy', True) is _base_layout(False, 'xy', True)
+    assert style_figure(go.Figure(), category_axes='y').layout.xaxis.type is None
@@ -0,0 +1,137 @@
+import pytest
+from numpy import arange, equal
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.tree import DecisionTreeClassifier
+from vizml.data_generator import MoonData2DGenerator
+from vizml.k_nearest_neighbours.classification import KNearestNeighbours
+from vizml.fit_cache import FitCache, cached_fit, get_fit_cache, set_fit_cache
+
+
+@pytest.fixture
+def data():
+    """Moon shaped 2D data along with labels."""
+
+    generated_data = MoonData2DGenerator().generate(no_of_points=50)
+    return generated_data[:, :2], generated_data[:, 2]
+
+
+def test_cache_hit(data):
+    """Fitting the same estimator on the same data must return a copy of the cached estimator."""
+
+    cache = FitCache()
+    fitted = cache.fit(KNeighborsClassifier(n_neighbors=3), *data)
+    cached = cache.fit(KNeighborsClassifier(n_neighbors=3), *data)
+
+    assert cached is not fitted
+    assert equal(cached.predict(data[0]), fitted.predict(data[0])).all()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_hit_isolated(data):
+    """Updating an estimator returned by the cache must not change the estimators returned later."""
+
+    cache = FitCache()
+    fitted = cache.fit(DecisionTreeClassifier(random_state=0), *data)
+    expected = fitted.predict(data[0])
+    fitted.fit(data[0][:10], data[1][:10])
+
+    assert equal(cache.fit(DecisionTreeClassifier(random_state=0), *data).predict(data[0]), expected).all()
+
+
+def test_cache_skips_unseeded(data):
+    """Estimators without a fixed random_state must be fitted anew unless unseeded caching is enabled."""
+
+    cache = FitCache()
+    cache.fit(DecisionTreeClassifier(), *data)
+    cache.fit(DecisionTreeClassifier(), *data)
+
+    assert len(cache) == 0 and cache.hits == 0
+
+    cache = FitCache(cache_unseeded=True)
+    cache.fit(DecisionTreeClassifier(), *data)
+    cache.fit(DecisionTreeClassifier(), *data)
+
+    assert cache.hits == 1
+
+
+def test_cache_key(data):
+    """Different hyperparameters, estimators or data must be fitted separately."""
+
+    cache = FitCache()
+    data_points, labels = data
+
+    cache.fit(KNeighborsClassifier(n_neighbors=3), data_points, labels)
+    cache.fit(KNeighborsClassifier(n_neighbors=5), data_points, labels)
+    cache.fit(DecisionTreeClassifier(random_state=0), data_points, labels)
+    cache.fit(KNeighborsClassifier(n_neighbors=3), data_points + 1, labels)
+    cache.fit(KNeighborsClassifier(n_neighbors=3), data_points.astype('float32'), labels)
+
+    assert len(cache) == 5
+    assert cache.hits == 0
+
+
+def test_cache_eviction(data):
+    """The least recently used estimators must be evicted once the cache is full."""
+
+    cache = FitCache()
+    first = cache.fit(KNeighborsClassifier(n_neighbors=1), *data)
+    cache.max_bytes = cache.total_bytes * 3 // 2
+    cache.fit(KNeighborsClassifier(n_neighbors=2), *data)
+
+    assert len(cache) == 1
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.fit(KNeighborsClassifier(n_neighbors=1), *data) is not first
+
+
+def test_cache_skips_large_estimators(data):
+    """Estimators larger than the cache must not be cached."""
+
+    cache = FitCache(max_bytes=0)
+    cache.fit(KNeighborsClassifier(), *data)
+
+    assert len(cache) == 0
+
+
+def test_cached_fit_disabled(data):
+    """Estimators must be fitted every time when caching is disabled."""
+
+    previous_cache = get_fit_cache()
+    set_fit_cache(None)
+    try:
+        first = cached_fit(KNeighborsClassifier(), *data)
+        assert cached_fit(KNeighborsClassifier(), *data) is not first
+    finally:
+        set_fit_cache(previous_cache)
+
+
+def test_cached_fit_with_models():
+    """Models trained with the same configuration must reuse the fitted estimator."""
+
+    previous_cache = get_fit_cache()
+    cache = FitCache()
+    set_fit_cache(cache)
+    try:
+        clf1, clf2 = KNearestNeighbours(random_state=7), KNearestNeighbours(random_state=7)
+        clf1.train()
+        clf2.train()
+        assert clf1.classifier is not clf2.classifier
+        assert equal(clf1.predicted_values, clf2.predicted_values).all()
+
+        clf2.change_k_neighbors(3)
+        clf2.train()
+        assert cache.hits == 1 and cache.misses == 2
+    finally:
+        set_fit_cache(previous_cache)
+
+
+def test_cache_key_non_contiguous():
+    """Non contiguous arrays must be keyed by their values."""
+
+    cache = FitCache()
+    values = arange(40.0).reshape(20, 2)
+    labels = arange(20) % 2
+
+    cache.fit(KNeighborsClassifier(), values[:, ::-1], labels)
+    cache.fit(KNeighborsClassifier(), values[:, ::-1].copy(), labels)
+
+    assert cache.hits == 1
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import vizml
+from dash import html
+from dash.dependencies import Input, Output
+from vizml._dashboard_app import LazyDash
+
+IMPORT_TIME_LIMIT = 0.5
+
+IMPORT_BENCHMARK = """
+import sys, time
+start = time.perf_counter()
+import vizml
+print(time.perf_counter() - start)
+print(','.join(sorted(module for module in ('dash', 'plotly', 'sklearn', 'pandas') if module in sys.modules)))
+"""
+
+
+def test_import_time():
+    """Importing vizml must be fast and must not import the libraries of the dashboards."""
+
+    environment = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    output = subprocess.run([sys.executable, '-c', IMPORT_BENCHMARK], capture_output=True, text=True,
+                            env=environment, check=True).stdout.split('\n')
+
+    assert float(output[0]) < IMPORT_TIME_LIMIT
+    assert output[1] == ''
+
+
+def test_lazy_exports():
+    """Dashboards must be exported lazily and be listed by the package."""
+
+    assert set(vizml.__all__) <= set(dir(vizml))
+    assert vizml.DashBoard_DBScan.__module__ == 'vizml.dbscan.dashboard'
+
+
+def test_lazy_dash():
+    """Dash apps must be built with their callbacks on first use only."""
+
+    lazy_app = LazyDash(name='test')
+    lazy_app.layout = html.Div([html.Div(id='input'), html.Div(id='output')])
+
+    @lazy_app.callback(Output('output', 'children'), Input('input', 'children'))
+    def update(value):
+        return value
+
+    built_on_declaration = lazy_app.is_built
+
+    assert update('value') == 'value'
+    assert not built_on_declaration
+    assert lazy_app.app is lazy_app.app
+    assert lazy_app.is_built
+    assert 'output.children' in lazy_app.app.callback_map
+    assert lazy_app.server is lazy_app.app.server
@@ -2,6 +2,7 @@ import pytest
 from numpy import equal
 from plotly.graph_objects import Figure
 from vizml.dbscan.clustering import DBScan
+from vizml.dbscan.neighbor_graph import NeighborGraph
 
 
 def test_show_data():
@@ -54,7 +55,7 @@ def test_avg_silhouette_score():
     clu = DBScan()
     clu.train()
     avg_score = clu.avg_silhouette_score
-    assert avg_score == 0.02
+    assert avg_score == 0.18
 
 
 def test_show_data_3d():
@@ -102,7 +103,7 @@ def test_show_show_freq_distribution_3d():
 
 
 @pytest.mark.parametrize(
-    "test_vals", [(0.5, 1.0), (0.7, -0.09), (1.0, 0.23)]
+    "test_vals", [(0.5, 1.0), (0.7, 1.0), (1.0, 0.2)]
 )
 def test_avg_silhouette_score_3d(test_vals):
     """Tests the average silhouette score property in DBScan for 3d config."""
@@ -155,3 +156,59 @@ def test_random_state_3d():
     data2 = clu2.data_points
 
     assert equal(data1, data2).all()
+
+
+def test_silhouette_mode():
+    """Tests the silhouette plot of DBScan with sampled silhouette coefficients."""
+
+    clu = DBScan(no_points=2500, max_dist=0.3, silhouette_mode='sampled')
+    clu.train()
+    fig = clu.show_silhouette_plot(return_fig=True)
+    assert len(fig.data[0].y) < 2500
+
+
+@pytest.mark.parametrize("is_3d", [False, True])
+def test_noise_mask(is_3d):
+    """Tests the clusters plot of DBScan splits the data points with the noise mask."""
+
+    clu = DBScan(max_dist=0.3, is_3d=is_3d)
+    clu.train()
+    fig = clu.show_clusters(return_fig=True)
+
+    assert equal(clu.noise_mask, clu.labels == -1).all()
+    assert clu.num_outliers == clu.noise_mask.sum() > 0
+    assert len(fig.data[0].x) == clu.no_points - clu.num_outliers
+    assert len(fig.data[1].x) == clu.num_outliers
+
+
+@pytest.mark.parametrize("test_vals", [(0.2, 5), (0.5, 10), (1.0, 1), (0.05, 3)])
+def test_max_eps(test_vals):
+    """Tests clustering from the neighbor graph in DBScan matches the clusters of the core points of sklearn."""
+
+    _max_dist, _min_no_points = test_vals
+    clu = DBScan(no_points=300, max_dist=_max_dist, min_no_points=_min_no_points)
+    clu_graph = DBScan(no_points=300, max_dist=_max_dist, min_no_points=_min_no_points, max_eps=1.0)
+    clu.train()
+    clu_graph.train()
+    core = clu.clustering.core_sample_indices_
+
+    assert equal(clu.noise_mask, clu_graph.noise_mask).all()
+    assert equal(clu.labels[core], clu_graph.labels[core]).all()
+
+
+def test_neighbor_graph_max_eps():
+    """Tests computing labels beyond the max eps of the neighbor graph raises an error."""
+
+    graph = NeighborGraph(max_eps=0.5).fit(DBScan().data_points)
+
+    with pytest.raises(ValueError):
+        graph.labels(0.6, 5)
+
+
+@pytest.mark.parametrize("is_3d", [False, True])
+def test_show_k_distance_plot(is_3d):
+    """Tests the show k distance plot function in DBScan."""
+
+    clu = DBScan(is_3d=is_3d)
+    fig = clu.show_k_distance_plot(return_fig=True)
+    assert list(fig.data[0].y) == sorted(fig.data[0].y)
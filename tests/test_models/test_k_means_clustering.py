@@ -1,6 +1,9 @@
-from numpy import equal
+import pytest
+from numpy import array, equal, zeros
 from plotly.graph_objects import Figure
-from vizml.k_means_clustering.clustering import KMeansClustering
+from vizml.data_generator import Normal2DGenerator
+from vizml.fit_cache import FitCache, get_fit_cache, set_fit_cache
+from vizml.k_means_clustering.clustering import K_RANGE, KMeansClustering, _grow_centers
 
 
 def test_show_data():
@@ -165,3 +168,93 @@ def test_change_num_clusters_3d():
     clu1.change_num_clusters(5)
 
     assert clu1.no_clusters == 5 and clu1.clustering.n_clusters == 5
+
+
+@pytest.mark.parametrize("silhouette_mode", ['sampled', 'simplified'])
+def test_silhouette_mode(silhouette_mode):
+    """Tests the silhouette plots of K Means Clustering with approximate silhouette modes."""
+
+    clu = KMeansClustering(no_points=2500, silhouette_mode=silhouette_mode)
+    clu.train()
+    fig = clu.show_avg_silhouette_scores(return_fig=True)
+    assert all(error > 0 for error in fig.data[0].error_y.array)
+    fig = clu.show_silhouette_plot(return_fig=True)
+    assert isinstance(fig, Figure)
+
+
+@pytest.mark.parametrize("warm_start", [True, False])
+def test_k_sweep(warm_start):
+    """Tests the elbow and silhouette plots of K Means Clustering read the fits of a single k sweep."""
+
+    clu = KMeansClustering()
+    sweep = clu.k_sweep(n_jobs=2, warm_start=warm_start)
+
+    assert list(sweep) == list(K_RANGE)
+    assert all(len(set(fit.labels)) == k for k, fit in sweep.items())
+    assert clu.k_sweep() is sweep
+    assert list(clu.show_elbow_plot(return_fig=True).data[0].y) == [fit.inertia for fit in sweep.values()]
+    silhouette_scores = [fit.silhouette.score for fit in sweep.values()]
+    assert list(clu.show_avg_silhouette_scores(return_fig=True).data[0].y) == silhouette_scores
+
+
+def test_grow_centers_coinciding_points():
+    """Tests a center is still added when all the data points coincide with the centers."""
+
+    centers = _grow_centers(zeros((5, 2)), array([[0.0, 0.0]]), seed=0)
+
+    assert equal(centers, zeros((2, 2))).all()
+
+
+@pytest.mark.parametrize("is_3d", [False, True])
+def test_online_engine(is_3d):
+    """Tests training K Means Clustering one batch at a time and showing the centers converge."""
+
+    clu = KMeansClustering(no_points=200, engine='online', batch_size=50, is_3d=is_3d)
+    clu.train()
+    fig = clu.show_center_convergence(return_fig=True)
+
+    assert len(clu.center_history) == 4
+    assert len(clu.labels) == 200
+    assert len(fig.frames) == 4
+    assert isinstance(clu.show_clusters(return_fig=True), Figure)
+
+
+def test_fit_stream():
+    """Tests clustering the chunks streamed by a data generator with the minibatch engine."""
+
+    clu = KMeansClustering(engine='minibatch')
+    clu.fit_stream(Normal2DGenerator(random_state=3).generate_iter(20000, chunk_size=5000))
+
+    assert len(clu.center_history) == 4
+    assert clu.clustering.cluster_centers_.shape == (3, 2)
+    assert len(clu.labels) == clu.no_points
+
+
+def test_partial_fit_isolated():
+    """Tests partial fits of a minibatch model leave a model trained with the same arguments unchanged."""
+
+    previous_cache = get_fit_cache()
+    set_fit_cache(FitCache(cache_unseeded=True))
+    try:
+        a = KMeansClustering(no_points=200, random_state=3, engine='minibatch')
+        b = KMeansClustering(no_points=200, random_state=3, engine='minibatch')
+        a.train()
+        b.train()
+        centers, labels = b.clustering.cluster_centers_.copy(), b.labels.copy()
+        a.partial_fit(a.data_points[:30])
+    finally:
+        set_fit_cache(previous_cache)
+
+    assert a.clustering is not b.clustering
+    assert equal(b.clustering.cluster_centers_, centers).all()
+    assert equal(b.labels, labels).all() and len(b.labels) == 200
+
+
+def test_engine_errors():
+    """Tests partial fits with the batch engine and unknown engines raise errors."""
+
+    with pytest.raises(ValueError):
+        KMeansClustering().partial_fit(Normal2DGenerator().generate(10))
+
+    with pytest.raises(ValueError):
+        KMeansClustering(engine='unknown')
@@ -1,5 +1,6 @@
 from numpy import equal, ndarray
 from plotly.graph_objects import Figure
+from vizml.decision_surface import batch_size_for
 from vizml.k_nearest_neighbours.classification import KNearestNeighbours
 
 
@@ -259,3 +260,27 @@ def test_change_k_neighbors_3d():
     clf.change_k_neighbors(k_neighbors=17)
 
     assert clf.k_neighbors == 17 and clf.classifier.n_neighbors == 17
+
+
+def test_adaptive_surface():
+    """Tests the decision plots in K Nearest Neighbours with an adaptive decision surface."""
+
+    clf = KNearestNeighbours(no_points=50, data_shape='moon', adaptive_surface=True)
+    clf.train()
+    assert clf.decision_surface.n_evaluations < clf.decision_surface.resolution ** 2
+    assert isinstance(clf.show_decision_boundary(return_fig=True), Figure)
+    assert isinstance(clf.show_decision_probabilities(return_fig=True), Figure)
+
+
+def test_surface_memory_budget():
+    """Tests that the memory budget and threads of the decision surface are passed on in K Nearest Neighbours."""
+
+    clf = KNearestNeighbours(no_points=50, surface_memory_budget=1024 * 1024, surface_n_jobs=2)
+    clf.train()
+    default_clf = KNearestNeighbours(no_points=50)
+    default_clf.train()
+
+    assert clf.decision_surface.batch_size == batch_size_for(clf.classifier, 2, memory_budget=1024 * 1024)
+    assert clf.decision_surface.batch_size < default_clf.decision_surface.batch_size
+    assert clf.decision_surface.n_jobs == 2
+    assert equal(clf.decision_surface.labels, default_clf.decision_surface.labels).all()
@@ -275,3 +275,25 @@ def test_change_kernel_3d():
     clf.change_kernel('rbf')
 
     assert clf.kernel == 'rbf' and clf.classifier.kernel == 'rbf'
+
+
+def test_adaptive_surface():
+    """Tests the decision plots in Support Vector Machine with an adaptive decision surface."""
+
+    clf = SupportVectorMachine(no_points=50, data_shape='circle', kernel='rbf', adaptive_surface=True)
+    clf.train()
+    assert clf.decision_surface.n_evaluations < clf.decision_surface.resolution ** 2
+    assert isinstance(clf.show_decision_boundary(return_fig=True), Figure)
+    assert isinstance(clf.show_decision_probabilities(return_fig=True), Figure)
+
+
+def test_decision_boundary_isosurface_3d():
+    """Tests the decision boundary in Support Vector Machine is an isosurface through the volume for 3d config."""
+
+    clf = SupportVectorMachine(is_3d=True, no_points=50)
+    clf.train()
+    fig = clf.show_decision_boundary(return_fig=True)
+    isosurface = fig.data[-1]
+    assert isosurface.type == 'isosurface'
+    assert isosurface.isomin == isosurface.isomax == 0
+    assert len(isosurface.value) == 30 ** 3
@@ -0,0 +1,91 @@
+import warnings
+from typing import Any, List, Tuple
+
+import pytest
+from numpy import absolute, isclose, isnan, ones, zeros
+from numpy.random import default_rng
+from sklearn import metrics
+from vizml.metrics.regression_metrics import (Error, ErrorAccumulator, Residuals, compute_all_errors,
+                                              compute_all_errors_from_chunks)
+
+SKLEARN_ERRORS = {'MSE': metrics.mean_squared_error,
+                  'RMSE': lambda array1, array2: metrics.mean_squared_error(array1, array2, squared=False),
+                  'MAE': metrics.mean_absolute_error, 'MAX': metrics.max_error,
+                  'MSLE': metrics.mean_squared_log_error, 'MdAE': metrics.median_absolute_error,
+                  'MAPE': metrics.mean_absolute_percentage_error, 'R2': metrics.r2_score}
+
+rng = default_rng(0)
+VALUES: List[Tuple[Any, Any]] = [(rng.random((101, 1)) * 5, rng.random((101, 1)) * 5),
+                                 (rng.normal(size=100), rng.normal(size=100)),
+                                 (ones(10), ones(10)),
+                                 (ones(10), zeros(10)),
+                                 (zeros(3), rng.random(3)),
+                                 ([2.5], [3.0])]
+
+
+@pytest.mark.parametrize('array1, array2', VALUES)
+def test_errors_match_sklearn(array1, array2):
+    """Errors derived from the residuals must match sklearn."""
+
+    for name, error in Error.__members__.items():
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            try:
+                expected = SKLEARN_ERRORS[name](array1, array2)
+            except ValueError:
+                assert not error.value.is_defined(Residuals(array1, array2)), name
+                continue
+
+        value = error.value.compute(array1, array2)
+        assert (isnan(value) and isnan(expected)) or isclose(value, expected), name
+
+
+def test_compute_all_errors_skips_msle():
+    """MSLE must be left out for negative values."""
+
+    array1, array2 = VALUES[1]
+    computed_errors = compute_all_errors(array1, array2)
+
+    assert [name for name, _ in computed_errors] == [name for name in Error.__members__ if name != 'MSLE']
+
+    with pytest.raises(ValueError):
+        Error.MSLE.value.compute(array1, array2)
+
+
+def test_compute_all_errors_from_chunks():
+    """Errors of streamed chunks must match the errors of all the values, except the median."""
+
+    array1 = rng.random(1000) * 10
+    array2 = absolute(array1 + rng.normal(size=1000))
+    chunks = ((array1[i:i + 128], array2[i:i + 128]) for i in range(0, 1000, 128))
+
+    assert compute_all_errors_from_chunks(chunks) == [error for error in compute_all_errors(array1, array2)
+                                                      if error[0] != 'MdAE']
+
+
+@pytest.mark.parametrize('array1, array2', [([1, 2], [1, 2, 3]), ([[1, 2]], [[1, 2]])])
+def test_invalid_values(array1, array2):
+    """Values of different lengths or with several outputs must raise an error."""
+
+    with pytest.raises(ValueError):
+        Residuals(array1, array2)
+
+
+def test_chunks_without_values():
+    """Computing the errors without any values must raise an error."""
+
+    with pytest.raises(ValueError):
+        compute_all_errors_from_chunks([])
+
+
+def test_error_accumulator_merge():
+    """Errors of merged accumulators must match the errors of all the values, except the median."""
+
+    array1, array2 = VALUES[1]
+    first, second = ErrorAccumulator(), ErrorAccumulator()
+    first.update(array1[:30], array2[:30])
+    second.update(array1[30:], array2[30:])
+
+    assert first.merge(second).result() == [error for error in compute_all_errors(array1, array2)
+                                            if error[0] != 'MdAE']
+    assert first.merge(ErrorAccumulator()).count == 100
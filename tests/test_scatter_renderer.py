@@ -0,0 +1,121 @@
+import plotly.graph_objects as go
+import pytest
+from numpy import arange, isin, sin, unique
+from numpy.random import default_rng
+from vizml.k_nearest_neighbours.classification import KNearestNeighbours
+from vizml.scatter_renderer import (ScatterRenderer, binned_indices, get_scatter_renderer, lttb_indices,
+                                    scatter3d_trace, scatter_trace, set_scatter_renderer)
+from vizml.simple_linear_regression.regression import SimpleLinearRegression
+
+rng = default_rng(0)
+
+
+def test_small_traces_are_unchanged():
+    """Traces below the thresholds must be drawn in SVG with all of their points."""
+
+    trace = ScatterRenderer().trace([3, 1, 2], [1, 2, 3], mode='markers', marker=dict(color=[0, 1, 0]))
+
+    assert isinstance(trace, go.Scatter)
+    assert list(trace.x) == [3, 1, 2]
+    assert list(trace.marker.color) == [0, 1, 0]
+
+
+def test_webgl_traces():
+    """Traces above the WebGL threshold must be drawn with Scattergl."""
+
+    renderer = ScatterRenderer(webgl_threshold=100)
+
+    assert isinstance(renderer.trace(arange(101), arange(101), mode='markers'), go.Scattergl)
+    assert isinstance(renderer.trace(arange(100), arange(100), mode='markers'), go.Scatter)
+
+
+def test_downsampled_markers():
+    """Downsampled markers must be bounded by the grid and keep every color in every occupied cell."""
+
+    x_values, y_values = rng.normal(size=(2, 50000))
+    colors = (x_values > 0).astype(int)
+    trace = ScatterRenderer(max_markers=400).trace(x_values, y_values, mode='markers',
+                                                   marker=dict(size=8, color=colors))
+
+    assert len(trace.x) <= 2 * 400
+    assert set(trace.marker.color) == {0, 1}
+    assert trace.marker.size == 8
+    assert isin(trace.x, x_values).all()
+
+    indices = binned_indices(x_values, y_values, 400)
+    assert len(indices) <= 400
+    assert (x_values[indices].min(), x_values[indices].max()) == (x_values.min(), x_values.max())
+
+
+def test_downsampled_3d_markers():
+    """Downsampled 3D markers must be bounded by the 3D grid and keep every color in every occupied cell."""
+
+    x_values, y_values, z_values = rng.normal(size=(3, 50000))
+    colors = (z_values > 0).astype(int)
+    trace = ScatterRenderer(max_markers=1000).trace3d(x_values, y_values, z_values, mode='markers',
+                                                      marker=dict(size=8, color=colors))
+
+    assert isinstance(trace, go.Scatter3d)
+    assert len(trace.x) <= 2 * 1000
+    assert set(trace.marker.color) == {0, 1}
+    assert isin(trace.z, z_values).all()
+
+    indices = binned_indices(x_values, y_values, 1000, z_values=z_values)
+    assert len(indices) <= 1000
+    assert (z_values[indices].min(), z_values[indices].max()) == (z_values.min(), z_values.max())
+    assert len(ScatterRenderer().trace3d(arange(5), arange(5), arange(5), mode='markers').x) == 5
+
+
+def test_downsampled_lines():
+    """Downsampled lines must be sorted by x and keep their end points and peaks."""
+
+    x_values = rng.permutation(20000) / 100
+    y_values = sin(x_values)
+    trace = ScatterRenderer(max_line_points=500).trace(x_values, y_values, name='Line')
+
+    assert len(trace.x) == 500
+    assert (trace.x[0], trace.x[-1]) == (0, 199.99)
+    assert (sorted(trace.x) == trace.x).all()
+    assert max(trace.y) > 0.999 and min(trace.y) < -0.999
+
+    indices = lttb_indices(arange(10.0), arange(10.0), 4)
+    assert len(unique(indices)) == 4 and indices[0] == 0 and indices[-1] == 9
+
+
+@pytest.mark.parametrize('renderer', [None, ScatterRenderer(webgl_threshold=5, max_markers=16, max_line_points=5)])
+def test_set_scatter_renderer(renderer):
+    """Models must draw their scatter traces with the scatter renderer set."""
+
+    default_renderer = get_scatter_renderer()
+    set_scatter_renderer(renderer)
+    try:
+        model = SimpleLinearRegression(no_points=50)
+        model.train()
+        trace_types = [type(trace) for trace in model.show_regression_line(return_fig=True).data]
+        lengths = [len(trace.x) for trace in model.show_regression_line(return_fig=True).data]
+    finally:
+        set_scatter_renderer(default_renderer)
+
+    if renderer is None:
+        assert trace_types == [go.Scatter, go.Scatter] and lengths == [50, 50]
+    else:
+        assert trace_types == [go.Scattergl, go.Scatter] and lengths[0] <= 16 and lengths[1] == 5
+
+    assert isinstance(scatter_trace([1], [1]), go.Scatter)
+
+
+@pytest.mark.parametrize('renderer', [None, ScatterRenderer(max_markers=27)])
+def test_set_scatter_renderer_3d(renderer):
+    """Models must draw their 3D scatter traces with the scatter renderer set."""
+
+    default_renderer = get_scatter_renderer()
+    set_scatter_renderer(renderer)
+    try:
+        trace = KNearestNeighbours(no_points=200, is_3d=True).show_data(return_fig=True).data[0]
+    finally:
+        set_scatter_renderer(default_renderer)
+
+    assert isinstance(trace, go.Scatter3d)
+    assert len(trace.x) == 200 if renderer is None else len(trace.x) <= 2 * 27
+
+    assert isinstance(scatter3d_trace([1], [1], [1]), go.Scatter3d)
@@ -0,0 +1,92 @@
+import secrets
+
+import pytest
+from vizml import _dashboard_figures, server
+from vizml._dashboard_figures import SECRET_ENV_VAR, FigureStore, get_figure_store, set_figure_store
+from vizml.dbscan.dashboard import DashBoard
+
+DBSCAN_INPUTS = [('dbscan-random-state', 'value', -1), ('dbscan-no-points', 'value', 100),
+                 ('dbscan-min-dist', 'value', 0.2), ('dbscan-min-neighbours', 'value', 5),
+                 ('dbscan-no-dimensions', 'value', '2d')]
+
+
+def dispatch(output, inputs):
+    """Calls the callback of the output through the Flask server, like the browser does."""
+
+    component_id, component_property = output.rsplit('.', 1)
+    body = {'output': output, 'outputs': {'id': component_id, 'property': component_property},
+            'inputs': [{'id': input_id, 'property': input_property, 'value': value}
+                       for input_id, input_property, value in inputs],
+            'changedPropIds': [], 'state': []}
+    response = server.app.server.test_client().post('/_dash-update-component', json=body)
+
+    assert response.status_code == 200
+    return response.get_json()['response'][component_id][component_property]
+
+
+def test_app_built_once(monkeypatch):
+    """The app must be built once per process and expose its Flask server."""
+
+    monkeypatch.setenv(SECRET_ENV_VAR, 'secret')
+
+    assert server.app is server.build_app()
+    assert server.server is server.app.server
+
+    with pytest.raises(AttributeError):
+        server.unknown_attribute
+
+
+@pytest.mark.parametrize('route', list(server.PAGES))
+def test_pages_namespaced(route):
+    """The components and callbacks of each dashboard must be prefixed with its route."""
+
+    page = server.dashboard_app(server.PAGES[route][0]).namespaced(route)
+    ids = [component.id for component in page.layout._traverse() if getattr(component, 'id', None) is not None]
+
+    assert ids and all(component_id.startswith(f'{route}-') for component_id in ids)
+    assert len(ids) == len(set(ids))
+    assert f'{route}-figure-payload.data' in server.app.callback_map
+    assert dispatch('page-content.children', [('url', 'pathname', f'/{route}')])['type'] == 'Div'
+
+
+def test_server_requires_shared_secret(monkeypatch):
+    """The Flask server must not be served by WSGI workers that do not share the secret of the figure keys."""
+
+    monkeypatch.delenv(SECRET_ENV_VAR, raising=False)
+
+    with pytest.raises(RuntimeError):
+        server.server
+
+
+def worker_store(monkeypatch):
+    """Store of a new worker process, with its own random default secret."""
+
+    monkeypatch.setattr(_dashboard_figures, '_PROCESS_SECRET', secrets.token_bytes(32))
+    return FigureStore()
+
+
+def test_page_served_by_other_worker(monkeypatch):
+    """Figures must be served for keys registered by another worker sharing the secret, like the documented setup."""
+
+    monkeypatch.setenv(SECRET_ENV_VAR, secrets.token_hex(32))
+    store = get_figure_store()
+    try:
+        set_figure_store(worker_store(monkeypatch))
+        key = dispatch('dbscan-figure-key.data', DBSCAN_INPUTS)
+        set_figure_store(worker_store(monkeypatch))
+        payload = dispatch('dbscan-figure-payload.data', [('dbscan-plot-tabs', 'value', 'tab-1'),
+                                                          ('dbscan-figure-key', 'data', key)])
+    finally:
+        set_figure_store(store)
+
+    assert payload['data'][0]['x']['bdata']
+
+
+def test_key_rejected_by_other_worker_without_secret(monkeypatch):
+    """Keys registered by a worker must be rejected, with a warning, by a worker with another random secret."""
+
+    monkeypatch.delenv(SECRET_ENV_VAR, raising=False)
+    key = worker_store(monkeypatch).register(DashBoard._init_clustering, DashBoard._tab_figures, -1, 100, 0.2, 5, '2d')
+
+    with pytest.warns(RuntimeWarning, match=SECRET_ENV_VAR), pytest.raises(KeyError):
+        worker_store(monkeypatch).get(key, DashBoard._init_clustering, DashBoard._tab_figures)